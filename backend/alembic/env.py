@@ -15,6 +15,14 @@ from app.db.base import Base
 # If you add more models later (like Resume, JobProfile), import them here too!
 from app.models.user import User
 from app.models.profile import Profile
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.resume_job import ResumeJob
+from app.models.rate_limit import RateLimitCounter
+from app.models.chat_cache import ChatCacheEntry
+from app.models.chat import ChatSession, ChatMessage
+from app.models.idempotency import IdempotencyRecord
+from app.models.resume_artifact import ResumeArtifact
+from app.models.profile_embedding import ProfileEmbedding, RoleEmbedding
 
 
 config = context.config
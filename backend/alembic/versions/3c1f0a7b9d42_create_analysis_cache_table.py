@@ -0,0 +1,38 @@
+"""create_analysis_cache_table
+
+Revision ID: 3c1f0a7b9d42
+Revises: fd9d26032371
+Create Date: 2026-10-18 09:12:04.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0a7b9d42'
+down_revision: Union[str, None] = 'fd9d26032371'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('analysis_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('analysis_json', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_analysis_cache_created_at'), 'analysis_cache', ['created_at'], unique=False)
+    op.create_index(op.f('ix_analysis_cache_expires_at'), 'analysis_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analysis_cache_expires_at'), table_name='analysis_cache')
+    op.drop_index(op.f('ix_analysis_cache_created_at'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
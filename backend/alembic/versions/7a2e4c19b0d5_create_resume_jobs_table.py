@@ -0,0 +1,47 @@
+"""create_resume_jobs_table
+
+Revision ID: 7a2e4c19b0d5
+Revises: 3c1f0a7b9d42
+Create Date: 2026-10-18 10:03:41.552710
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2e4c19b0d5'
+down_revision: Union[str, None] = '3c1f0a7b9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resume_jobs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('target_role', sa.String(), nullable=False),
+    sa.Column('experience_level', sa.String(), nullable=False),
+    sa.Column('file_content', sa.LargeBinary(), nullable=True),
+    sa.Column('resume_text_content', sa.Text(), nullable=True),
+    sa.Column('ai_analysis_json', sa.JSON(), nullable=True),
+    sa.Column('profile_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_jobs_status'), 'resume_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_resume_jobs_user_id'), 'resume_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resume_jobs_user_id'), table_name='resume_jobs')
+    op.drop_index(op.f('ix_resume_jobs_status'), table_name='resume_jobs')
+    op.drop_table('resume_jobs')
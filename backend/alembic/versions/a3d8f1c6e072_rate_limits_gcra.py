@@ -0,0 +1,35 @@
+"""rate_limits_gcra
+
+Revision ID: a3d8f1c6e072
+Revises: f7c3e9a1b528
+Create Date: 2026-10-19 12:03:27.640918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d8f1c6e072'
+down_revision: Union[str, None] = 'f7c3e9a1b528'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fixed-window counters become a GCRA theoretical arrival time. Existing windows cannot be
+    # converted exactly, so every subject starts with its full allowance.
+    op.add_column('rate_limits', sa.Column('tat', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.alter_column('rate_limits', 'tat', server_default=None)
+    op.drop_column('rate_limits', 'count')
+    op.drop_column('rate_limits', 'window_start')
+
+
+def downgrade() -> None:
+    op.add_column('rate_limits', sa.Column('window_start', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('rate_limits', sa.Column('count', sa.Integer(), server_default='0', nullable=False))
+    op.alter_column('rate_limits', 'window_start', server_default=None)
+    op.alter_column('rate_limits', 'count', server_default=None)
+    op.drop_column('rate_limits', 'tat')
@@ -0,0 +1,38 @@
+"""chat_cache_unique_message
+
+Revision ID: b5e2c8f4a917
+Revises: a3d8f1c6e072
+Create Date: 2026-10-19 14:22:09.318544
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2c8f4a917'
+down_revision: Union[str, None] = 'a3d8f1c6e072'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chat_cache', sa.Column('message_hash', sa.String(length=64), nullable=True))
+    op.execute("UPDATE chat_cache SET message_hash = encode(sha256(convert_to(message, 'UTF8')), 'hex')")
+    op.alter_column('chat_cache', 'message_hash', nullable=False)
+    # Keep only the newest answer per (scope, message) before making the pair unique
+    op.execute(
+        "DELETE FROM chat_cache a USING chat_cache b "
+        "WHERE a.scope_key = b.scope_key AND a.message_hash = b.message_hash "
+        "AND (a.created_at, a.id) < (b.created_at, b.id)"
+    )
+    op.drop_index(op.f('ix_chat_cache_scope_key'), table_name='chat_cache')
+    op.create_index('ix_chat_cache_scope_message', 'chat_cache', ['scope_key', 'message_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_cache_scope_message', table_name='chat_cache')
+    op.create_index(op.f('ix_chat_cache_scope_key'), 'chat_cache', ['scope_key'], unique=False)
+    op.drop_column('chat_cache', 'message_hash')
@@ -0,0 +1,42 @@
+"""create_resume_artifacts_table
+
+Revision ID: b6d2f8a3c417
+Revises: a47c1e9b2d63
+Create Date: 2026-10-18 18:05:41.227310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f8a3c417'
+down_revision: Union[str, None] = 'a47c1e9b2d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resume_artifacts',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('target_role', sa.String(), nullable=False),
+    sa.Column('completed_tasks', sa.JSON(), nullable=False),
+    sa.Column('latex_content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'content_hash', name='uq_resume_artifacts_user_hash'),
+    sa.UniqueConstraint('user_id', 'version', name='uq_resume_artifacts_user_version')
+    )
+    op.create_index(op.f('ix_resume_artifacts_user_id'), 'resume_artifacts', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resume_artifacts_user_id'), table_name='resume_artifacts')
+    op.drop_table('resume_artifacts')
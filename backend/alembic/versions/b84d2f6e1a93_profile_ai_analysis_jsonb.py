@@ -0,0 +1,35 @@
+"""profile_ai_analysis_jsonb
+
+Revision ID: b84d2f6e1a93
+Revises: 7a2e4c19b0d5
+Create Date: 2026-10-18 13:41:27.904415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84d2f6e1a93'
+down_revision: Union[str, None] = '7a2e4c19b0d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('profiles', 'ai_analysis_json',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='ai_analysis_json::jsonb')
+
+
+def downgrade() -> None:
+    op.alter_column('profiles', 'ai_analysis_json',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='ai_analysis_json::json')
@@ -0,0 +1,26 @@
+"""add_profile_version
+
+Revision ID: c5e19a7d3f20
+Revises: b84d2f6e1a93
+Create Date: 2026-10-18 14:22:09.318027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e19a7d3f20'
+down_revision: Union[str, None] = 'b84d2f6e1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('profiles', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('profiles', 'version')
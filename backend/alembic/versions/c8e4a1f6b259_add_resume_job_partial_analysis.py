@@ -0,0 +1,26 @@
+"""add_resume_job_partial_analysis
+
+Revision ID: c8e4a1f6b259
+Revises: b6d2f8a3c417
+Create Date: 2026-10-18 18:41:12.509874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4a1f6b259'
+down_revision: Union[str, None] = 'b6d2f8a3c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('resume_jobs', sa.Column('partial_analysis', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('resume_jobs', 'partial_analysis')
@@ -0,0 +1,40 @@
+"""create_rate_limits_table
+
+Revision ID: d2a7f4c81b36
+Revises: c5e19a7d3f20
+Create Date: 2026-10-18 15:10:52.661204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c81b36'
+down_revision: Union[str, None] = 'c5e19a7d3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rate_limits',
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('window_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('subject', 'action')
+    )
+    # The per-profile counters replaced by rate_limits (they were never created by a migration,
+    # so only drop them where they exist)
+    op.execute('ALTER TABLE profiles DROP COLUMN IF EXISTS daily_upload_count')
+    op.execute('ALTER TABLE profiles DROP COLUMN IF EXISTS daily_optimize_count')
+    op.execute('ALTER TABLE profiles DROP COLUMN IF EXISTS last_activity_date')
+
+
+def downgrade() -> None:
+    op.add_column('profiles', sa.Column('last_activity_date', sa.Date(), nullable=True))
+    op.add_column('profiles', sa.Column('daily_optimize_count', sa.Integer(), nullable=True))
+    op.add_column('profiles', sa.Column('daily_upload_count', sa.Integer(), nullable=True))
+    op.drop_table('rate_limits')
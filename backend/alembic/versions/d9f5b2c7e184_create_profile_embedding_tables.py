@@ -0,0 +1,65 @@
+"""create_profile_embedding_tables
+
+Revision ID: d9f5b2c7e184
+Revises: c8e4a1f6b259
+Create Date: 2026-10-18 21:07:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f5b2c7e184'
+down_revision: Union[str, None] = 'c8e4a1f6b259'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    op.create_table('profile_embeddings',
+    sa.Column('profile_id', sa.String(), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.Vector(dim=384), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('target_role', sa.String(), nullable=False),
+    sa.Column('experience_level', sa.String(), nullable=False),
+    sa.Column('roadmap_completed', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('profile_id')
+    )
+    op.create_index('ix_profile_embeddings_embedding_hnsw', 'profile_embeddings', ['embedding'], unique=False,
+                    postgresql_using='hnsw',
+                    postgresql_with={'m': 16, 'ef_construction': 64},
+                    postgresql_ops={'embedding': 'vector_cosine_ops'})
+    op.create_index('ix_profile_embeddings_completed_hnsw', 'profile_embeddings', ['embedding'], unique=False,
+                    postgresql_using='hnsw',
+                    postgresql_with={'m': 16, 'ef_construction': 64},
+                    postgresql_ops={'embedding': 'vector_cosine_ops'},
+                    postgresql_where=sa.text('roadmap_completed'))
+    op.create_table('role_embeddings',
+    sa.Column('role_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.Vector(dim=384), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('role_id')
+    )
+    op.create_index('ix_role_embeddings_embedding_hnsw', 'role_embeddings', ['embedding'], unique=False,
+                    postgresql_using='hnsw',
+                    postgresql_with={'m': 16, 'ef_construction': 64},
+                    postgresql_ops={'embedding': 'vector_cosine_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_role_embeddings_embedding_hnsw', table_name='role_embeddings', postgresql_using='hnsw')
+    op.drop_table('role_embeddings')
+    op.drop_index('ix_profile_embeddings_completed_hnsw', table_name='profile_embeddings', postgresql_using='hnsw')
+    op.drop_index('ix_profile_embeddings_embedding_hnsw', table_name='profile_embeddings', postgresql_using='hnsw')
+    op.drop_table('profile_embeddings')
@@ -0,0 +1,30 @@
+"""add_analysis_cache_last_used_at
+
+Revision ID: e4b7a2d91c63
+Revises: d9f5b2c7e184
+Create Date: 2026-10-18 23:41:17.502914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2d91c63'
+down_revision: Union[str, None] = 'd9f5b2c7e184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('analysis_cache', sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.create_index(op.f('ix_analysis_cache_last_used_at'), 'analysis_cache', ['last_used_at'], unique=False)
+    op.drop_index(op.f('ix_analysis_cache_created_at'), table_name='analysis_cache')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_analysis_cache_created_at'), 'analysis_cache', ['created_at'], unique=False)
+    op.drop_index(op.f('ix_analysis_cache_last_used_at'), table_name='analysis_cache')
+    op.drop_column('analysis_cache', 'last_used_at')
@@ -0,0 +1,46 @@
+"""create_chat_cache_table
+
+Revision ID: e91b3c5d7a48
+Revises: d2a7f4c81b36
+Create Date: 2026-10-18 15:58:13.207719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b3c5d7a48'
+down_revision: Union[str, None] = 'd2a7f4c81b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    op.create_table('chat_cache',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('scope_key', sa.String(length=64), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.Vector(dim=384), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_chat_cache_scope_key'), 'chat_cache', ['scope_key'], unique=False)
+    op.create_index(op.f('ix_chat_cache_expires_at'), 'chat_cache', ['expires_at'], unique=False)
+    op.create_index('ix_chat_cache_embedding_hnsw', 'chat_cache', ['embedding'], unique=False,
+                    postgresql_using='hnsw',
+                    postgresql_with={'m': 16, 'ef_construction': 64},
+                    postgresql_ops={'embedding': 'vector_cosine_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_cache_embedding_hnsw', table_name='chat_cache', postgresql_using='hnsw')
+    op.drop_index(op.f('ix_chat_cache_expires_at'), table_name='chat_cache')
+    op.drop_index(op.f('ix_chat_cache_scope_key'), table_name='chat_cache')
+    op.drop_table('chat_cache')
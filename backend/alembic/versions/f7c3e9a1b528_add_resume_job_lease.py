@@ -0,0 +1,26 @@
+"""add_resume_job_lease
+
+Revision ID: f7c3e9a1b528
+Revises: e4b7a2d91c63
+Create Date: 2026-10-19 10:14:52.873106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3e9a1b528'
+down_revision: Union[str, None] = 'e4b7a2d91c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('resume_jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('resume_jobs', 'lease_expires_at')
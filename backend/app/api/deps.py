@@ -0,0 +1,47 @@
+import datetime
+import logging
+from typing import Callable
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.auth import get_current_user
+from app.db.session import get_db
+from app.schemas.user import Principal
+from app.services import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+async def enforce_rate_limit(db: AsyncSession, user_id: str, action: str, amount: int = 1) -> datetime.datetime:
+    # Same check as the rate_limit() dependency, for work that must run it later (deduplicated
+    # requests) or that is charged per item (batch resumes). Returns the charge time for refunds.
+    try:
+        return await rate_limiter.hit(db, user_id, action, amount)
+    except rate_limiter.RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+async def refund_rate_limit(db: AsyncSession, user_id: str, action: str, charged_at: datetime.datetime | None = None):
+    # Undo enforce_rate_limit() for work that failed; never masks the original error
+    try:
+        await db.rollback()
+        await rate_limiter.refund(db, user_id, action, charged_at=charged_at)
+    except Exception as e:
+        logger.warning("Rate limit refund failed for %s/%s: %s", user_id, action, e)
+
+def rate_limit(action: str, user_dependency: Callable = get_current_user):
+    """
+    Dependency factory: `dependencies=[Depends(rate_limit("upload"))]`.
+    Pass the same user dependency the endpoint uses so the principal is resolved only once.
+    Runs before the endpoint body, i.e. before any PDF parsing or LLM call.
+    """
+    async def check(
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(user_dependency),
+    ):
+        await enforce_rate_limit(db, current_user.id, action)
+
+    return check
@@ -0,0 +1,59 @@
+import json
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import enforce_rate_limit, rate_limit
+from app.api.v1.endpoints.auth import get_current_user
+from app.db.session import get_db
+from app.schemas.user import Principal
+from app.services import batch_analysis
+
+router = APIRouter()
+
+@router.post("/batch", dependencies=[Depends(rate_limit("batch"))])
+async def analyze_batch(
+    target_role: str = Form(...),
+    experience_level: str = Form(...),
+    files: list[UploadFile] = File(..., description="PDF resumes and/or .zip archives of PDFs"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Scores many resumes against one target role without touching anyone's profile.
+
+    Streams NDJSON: one `{"type": "result", "index", "filename", "status", ...}` line per resume
+    as soon as it finishes (succeeded lines carry `analysis`, failed ones `error`), then a final
+    `{"type": "summary", ...}` line. A resume that fails does not stop the batch.
+    Every PDF counts against the daily batch resume quota (RATE_LIMIT_BATCH_RESUMES_PER_DAY).
+    """
+    # 1. Read and unpack everything up front (limits are checked before any parse/LLM work)
+    try:
+        uploads = await batch_analysis.read_uploads(files)
+        items = await batch_analysis.collect_items(uploads)
+    except batch_analysis.BatchTooLarge as e:
+        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    del uploads
+
+    if not items:
+        raise HTTPException(400, detail="No files to analyze")
+
+    # 2. Charge the quota per resume, all or nothing (rejected non-PDF entries are free)
+    resumes = sum(item.content is not None for item in items)
+    if resumes:
+        await enforce_rate_limit(db, current_user.id, "batch_resumes", amount=resumes)
+
+    # 3. Stream results in completion order
+    async def ndjson():
+        # aclosing: a client that disconnects cancels the rest of the batch
+        async with aclosing(batch_analysis.analyze_batch(items, target_role, experience_level)) as results:
+            async for result in results:
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
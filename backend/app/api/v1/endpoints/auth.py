@@ -4,10 +4,10 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from app.services import user_service
-from app.schemas.user import UserCreate, UserResponse
+from app.services import user_service, principal_cache
+from app.schemas.user import UserCreate, UserResponse, Principal
 from app.schemas.token import Token
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_and_update_password
 from app.core.config import settings
 
 from fastapi.security import OAuth2PasswordBearer
@@ -37,18 +37,29 @@ async def login_access_token(
     # 1. Find the user
     user = await user_service.get_user_by_email(db, email=form_data.username)
     
-    # 2. Verify password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # 2. Verify password (off the event loop)
+    is_valid, new_hash = (False, None)
+    if user:
+        is_valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # 2b. Upgrade hashes made with older Argon2 parameters
+    if new_hash:
+        await user_service.update_password_hash(db, user, new_hash)
     
     # 3. Create Token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+        subject=user.id,
+        expires_delta=access_token_expires,
+        # Signed identity claims, used by get_current_user_from_claims on hot read paths
+        extra_claims={"email": user.email, "name": user.full_name},
     )
     
     return {
@@ -59,21 +70,51 @@ async def login_access_token(
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
-    user = await user_service.get_user_by_id(db, user_id) # Need to add this small helper too
-    if user is None:
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+async def _resolve_principal(payload: dict, db: AsyncSession) -> Principal:
+    user_id: str = payload["sub"]
+
+    # 1. Principal cache (no DB round trip)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # 2. Load the user row once, then cache it
+        user = await user_service.get_user_by_id(db, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.model_validate(user)
+        principal_cache.put(principal)
+
+    if not principal.is_active:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return principal
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Principal:
+    return await _resolve_principal(_decode_token(token), db)
+
+async def get_current_user_from_claims(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    For hot read paths. With AUTH_TRUST_TOKEN_CLAIMS enabled the principal is built from the
+    signed token alone (no cache, no DB); otherwise this behaves exactly like get_current_user.
+    """
+    payload = _decode_token(token)
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and payload.get("email"):
+        principal_cache.PRINCIPAL_LOOKUPS.labels(result="token_claims").inc()
+        return Principal(id=payload["sub"], email=payload["email"], full_name=payload.get("name"))
+    return await _resolve_principal(payload, db)
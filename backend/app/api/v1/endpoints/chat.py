@@ -1,37 +1,127 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.db.session import get_db
-from app.api.v1.endpoints.auth import get_current_user
-from app.models.user import User
-from app.models.profile import Profile
-from app.schemas.chat import ChatRequest, ChatResponse
-from app.services import chat_service
+from app.db.session import get_db, AsyncSessionLocal
+from app.api.v1.endpoints.auth import get_current_user, get_current_user_from_claims
+from app.api.deps import rate_limit
+from app.schemas.user import Principal
+from app.schemas.chat import ChatRequest, ChatResponse, ChatSessionResponse, ChatMessageResponse
+from app.services import chat_history, chat_service, profile_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/", response_model=ChatResponse)
+async def _get_profile_context(db: AsyncSession, current_user: Principal) -> dict:
+    # 1. Version probe only: the rendered context is cached per profile version
+    version = await profile_service.get_profile_version(db, current_user.id)
+    
+    if version is None:
+        raise HTTPException(status_code=400, detail="Please upload a resume first to start chatting.")
+
+    compiled = chat_service.get_compiled_context(current_user.id, version)
+    if compiled is not None:
+        return compiled
+
+    # 2. Profile changed (or first message): fetch only the fields the mentor prompt uses
+    profile_context = await profile_service.get_chat_context(db, current_user.id)
+    if not profile_context:
+        raise HTTPException(status_code=400, detail="Please upload a resume first to start chatting.")
+    return chat_service.compile_context(current_user.id, profile_context)
+
+async def _get_conversation(db: AsyncSession, current_user: Principal, request: ChatRequest) -> chat_history.Conversation:
+    # Continue the given session, or start a new one
+    session = await chat_history.get_or_create_session(db, current_user.id, request.session_id, request.message)
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return await chat_history.load_conversation(db, session)
+
+# Chat messages are limited per hour; uses the same principal dependency as the endpoints.
+# Posting a message spends LLM budget, so it always checks the user is still active
+# (get_current_user); only the cheap session/message reads trust the token claims.
+_chat_limit = Depends(rate_limit("chat", user_dependency=get_current_user))
+
+@router.post("/", response_model=ChatResponse, dependencies=[_chat_limit])
 async def chat_with_mentor(
     request: ChatRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    # 1. Fetch User Profile to get Context
-    result = await db.execute(select(Profile).filter(Profile.user_id == current_user.id))
-    profile = result.scalars().first()
-    
-    if not profile:
-        raise HTTPException(status_code=400, detail="Please upload a resume first to start chatting.")
-        
-    # 2. Convert Profile to Dict for Context
-    profile_context = {
-        "target_role": profile.target_role,
-        "experience_level": profile.experience_level,
-        "ai_analysis_json": profile.ai_analysis_json
-    }
+    profile_context = await _get_profile_context(db, current_user)
+    conversation = await _get_conversation(db, current_user, request)
 
     # 3. Generate Answer
-    response_text = await chat_service.generate_chat_response(request.message, profile_context)
+    response_text = await chat_service.generate_chat_response(request.message, profile_context, conversation)
+
+    # 4. Persist the turn (may schedule a background summary refresh)
+    await chat_history.append_turn(db, conversation, request.message, response_text)
     
-    return {"response": response_text}
\ No newline at end of file
+    return {"response": response_text, "session_id": conversation.session_id}
+
+@router.post("/stream", dependencies=[_chat_limit])
+async def stream_chat_with_mentor(
+    request: ChatRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Server-Sent Events version of the mentor chat.
+    Emits a `session` event with the session id, `token` events as text is generated,
+    then a single `done` (or `error`) event. Only completed answers are saved to the session.
+    """
+    profile_context = await _get_profile_context(db, current_user)
+    conversation = await _get_conversation(db, current_user, request)
+
+    async def event_stream():
+        yield f"event: session\ndata: {json.dumps({'session_id': conversation.session_id})}\n\n"
+
+        parts = []
+        # aclosing() guarantees the LLM stream is shut down if we stop early
+        async with aclosing(chat_service.stream_chat_response(request.message, profile_context, conversation)) as tokens:
+            try:
+                async for token in tokens:
+                    if await http_request.is_disconnected():
+                        logger.info("chat stream client disconnected for user %s", current_user.id)
+                        return
+                    parts.append(token)
+                    yield f"event: token\ndata: {json.dumps({'token': token})}\n\n"
+            except Exception as e:
+                logger.warning("chat stream failed: %s", e)
+                yield f"event: error\ndata: {json.dumps({'detail': 'The mentor could not finish this answer.'})}\n\n"
+                return
+
+        # Fresh session: the request-scoped one is closed once streaming starts
+        async with AsyncSessionLocal() as session:
+            await chat_history.append_turn(session, conversation, request.message, "".join(parts))
+
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/sessions", response_model=list[ChatSessionResponse])
+async def list_chat_sessions(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    return await chat_history.list_sessions(db, current_user.id)
+
+@router.get("/sessions/{session_id}/messages", response_model=list[ChatMessageResponse])
+async def list_chat_messages(
+    session_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    session = await chat_history.get_session(db, current_user.id, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    return await chat_history.list_messages(db, session_id)
@@ -1,213 +1,464 @@
-import copy 
-import datetime 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+import asyncio
+from typing import Awaitable, Callable
+import hashlib
+import json
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
-from app.db.session import get_db
-from app.models.user import User
+from app.core.config import settings
+from app.db.session import get_db, AsyncSessionLocal
+from app.schemas.user import Principal
 from app.models.profile import Profile
-from app.schemas.profile import ProfileResponse, RoadmapItemUpdate, ResumeOptimizationResponse
-from app.services import resume_service
-from app.api.v1.endpoints.auth import get_current_user
-from app.services import ai_service
+from app.models.resume_job import ResumeJob
+from app.schemas.profile import ProfileResponse, RoadmapItemUpdate, RoadmapBatchUpdate, ResumeOptimizationResponse, ResumeJobResponse, ResumeArtifactSummary, ResumeArtifactResponse, RoleMatchResponse, SimilarRoleResponse, SimilarProfileResponse
+from app.services import resume_service, profile_service, job_service, request_dedup, resume_artifacts, skill_matcher, profile_index
+from app.api.v1.endpoints.auth import get_current_user, get_current_user_from_claims
+from app.api.deps import enforce_rate_limit, refund_rate_limit
+from app.services import ai_service, llm_telemetry
 from fastapi.encoders import jsonable_encoder
 
 router = APIRouter()
 
-# --- HELPER: Rate Limiting Logic ---
-def check_and_update_limit(profile: Profile, action: str):
-    today = datetime.date.today()
-    
-    # 1. Reset counters if it's a new day
-    if profile.last_activity_date != today:
-        profile.daily_upload_count = 0
-        profile.daily_optimize_count = 0
-        profile.last_activity_date = today
-    
-    # 2. Define Limits
-    LIMITS = {
-        "upload": 2,
-        "optimize": 3
-    }
-    
-    # 3. Check specific limit
-    if action == "upload":
-        if profile.daily_upload_count >= LIMITS["upload"]:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Daily upload limit reached ({LIMITS['upload']}/day). Please try again tomorrow."
-            )
-        profile.daily_upload_count += 1
-        
-    elif action == "optimize":
-        if profile.daily_optimize_count >= LIMITS["optimize"]:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Daily optimization limit reached ({LIMITS['optimize']}/day). Please try again tomorrow."
-            )
-        profile.daily_optimize_count += 1
-    
-    return profile
-# -----------------------------------
+async def _run_deduplicated(
+    current_user: Principal,
+    operation: str,
+    request_hash: str,
+    idempotency_key: str | None,
+    work: Callable[[], Awaitable[request_dedup.StoredResponse]],
+) -> JSONResponse:
+    """
+    Identical concurrent requests (double clicks) share one run, and retries with the same
+    Idempotency-Key replay the stored result. Neither runs the work or counts against the limits again.
+    """
+    try:
+        stored, reused = await request_dedup.run(current_user.id, operation, request_hash, idempotency_key, work)
+    except request_dedup.IdempotencyKeyReused:
+        raise HTTPException(422, detail="This Idempotency-Key was already used for a different request.")
+    except request_dedup.IdempotencyConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed.",
+            headers={"Retry-After": "5"},
+        )
+
+    headers = {"Idempotent-Replayed": "true"} if reused else None
+    return JSONResponse(status_code=stored.status_code, content=stored.body, headers=headers)
 
 @router.post("/upload", response_model=ProfileResponse)
 async def upload_resume(
     target_role: str = Form(...),
     experience_level: str = Form(...),
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    async_mode: bool = Query(False, description="Return 202 with a job id and the local preliminary score instead of waiting for the analysis"),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
+    current_user: Principal = Depends(get_current_user)
 ):
     # 1. Validate File Type first (Cheap check)
     if file.content_type != "application/pdf":
         raise HTTPException(400, detail="Only PDF files are supported")
 
-    # 2. Fetch existing profile EARLY to check limits
-    result = await db.execute(select(Profile).filter(Profile.user_id == current_user.id))
-    existing_profile = result.scalars().first()
+    content = await file.read()
+
+    # 2. Run once per identical request (see _run_deduplicated)
+    return await _run_deduplicated(
+        current_user,
+        "upload",
+        request_dedup.fingerprint(target_role, experience_level, str(async_mode), content),
+        idempotency_key,
+        lambda: _process_upload(current_user, target_role, experience_level, content, async_mode),
+    )
 
-    # 3. Check Rate Limit (If profile exists)
-    if existing_profile:
-        # This will raise HTTP 429 if limit exceeded
-        check_and_update_limit(existing_profile, "upload") 
+async def _process_upload(
+    current_user: Principal,
+    target_role: str,
+    experience_level: str,
+    content: bytes,
+    async_mode: bool,
+) -> request_dedup.StoredResponse:
+    # Own session: the run may be shared by coalesced requests and outlive the one that started it
+    async with AsyncSessionLocal() as db:
+        # 3. Rate limit, before any parsing or LLM work (429 + Retry-After)
+        charged_at = await enforce_rate_limit(db, current_user.id, "upload")
 
-    # 4. Parse PDF (Expensive Operation)
-    text_content = await resume_service.parse_pdf(file)
-    
-    if len(text_content) < 50:
-        raise HTTPException(400, detail="Resume content is too short or unreadable.")
+        try:
+            # 4. Parse PDF (Expensive Operation)
+            try:
+                text_content = await resume_service.parse_pdf_bytes(content)
+            except resume_service.PDFParseError as e:
+                raise HTTPException(400, detail=str(e))
+        
+            if len(text_content) < 50:
+                raise HTTPException(400, detail="Resume content is too short or unreadable.")
+
+            # 4b. Local skill-match score, ready in milliseconds, before any LLM work
+            preliminary = skill_matcher.preliminary_score(text_content, target_role)
+
+            # 4c. Async mode: answer now with the preliminary score, the LLM enrichment runs as a job
+            if async_mode:
+                return await _enqueue_upload_job(db, current_user, target_role, experience_level, text_content, preliminary)
+
+            # 5. Call Gemini AI (Expensive Operation)
+            try:
+                ai_result = await ai_service.generate_career_analysis(
+                    resume_text=text_content,
+                    target_role=target_role,
+                    experience_level=experience_level
+                )
+            except ai_service.AnalysisFailed as e:
+                # Nothing is saved: the previous profile (if any) stays as it was
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"AI analysis failed, please try again. ({e})",
+                )
 
-    # 5. Call Gemini AI (Expensive Operation)
+            # 6. Save/Update Profile
+            profile = await profile_service.save_analysis(
+                db,
+                user_id=current_user.id,
+                target_role=target_role,
+                experience_level=experience_level,
+                resume_text=text_content,
+                ai_result=ai_result,
+                preliminary=preliminary,
+            )
+            return request_dedup.StoredResponse(200, jsonable_encoder(ProfileResponse.model_validate(profile)))
+        except Exception:
+            # Nothing was saved: a failed upload does not use up the daily quota (async jobs
+            # refund on failure themselves)
+            await refund_rate_limit(db, current_user.id, "upload", charged_at)
+            raise
+
+async def _enqueue_upload_job(
+    db: AsyncSession,
+    current_user: Principal,
+    target_role: str,
+    experience_level: str,
+    resume_text: str,
+    preliminary: dict | None,
+) -> request_dedup.StoredResponse:
     try:
-        ai_result = await ai_service.generate_career_analysis(
-            resume_text=text_content,
-            target_role=target_role,
-            experience_level=experience_level
-        )
-    except Exception as e:
-        print(f"CRITICAL AI ERROR: {e}")
-        ai_result = {"error": "AI analysis failed", "details": str(e)}
-
-    # 6. Save/Update Profile
-    if existing_profile:
-        existing_profile.target_role = target_role
-        existing_profile.experience_level = experience_level
-        existing_profile.resume_text_content = text_content
-        existing_profile.ai_analysis_json = ai_result
-        # Note: count was already incremented in step 3
-        
-        db.add(existing_profile)
-        await db.commit()
-        await db.refresh(existing_profile)
-        return existing_profile
-    else:
-        # First time upload
-        new_profile = Profile(
+        job = await job_service.create_job(
+            db,
             user_id=current_user.id,
             target_role=target_role,
             experience_level=experience_level,
-            resume_text_content=text_content,
-            ai_analysis_json=ai_result,
-            daily_upload_count=1, # Start at 1
-            last_activity_date=datetime.date.today()
+            resume_text=resume_text,
+            partial_analysis={"preliminary": preliminary},
+        )
+    except job_service.JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many resumes are being analyzed right now. Please try again shortly.",
+            headers={"Retry-After": "30"},
         )
-        db.add(new_profile)
-        await db.commit()
-        await db.refresh(new_profile)
-        return new_profile
+
+    return request_dedup.StoredResponse(
+        status.HTTP_202_ACCEPTED,
+        {
+            "job_id": job.id,
+            "status": job.status,
+            "partial_analysis": job.partial_analysis,
+            "status_url": f"{settings.API_V1_STR}/profile/jobs/{job.id}",
+            "events_url": f"{settings.API_V1_STR}/profile/jobs/{job.id}/events",
+        },
+    )
+
+async def _get_user_job(db: AsyncSession, job_id: str, user_id: str) -> ResumeJob:
+    job = await db.get(ResumeJob, job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(404, "Job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=ResumeJobResponse)
+async def get_upload_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    job = await _get_user_job(db, job_id, current_user.id)
+    return await job_service.describe_job(db, job)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_upload_job(
+    job_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    """
+    Server-Sent Events: emits a `status` event whenever the job's stage, status or
+    partial_analysis (sections of the analysis streamed so far) changes, and closes the stream once the job has succeeded or failed.
+    """
+    await _get_user_job(db, job_id, current_user.id)
+
+    async def event_stream():
+        last_payload = None
+        while not await request.is_disconnected():
+            # Fresh session per poll: the request-scoped one is closed once streaming starts
+            async with AsyncSessionLocal() as session:
+                job = await session.get(ResumeJob, job_id)
+                payload = jsonable_encoder(
+                    ResumeJobResponse.model_validate(await job_service.describe_job(session, job))
+                )
+
+            if payload != last_payload:
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+                last_payload = payload
+
+            if job.status in job_service.TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(settings.RESUME_JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _profile_etag(version: int, current_user: Principal, names: list[str] | None = None) -> str:
+    # Name/email are merged into the response from the principal, so they are part of the tag,
+    # and so is the sparse fieldset: each ?fields= representation has its own validator
+    fieldset = ",".join(sorted(names)) if names else "*"
+    identity = hashlib.sha1(f"{current_user.email}|{current_user.full_name}|{fieldset}".encode()).hexdigest()[:12]
+    return f'W/"{version}-{identity}"'
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" match each other
+    return "*" in candidates or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in candidates]
+
+def _parse_fields(fields: str) -> list[str]:
+    names = []
+    for name in (part.strip() for part in fields.split(",")):
+        for expanded in profile_service.FIELD_PRESETS.get(name, [name]):
+            if expanded and expanded not in names:
+                names.append(expanded)
+    return names
 
 @router.get("/me", response_model=ProfileResponse)
 async def get_my_profile(
+    request: Request,
+    response: Response,
+    fields: str | None = Query(
+        None,
+        description="Comma-separated subset of fields, e.g. 'summary' or 'target_role,ai_analysis_json.match_score'",
+    ),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user_from_claims)
 ):
-    result = await db.execute(
-        select(Profile)
-        .options(selectinload(Profile.user))
-        .filter(Profile.user_id == current_user.id)
-    )
-    profile = result.scalars().first()
+    names = _parse_fields(fields) if fields else None
+
+    # 1. Cheap version probe: answer 304 without touching the resume text or analysis
+    version = await profile_service.get_profile_version(db, current_user.id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    # The representation depends on the caller (and on ?fields=, which is in the URL)
+    cache_headers = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if _etag_matches(request.headers.get("if-none-match"), _profile_etag(version, current_user, names)):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": _profile_etag(version, current_user, names), **cache_headers},
+        )
+
+    # 2a. Sparse fieldset: select just those columns / analysis keys
+    if names:
+        identity = {"full_name": current_user.full_name, "email": current_user.email}
+        db_fields = [name for name in names if name not in identity]
+        try:
+            data = await profile_service.get_profile_fields(db, current_user.id, db_fields + ["version"])
+        except ValueError as e:
+            raise HTTPException(400, detail=str(e))
+        if data is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+
+        headers = {"ETag": _profile_etag(data["version"], current_user, names), **cache_headers}
+        if "version" not in db_fields:
+            del data["version"]
+        data.update({name: value for name, value in identity.items() if name in names})
+        return JSONResponse(content=jsonable_encoder(data), headers=headers)
+
+    # 2b. Changed (or first request): load the full row
+    profile = await profile_service.get_profile_by_user_id(db, current_user.id)
     
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
+
+    # Tag with the version actually served, in case a write landed between the two queries
+    response.headers["ETag"] = _profile_etag(profile.version, current_user)
+    response.headers.update(cache_headers)
     
+    # Name/email come from the already-resolved principal, so the users row is not re-loaded
     response_data = jsonable_encoder(profile)
-    response_data["full_name"] = profile.user.full_name if profile.user else "Unknown"
-    response_data["email"] = profile.user.email if profile.user else "Unknown"
+    response_data["full_name"] = current_user.full_name
+    response_data["email"] = current_user.email
         
     return response_data
 
+@router.get("/role_matches", response_model=list[RoleMatchResponse])
+async def get_role_matches(
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    """
+    Scores the stored resume against every role in the skill taxonomy (local engine, no LLM)
+    and returns the best matches with their skill gaps.
+    """
+    resume_text = await profile_service.get_resume_text(db, current_user.id)
+    if resume_text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return [match.as_dict() for match in skill_matcher.index.rank_roles(resume_text, limit)]
+
+@router.get("/similar_roles", response_model=list[SimilarRoleResponse])
+async def get_similar_roles(
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    """Roles whose embedding is closest to the stored resume (pgvector HNSW search)."""
+    roles = await profile_index.similar_roles(db, current_user.id, limit)
+    if roles is None:
+        # No profile, or it was just uploaded and is still being embedded
+        raise HTTPException(status_code=404, detail="Profile not indexed yet")
+    return roles
+
+@router.get("/similar_profiles", response_model=list[SimilarProfileResponse])
+async def get_similar_profiles(
+    limit: int = Query(10, ge=1, le=50),
+    completed_roadmap: bool = Query(False, description="Only profiles that completed their whole roadmap"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    """Other users' profiles closest to the stored resume, optionally only those who finished their roadmap."""
+    profiles = await profile_index.similar_profiles(db, current_user.id, limit, completed_roadmap)
+    if profiles is None:
+        raise HTTPException(status_code=404, detail="Profile not indexed yet")
+    return profiles
+
+async def _apply_roadmap_updates(db: AsyncSession, user_id: str, updates: list[RoadmapItemUpdate]):
+    if await profile_service.set_roadmap_items_completed(db, user_id, updates):
+        return {"status": "success", "updated_items": [u.model_dump() for u in updates]}
+
+    # Nothing was written: tell "no profile" apart from "bad index" (cheap id-only lookup)
+    result = await db.execute(select(Profile.id).filter(Profile.user_id == user_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(404, "Profile not found")
+    raise HTTPException(400, detail="Invalid roadmap index or structure")
+
 @router.patch("/roadmap/toggle")
 async def toggle_roadmap_item(
     update_data: RoadmapItemUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    result = await db.execute(select(Profile).filter(Profile.user_id == current_user.id))
-    profile = result.scalars().first()
-    
-    if not profile:
-        raise HTTPException(404, "Profile not found")
+    return await _apply_roadmap_updates(db, current_user.id, [update_data])
 
-    ai_data = copy.deepcopy(profile.ai_analysis_json)
-    
-    try:
-        target_phase = ai_data['roadmap'][update_data.phase_index]
-        target_item = target_phase['action_items'][update_data.item_index]
-        target_item['completed'] = update_data.completed
-        
-        profile.ai_analysis_json = ai_data
-        
-        from sqlalchemy.orm.attributes import flag_modified
-        flag_modified(profile, "ai_analysis_json")
-        
-        db.add(profile)
-        await db.commit()
-        
-        return {"status": "success", "updated_roadmap": ai_data['roadmap']}
-        
-    except (IndexError, KeyError, TypeError) as e:
-        print(f"Update Error: {e}")
-        raise HTTPException(400, detail=f"Invalid roadmap index or structure: {str(e)}")
+@router.patch("/roadmap/toggle/batch")
+async def toggle_roadmap_items(
+    batch: RoadmapBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    # All items are applied in one statement: either every update lands or none does
+    return await _apply_roadmap_updates(db, current_user.id, batch.updates)
 
 
 @router.post("/optimize_resume", response_model=ResumeOptimizationResponse)
 async def optimize_resume(
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    # 1. Fetch Profile
-    result = await db.execute(select(Profile).filter(Profile.user_id == current_user.id))
-    profile = result.scalars().first()
+    # 1. The profile version identifies the input (resume text + roadmap progress)
+    version = await profile_service.get_profile_version(db, current_user.id)
     
-    if not profile:
+    if version is None:
         raise HTTPException(404, "Profile not found")
 
-    # 2. Check Rate Limit
-    # This raises 429 if blocked
-    check_and_update_limit(profile, "optimize")
+    # 2. Run once per identical request (see _run_deduplicated)
+    return await _run_deduplicated(
+        current_user,
+        "optimize",
+        request_dedup.fingerprint(str(version)),
+        idempotency_key,
+        lambda: _process_optimize(current_user),
+    )
+
+def _optimization_response(artifact, cached: bool) -> request_dedup.StoredResponse:
+    return request_dedup.StoredResponse(200, {
+        "optimized_content": artifact.latex_content,
+        "artifact_id": artifact.id,
+        "version": artifact.version,
+        "cached": cached,
+    })
 
-    # 3. Save the incremented count IMMEDIATELY
-    # We do this before calling AI to prevent "race condition" spamming
-    db.add(profile)
-    await db.commit() 
-    
-    # 4. Extract Completed Tasks
-    completed_tasks = []
-    roadmap = profile.ai_analysis_json.get("roadmap", [])
-    
-    for phase in roadmap:
-        for item in phase.get("action_items", []):
-            if isinstance(item, dict) and item.get("completed") is True:
-                completed_tasks.append(item.get("task"))
+async def _process_optimize(current_user: Principal) -> request_dedup.StoredResponse:
+    async with AsyncSessionLocal() as db:
+        # 3. Fetch Profile (only the columns used below) and its completed tasks
+        profile, completed_tasks = await profile_service.get_profile_for_optimize(db, current_user.id)
+        if not profile:
+            raise HTTPException(404, "Profile not found")
+
+        # 4. Same resume, role and completed tasks as a stored version? Serve it (no LLM call, no quota)
+        content_hash = resume_artifacts.make_artifact_key(
+            profile.resume_text_content, profile.target_role, completed_tasks, ai_service.RESUME_PROMPT_VERSION
+        )
+        artifact = await resume_artifacts.get_by_hash(db, current_user.id, content_hash)
+        if artifact:
+            llm_telemetry.record_cache_hit("optimized_resume", "artifact_store")
+            return _optimization_response(artifact, cached=True)
+
+        # 5. Rate limit, before the LLM call
+        charged_at = await enforce_rate_limit(db, current_user.id, "optimize")
 
-    # 5. Call AI Service
+    # 6. Call AI Service
     optimized_text = await ai_service.generate_optimized_resume(
         original_text=profile.resume_text_content,
         target_role=profile.target_role,
         completed_tasks=completed_tasks
     )
-    
-    return {"optimized_content": optimized_text}
\ No newline at end of file
+    if optimized_text.startswith(ai_service.RESUME_ERROR_PREFIX):
+        # An error, not a 200: never stored as an artifact nor replayed for the Idempotency-Key,
+        # and the optimization quota is given back
+        async with AsyncSessionLocal() as db:
+            await refund_rate_limit(db, current_user.id, "optimize", charged_at)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Resume optimization failed, please try again.",
+        )
+
+    # 7. Persist as the next version
+    async with AsyncSessionLocal() as db:
+        artifact = await resume_artifacts.store(
+            db,
+            user_id=current_user.id,
+            content_hash=content_hash,
+            prompt_version=ai_service.RESUME_PROMPT_VERSION,
+            target_role=profile.target_role,
+            completed_tasks=completed_tasks,
+            latex_content=optimized_text,
+        )
+    return _optimization_response(artifact, cached=False)
+
+@router.get("/resumes", response_model=list[ResumeArtifactSummary])
+async def list_resume_versions(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    return await resume_artifacts.list_artifacts(db, current_user.id)
+
+@router.get("/resumes/{artifact_id}", response_model=ResumeArtifactResponse)
+async def get_resume_version(
+    artifact_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_from_claims)
+):
+    artifact = await resume_artifacts.get_artifact(db, current_user.id, artifact_id)
+    if not artifact:
+        raise HTTPException(404, "Resume version not found")
+    return artifact
@@ -1,6 +1,19 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 
+# Default LLM candidates per call type. An LLM_ROUTES override is merged into these, so
+# overriding one call type does not drop the others.
+DEFAULT_LLM_ROUTES: dict[str, list[str]] = {
+    "career_analysis": ["vertex:gemini-2.5-flash@us-central1", "vertex:gemini-2.5-flash@us-east4"],
+    "optimized_resume": ["vertex:gemini-2.5-flash@us-central1", "vertex:gemini-2.5-flash@us-east4"],
+    "chat": ["vertex:gemini-2.5-flash-lite@us-central1", "vertex:gemini-2.5-flash-lite@us-east4"],
+    "chat_summary": ["vertex:gemini-2.5-flash-lite@us-central1", "vertex:gemini-2.5-flash-lite@us-east4"],
+    # Sub-generations of career_analysis when ANALYSIS_FANOUT_ENABLED
+    "career_assessment": ["vertex:gemini-2.5-flash@us-central1", "vertex:gemini-2.5-flash@us-east4"],
+    "career_roadmap": ["vertex:gemini-2.5-flash@us-central1", "vertex:gemini-2.5-flash@us-east4"],
+}
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "SkillSync AI"
     API_V1_STR: str = "/api/v1"
@@ -19,9 +32,140 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing (Argon2id). Raising these re-hashes users on their next login.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536 # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_IN_FLIGHT: int = 8
+
+    # Authenticated-principal cache used by get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    # When True, hot read endpoints trust the signed token claims and skip the DB/cache entirely.
+    # Trade-off: a deactivated user keeps read access until their token expires.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
     GOOGLE_CLOUD_PROJECT: Optional[str] = None
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
 
+    # LLM routing: candidate models per call type, as "provider:model@location" specs
+    # (providers: "vertex", or "fake" for offline runs, e.g. "fake:local?latency_ms=300").
+    # The fastest candidate by recent p95 is used first; the next one receives hedged requests
+    # and, whatever the samples, the retry when the first one fails.
+    LLM_ROUTES: dict[str, list[str]] = DEFAULT_LLM_ROUTES
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_HEDGE_MIN_SAMPLES: int = 20 # No hedging until a model has this many latency samples
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    LLM_LATENCY_WINDOW: int = 200
+    LLM_ROUTE_EXPLORE_RATE: float = 0.05 # Share of calls sent to not-yet-measured candidates
+    LLM_ERROR_PENALTY_SECONDS: float = 30.0 # Latency sample recorded for a failed call
+    LLM_STREAM_FIRST_CHUNK_TIMEOUT_SECONDS: float = 15.0 # Streams fail over if nothing arrived by then
+
+    # LLM token budgets: resume text is cleaned and trimmed to the input budget,
+    # and each call type gets its own output cap
+    LLM_RESUME_INPUT_TOKEN_BUDGET: int = 6000
+    LLM_MAX_OUTPUT_TOKENS_ANALYSIS: int = 6144
+    LLM_MAX_OUTPUT_TOKENS_ASSESSMENT: int = 1024 # Fan-out: score, summary, skills (the roadmap uses ..._ANALYSIS)
+    LLM_MAX_OUTPUT_TOKENS_RESUME: int = 6144
+    LLM_MAX_OUTPUT_TOKENS_CHAT: int = 1024
+    LLM_MAX_OUTPUT_TOKENS_SUMMARY: int = 400
+
+    # Chat sessions: the last CHAT_HISTORY_TURNS turns go into the prompt verbatim, older ones
+    # are folded into a rolling summary once CHAT_SUMMARY_MIN_NEW_MESSAGES have piled up
+    CHAT_HISTORY_TURNS: int = 4
+    CHAT_HISTORY_MESSAGE_MAX_TOKENS: int = 600
+    CHAT_SUMMARY_MIN_NEW_MESSAGES: int = 4
+    # Hard cap on messages loaded verbatim, even while summaries are failing or behind
+    CHAT_HISTORY_MAX_MESSAGES: int = 24
+
+    # Career analysis generation: fan-out into concurrent assessment + roadmap calls
+    ANALYSIS_FANOUT_ENABLED: bool = True
+    ANALYSIS_MAX_CONCURRENT_CALLS: int = 8 # Analysis LLM calls in flight per process, across all uploads
+
+    # Career analysis cache (in-process LRU in front of the analysis_cache table)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 256
+    ANALYSIS_CACHE_DB_MAX_ENTRIES: int = 10000
+    ANALYSIS_CACHE_EVICTION_INTERVAL_SECONDS: int = 300 # How often a process trims the table
+
+    # Embeddings ("hashing:v1" works offline; "vertex:text-embedding-004@us-central1" for Vertex).
+    # Changing the dimensions requires a migration of the vector columns.
+    EMBEDDING_MODEL: str = "hashing:v1"
+    EMBEDDING_DIMENSIONS: int = 384
+
+    # Rendered per-profile chat context, reused until the profile version changes
+    CHAT_CONTEXT_CACHE_MAX_ENTRIES: int = 10000
+    CHAT_CONTEXT_CACHE_TTL_SECONDS: int = 60 * 60
+
+    # Semantic chat cache (pgvector): reuse answers to near-identical questions asked with the
+    # same target role, experience level, missing skills and phase 1 topics
+    CHAT_CACHE_ENABLED: bool = True
+    # Minimum cosine similarity per embedding provider. Providers not listed here (the offline
+    # "hashing" bag of words, which scores "3 years" vs "10 years" above 0.95) only reuse
+    # answers to the exact same question (case and whitespace aside).
+    CHAT_CACHE_SIMILARITY_THRESHOLDS: dict[str, float] = {"vertex": 0.92}
+    CHAT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    CHAT_CACHE_EF_SEARCH: int = 100
+    CHAT_CACHE_SWEEP_INTERVAL_SECONDS: int = 300 # How often a process deletes expired entries
+
+    # Resume / role similarity index (pgvector HNSW, embeddings from EMBEDDING_MODEL)
+    PROFILE_INDEX_ENABLED: bool = True
+    PROFILE_EMBEDDING_MAX_CHARS: int = 8000 # Of cleaned resume text
+    PROFILE_SIMILARITY_EF_SEARCH: int = 40 # HNSW candidate list per query (recall vs latency)
+    PROFILE_INDEX_BACKFILL_BATCH_SIZE: int = 100 # Profiles embedded per batch by the startup backfill
+
+    # Background resume upload jobs (?async_mode=true on /profile/upload)
+    RESUME_JOB_WORKERS: int = 2
+    RESUME_JOB_QUEUE_MAX_SIZE: int = 100
+    RESUME_JOB_EVENTS_POLL_SECONDS: float = 1.0
+    RESUME_JOB_LEASE_SECONDS: int = 120 # Renewed while running; expired leases are re-queued by the sweep
+    RESUME_JOB_RETENTION_DAYS: int = 7 # Finished jobs older than this are deleted
+
+    # PDF text extraction (process pool, so parsing never blocks the event loop)
+    PDF_PARSE_WORKERS: int = 2
+    PDF_PARSE_MAX_CONCURRENT_JOBS: int = 4
+    PDF_PARSE_PAGES_PER_CHUNK: int = 4
+    PDF_PARSE_TIMEOUT_SECONDS: float = 20.0
+
+    # Bulk analysis (/analysis/batch): many resumes against one role, results streamed as NDJSON
+    BATCH_MAX_FILES: int = 500 # PDFs per batch, after unpacking archives
+    BATCH_MAX_TOTAL_BYTES: int = 200 * 1024 * 1024 # Uncompressed size of all PDFs in a batch
+    # Resumes being parsed/analyzed at once across ALL batches. Kept below PDF_PARSE_MAX_CONCURRENT_JOBS
+    # and ANALYSIS_MAX_CONCURRENT_CALLS (2 calls per resume when fanned out), so interactive
+    # uploads always find free slots.
+    BATCH_ANALYSIS_CONCURRENCY: int = 2
+    BATCH_READ_CHUNK_BYTES: int = 1024 * 1024
+
+    # Per-user rate limits (enforced by app/services/rate_limiter.py before any parse/LLM work)
+    RATE_LIMIT_UPLOADS_PER_DAY: int = 2
+    RATE_LIMIT_OPTIMIZES_PER_DAY: int = 3
+    RATE_LIMIT_CHAT_MESSAGES_PER_HOUR: int = 60
+    RATE_LIMIT_BATCHES_PER_DAY: int = 10
+    RATE_LIMIT_BATCH_RESUMES_PER_DAY: int = 100 # Each resume in a batch is one LLM analysis
+    RATE_LIMIT_BLOCKED_CACHE_MAX_ENTRIES: int = 10000
+
+    # Idempotency-Key support on upload / optimize
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60 # How long a successful response can be replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 300 # After this an unfinished claim counts as abandoned
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0 # How long a retry waits for another worker's result
+
+    # Database engine / SQL instrumentation
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_ECHO: bool = False # Log every statement (what echo=True used to do, now opt-in)
+    DB_SLOW_QUERY_SECONDS: float = 0.5
+    DB_REQUEST_QUERY_WARN_COUNT: int = 20 # Log requests issuing more queries than this (N+1 smell)
+    # Lets a request send "X-Debug-SQL: 1" to log its own statements; keep off in production
+    DB_DEBUG_HEADER_ENABLED: bool = False
+
+    @field_validator("LLM_ROUTES")
+    @classmethod
+    def _merge_default_routes(cls, routes: dict[str, list[str]]) -> dict[str, list[str]]:
+        return {**DEFAULT_LLM_ROUTES, **routes}
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         # PRIORITY: If Render provides DATABASE_URL, use it directly.
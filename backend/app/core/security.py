@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 from jose import jwt
@@ -5,7 +7,20 @@ from passlib.context import CryptContext
 from app.core.config import settings
 
 # CHANGED: Use argon2 scheme as agreed
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Changing the ARGON2_* settings is safe: older hashes still verify and are
+# transparently re-hashed with the new parameters on the user's next login.
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Argon2 (argon2-cffi) releases the GIL, so a small thread pool hashes in parallel
+# without blocking the event loop. The semaphore bounds in-flight hashes (CPU + memory_cost each).
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_IN_FLIGHT)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -13,12 +28,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
+async def _run_hash_op(fn, *args):
+    async with _hash_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_op(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_op(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Returns (is_valid, new_hash). new_hash is set when the stored hash was made with
+    outdated Argon2 parameters and should be replaced.
+    """
+    return await _run_hash_op(pwd_context.verify_and_update, plain_password, hashed_password)
+
+def create_access_token(
+    subject: str | Any,
+    expires_delta: timedelta | None = None,
+    extra_claims: dict | None = None,
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(extra_claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
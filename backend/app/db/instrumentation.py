@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from typing import Coroutine
+
+from fastapi import Request
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+sql_logger = logging.getLogger("app.db.sql")
+
+DB_QUERY_SECONDS = Histogram(
+    "skillsync_db_query_seconds",
+    "SQL statement execution time by statement type.",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_SLOW_QUERIES = Counter(
+    "skillsync_db_slow_queries_total",
+    "Statements slower than DB_SLOW_QUERY_SECONDS.",
+    ["operation"],
+)
+DB_QUERY_ERRORS = Counter(
+    "skillsync_db_query_errors_total",
+    "Statements that raised a database error.",
+    ["operation"],
+)
+DB_REQUEST_QUERIES = Histogram(
+    "skillsync_db_request_queries",
+    "Number of SQL statements issued per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55),
+)
+DB_REQUEST_QUERY_SECONDS = Histogram(
+    "skillsync_db_request_query_seconds",
+    "Total SQL execution time per HTTP request.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "skillsync_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "skillsync_db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after DB_POOL_TIMEOUT_SECONDS (pool exhausted).",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "skillsync_db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+)
+DB_POOL_CAPACITY = Gauge(
+    "skillsync_db_pool_capacity_connections",
+    "Maximum connections the pool will open (pool size + max overflow).",
+)
+
+
+@dataclass
+class QueryStats:
+    """Per-request SQL totals, filled in by the engine events while the request runs."""
+    count: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+    debug: bool = False
+
+
+_request_stats: ContextVar[QueryStats | None] = ContextVar("db_request_stats", default=None)
+
+
+def spawn_background(coro: Coroutine) -> asyncio.Task:
+    """
+    create_task() for work that outlives the request (cache writes, summaries, indexing).
+    Tasks inherit the caller's context, so without this their queries would be added to the
+    request that happened to start them.
+    """
+    context = copy_context()
+    context.run(_request_stats.set, None)
+    return asyncio.create_task(coro, context=context)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times connection checkouts. SQLAlchemy only has a "checkout" event once a
+    connection has been obtained, so time spent waiting on an exhausted pool is measured here.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError: # sqlalchemy's, not the builtin TimeoutError
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def _operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    operation = _operation(statement)
+    DB_QUERY_SECONDS.labels(operation=operation).observe(elapsed)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    if elapsed >= settings.DB_SLOW_QUERY_SECONDS:
+        DB_SLOW_QUERIES.labels(operation=operation).inc()
+        if stats is not None:
+            stats.slow += 1
+        logger.warning("slow query %.3fs: %s", elapsed, " ".join(statement.split())[:500])
+
+    if settings.DB_ECHO or (stats is not None and stats.debug):
+        sql_logger.info("%.2fms %s %r", elapsed * 1000, statement, parameters)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+    DB_QUERY_ERRORS.labels(operation=_operation(exception_context.statement or "")).inc()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+    pool = sync_engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+        DB_POOL_CAPACITY.set(settings.DB_POOL_SIZE + max(settings.DB_MAX_OVERFLOW, 0))
+
+
+async def sql_metrics_middleware(request: Request, call_next):
+    """
+    Counts the statements each request issues. Adds X-DB-Query-Count / X-DB-Query-Time-Ms to
+    the response and logs requests above DB_REQUEST_QUERY_WARN_COUNT queries.
+    """
+    stats = QueryStats(
+        debug=settings.DB_DEBUG_HEADER_ENABLED and request.headers.get("x-debug-sql") == "1"
+    )
+    token = _request_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_stats.reset(token)
+
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    DB_REQUEST_QUERIES.labels(route=route_path).observe(stats.count)
+    DB_REQUEST_QUERY_SECONDS.labels(route=route_path).observe(stats.seconds)
+
+    if stats.count > settings.DB_REQUEST_QUERY_WARN_COUNT:
+        logger.warning(
+            "%s %s issued %d queries (%.1fms) - possible N+1",
+            request.method, route_path, stats.count, stats.seconds * 1000,
+        )
+
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+    response.headers["X-DB-Query-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+    return response
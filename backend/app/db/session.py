@@ -1,17 +1,24 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.instrumentation import InstrumentedQueuePool, instrument_engine
 
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     future=True,
-    echo=True,
+    # Statement logging is handled by app.db.instrumentation (DB_ECHO / X-Debug-SQL)
+    echo=False,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
     connect_args={
         "statement_cache_size": 0,
         "prepared_statement_cache_size": 0,
         "ssl": "require",  # <--- FORCE SSL CONNECTION
     }
 )
+instrument_engine(engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -22,4 +29,4 @@ AsyncSessionLocal = sessionmaker(
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -1,14 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import auth, profile, chat
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.api.v1.endpoints import auth, profile, chat, analysis
+from app.db.instrumentation import sql_metrics_middleware
+from app.services import job_service, profile_index, resume_service
+from app.services.llm_registry import registry as llm_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background worker pool for async resume uploads
+    await job_service.start_workers()
+    # Role embeddings + backfill of profiles missing from the similarity index
+    profile_index.start_background_indexing()
+    yield
+    await profile_index.stop_background_indexing()
+    await job_service.stop_workers()
+    resume_service.shutdown_executor()
+    # LLM clients are created lazily on first use; drop them (and their channels) on shutdown
+    llm_registry.close()
 
 
 app = FastAPI(
     title="SkillSync AI API",
     version="2.0.0",
-    description="Clean Architecture Backend for SkillSync AI"
+    description="Clean Architecture Backend for SkillSync AI",
+    lifespan=lifespan,
 )
 
+# Per-request SQL query count/time (see app/db/instrumentation.py)
+app.middleware("http")(sql_metrics_middleware)
+
 # ---------------------------------------------------------
 # NEW: CORS Configuration
 # This tells the browser: "Allow requests from localhost:3000"
@@ -40,6 +63,14 @@ app.include_router(profile.router, prefix="/api/v1/profile", tags=["Profile"])
 
 app.include_router(chat.router, prefix="/api/v1/chat", tags=["Chat"])
 
+# Bulk resume scoring (career services)
+app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["Analysis"])
+
 @app.get("/")
 async def root():
-    return {"message": "SkillSync AI System Operational", "status": "active"}
\ No newline at end of file
+    return {"message": "SkillSync AI System Operational", "status": "active"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Prometheus scrape endpoint (cache hit/miss counters, etc.)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
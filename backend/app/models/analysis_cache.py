@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+
+    # sha256 of (normalized resume text, target role, experience level, prompt version, model)
+    cache_key = Column(String(64), primary_key=True)
+
+    model_name = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    analysis_json = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Refreshed on every DB hit and rewrite; size eviction drops the least recently used rows
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
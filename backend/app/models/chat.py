@@ -0,0 +1,34 @@
+import uuid
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), index=True, nullable=False)
+    title = Column(String, nullable=True) # First user message, shortened
+
+    # Messages get seq 1..message_count; reserved atomically by incrementing this counter
+    message_count = Column(Integer, nullable=False, default=0)
+
+    # Rolling summary of every message with seq <= summary_seq (refreshed in the background)
+    summary = Column(Text, nullable=True)
+    summary_seq = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ChatMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    role = Column(String, nullable=False) # user | assistant
+    content = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (UniqueConstraint("session_id", "seq", name="uq_chat_messages_session_seq"),)
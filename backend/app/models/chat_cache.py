@@ -0,0 +1,35 @@
+import uuid
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.db.base import Base
+
+class ChatCacheEntry(Base):
+    __tablename__ = "chat_cache"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # sha256 of (target role, missing-skills fingerprint, chat prompt version, embedder):
+    # answers are only reused between users with the same context
+    scope_key = Column(String(64), nullable=False)
+
+    message = Column(Text, nullable=False)
+    # sha256 of the normalized message: one answer per (scope, message), and the exact-match key
+    message_hash = Column(String(64), nullable=False)
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSIONS), nullable=False)
+    response = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_chat_cache_scope_message", "scope_key", "message_hash", unique=True),
+        Index(
+            "ix_chat_cache_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    # Keys are scoped per user, so two users can never replay each other's responses
+    user_id = Column(String, primary_key=True)
+    key = Column(String(255), primary_key=True) # Idempotency-Key header value
+
+    operation = Column(String, nullable=False) # upload | optimize
+    request_hash = Column(String(64), nullable=False) # fingerprint of the request the key was first used with
+
+    # NULL while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    response_json = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # In progress: when the claim is considered abandoned. Completed: when the replay expires.
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
 import uuid
-import datetime
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, JSON, Date
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -18,16 +18,16 @@ class Profile(Base):
     # The Parsed Data (We store the raw text for the AI to read)
     resume_text_content = Column(Text, nullable=False)
     # NEW: AI Analysis Result
-    ai_analysis_json = Column(JSON, nullable=True)
+    # JSONB so single roadmap items can be updated in place with jsonb_set()
+    ai_analysis_json = Column(JSONB, nullable=True)
     
     
+    # Bumped on every write that changes what /profile/me returns (upload, roadmap toggle).
+    # Used as the ETag so unchanged profiles can be answered with 304.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-
-    daily_upload_count = Column(Integer, default=0)
-    daily_optimize_count = Column(Integer, default=0)
-    last_activity_date = Column(Date, default=datetime.date.today)
-
     # Relationship back to User
     user = relationship("User", backref="profile")
\ No newline at end of file
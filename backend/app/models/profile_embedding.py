@@ -0,0 +1,65 @@
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.db.base import Base
+
+class ProfileEmbedding(Base):
+    __tablename__ = "profile_embeddings"
+
+    # One row per profile, replaced when the resume changes
+    profile_id = Column(String, ForeignKey("profiles.id", ondelete="CASCADE"), primary_key=True)
+
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSIONS), nullable=False)
+    model = Column(String, nullable=False) # Embedder spec; vectors of different models are never compared
+    content_hash = Column(String(64), nullable=False) # sha256 of the embedded text, to skip unchanged uploads
+
+    # Denormalized from the profile so similarity queries never touch the profiles table
+    target_role = Column(String, nullable=False)
+    experience_level = Column(String, nullable=False)
+    roadmap_completed = Column(Boolean, nullable=False, default=False, server_default="false")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_profile_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        # "Similar profiles that completed their roadmap" gets its own graph, so the filter
+        # does not throw away most of the HNSW candidates
+        Index(
+            "ix_profile_embeddings_completed_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_where=text("roadmap_completed"),
+        ),
+    )
+
+class RoleEmbedding(Base):
+    __tablename__ = "role_embeddings"
+
+    # Role id from app/services/skill_taxonomy.py
+    role_id = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+
+    embedding = Column(Vector(settings.EMBEDDING_DIMENSIONS), nullable=False)
+    model = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_role_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
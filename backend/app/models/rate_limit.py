@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime
+from app.db.base import Base
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limits"
+
+    # One row per (user, action): the GCRA "theoretical arrival time". Each hit pushes it
+    # period/max_hits further; a hit is allowed while it stays within one period of now.
+    # Updated only through a single atomic upsert in app/services/rate_limiter.py.
+    subject = Column(String, primary_key=True) # user id
+    action = Column(String, primary_key=True) # upload | optimize | chat
+
+    tat = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ResumeArtifact(Base):
+    __tablename__ = "resume_artifacts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "content_hash", name="uq_resume_artifacts_user_hash"),
+        UniqueConstraint("user_id", "version", name="uq_resume_artifacts_user_version"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), index=True, nullable=False)
+    version = Column(Integer, nullable=False) # 1, 2, 3... per user
+
+    # sha256 of (normalized resume text, target role, sorted completed tasks, prompt version)
+    content_hash = Column(String(64), nullable=False)
+    prompt_version = Column(String, nullable=False)
+
+    # Inputs the document was generated from, for the listing
+    target_role = Column(String, nullable=False)
+    completed_tasks = Column(JSON, nullable=False)
+
+    latex_content = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,35 @@
+import uuid
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, JSON, LargeBinary
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ResumeJob(Base):
+    __tablename__ = "resume_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), index=True, nullable=False)
+
+    # queued -> running -> succeeded | failed
+    status = Column(String, nullable=False, default="queued", index=True)
+    # parse -> analyze -> save -> done (the stage currently being worked on)
+    stage = Column(String, nullable=False, default="parse")
+    error = Column(Text, nullable=True)
+    # While running: the worker holding the job renews this; once it passes, the job is up for grabs
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Inputs
+    target_role = Column(String, nullable=False)
+    experience_level = Column(String, nullable=False)
+    file_content = Column(LargeBinary, nullable=True) # Dropped once the PDF has been parsed
+
+    # Intermediate results, persisted per stage so a restarted worker can resume
+    resume_text_content = Column(Text, nullable=True)
+    ai_analysis_json = Column(JSON, nullable=True)
+    # Sections of the analysis validated so far, while it is still streaming
+    partial_analysis = Column(JSON, nullable=True)
+
+    # Output
+    profile_id = Column(String, ForeignKey("profiles.id"), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+
+# Shape of the career analysis the LLM returns (see ANALYSIS_SYSTEM_PROMPT)
+
+class SkillScore(BaseModel):
+    category: str
+    score: int = Field(ge=0, le=100)
+
+class ActionItem(BaseModel):
+    task: str
+    completed: bool = False
+
+class RoadmapPhase(BaseModel):
+    phase: str
+    week: str | None = None
+    topics: list[str] = []
+    # Required and non-empty: a phase without tasks is a truncated or degenerate response
+    action_items: list[ActionItem] = Field(min_length=1)
+
+# The analysis can be generated in one call or fanned out into an assessment call and a
+# roadmap call running concurrently; both merge into CareerAnalysis.
+
+class CareerAssessment(BaseModel):
+    match_score: int = Field(ge=0, le=100)
+    executive_summary: str
+    skill_breakdown: list[SkillScore] = []
+    missing_skills: list[str] = []
+
+class CareerRoadmap(BaseModel):
+    roadmap: list[RoadmapPhase] = Field(min_length=1)
+
+class CareerAnalysis(CareerAssessment):
+    roadmap: list[RoadmapPhase] = Field(min_length=1)
@@ -1,7 +1,28 @@
+from datetime import datetime
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: str | None = None # Omit to start a new conversation
 
 class ChatResponse(BaseModel):
-    response: str
\ No newline at end of file
+    response: str
+    session_id: str
+
+class ChatSessionResponse(BaseModel):
+    id: str
+    title: str | None = None
+    message_count: int
+    updated_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+class ChatMessageResponse(BaseModel):
+    seq: int
+    role: str # user | assistant
+    content: str
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Any
 
@@ -13,6 +13,7 @@ class ProfileResponse(ProfileBase):
     resume_text_content: str
     ai_analysis_json: Any | None = None 
     updated_at: datetime | None
+    version: int = 1
 
     # --- NEW FIELDS FOR SETTINGS PAGE ---
     full_name: str | None = None
@@ -24,10 +25,62 @@ class ProfileResponse(ProfileBase):
 
 
 class RoadmapItemUpdate(BaseModel):
-    phase_index: int
-    item_index: int
+    phase_index: int = Field(ge=0)
+    item_index: int = Field(ge=0)
     completed: bool
 
+class RoadmapBatchUpdate(BaseModel):
+    updates: list[RoadmapItemUpdate] = Field(min_length=1, max_length=200)
+
 class ResumeOptimizationResponse(BaseModel):
     optimized_content: str
-    
\ No newline at end of file
+    artifact_id: str | None = None # None when generation failed (nothing was stored)
+    version: int | None = None
+    cached: bool = False # Served from a stored artifact with identical inputs
+
+class ResumeArtifactSummary(BaseModel):
+    id: str
+    version: int
+    target_role: str
+    completed_tasks: list[str]
+    prompt_version: str
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+class ResumeArtifactResponse(ResumeArtifactSummary):
+    latex_content: str
+    
+class RoleMatchResponse(BaseModel):
+    role: str
+    match_score: int
+    matched_skills: list[str]
+    missing_skills: list[str]
+    engine: str
+
+class SimilarRoleResponse(BaseModel):
+    role_id: str
+    role: str
+    similarity: float # cosine similarity of the resume and role embeddings
+
+class SimilarProfileResponse(BaseModel):
+    # Anonymous on purpose: no ids or resume content of other users
+    target_role: str
+    experience_level: str
+    roadmap_completed: bool
+    similarity: float
+
+class ResumeJobStage(BaseModel):
+    name: str # parse | analyze | save
+    status: str # pending | running | done | failed
+
+class ResumeJobResponse(BaseModel):
+    job_id: str
+    status: str # queued | running | succeeded | failed
+    stage: str
+    stages: list[ResumeJobStage]
+    error: str | None = None
+    # Analysis sections available so far (match_score first), before the job completes
+    partial_analysis: dict[str, Any] | None = None
+    profile: ProfileResponse | None = None # Set once the job has succeeded
@@ -17,4 +17,13 @@ class UserResponse(UserBase):
     is_active: bool
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+# The authenticated caller, as resolved by get_current_user (cached; never includes the password hash)
+class Principal(BaseModel):
+    id: str
+    email: str
+    full_name: str | None = None
+    is_active: bool = True
+
+    class Config:
+        from_attributes = True
@@ -1,27 +1,31 @@
-import json
-from langchain_google_vertexai import ChatVertexAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.output_parsers import StrOutputParser
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+from pydantic import BaseModel
 from app.core.config import settings
+from app.schemas.analysis import CareerAnalysis, CareerAssessment, CareerRoadmap
+from app.services import analysis_cache, analysis_parser, llm_telemetry, prompt_budget
+from app.services.llm_router import router
 
-from langchain_core.messages import SystemMessage, HumanMessage # <--- Add this
+logger = logging.getLogger(__name__)
 
-# UPDATED: Using user-specified model name
-llm = ChatVertexAI(
-    model_name="gemini-2.5-flash", 
-    temperature=0.2,
-    max_output_tokens=8192,
-    location="us-central1" # Ensure this matches the region where the model is deployed
-)
+# Bump this whenever the analysis prompt or JSON shape changes, so cached analyses are not reused.
+ANALYSIS_PROMPT_VERSION = "v1"
+# Same for the LaTeX resume prompt (stored resume artifacts are keyed by it)
+RESUME_PROMPT_VERSION = "v1"
+# Prefix of the placeholder document returned when generation fails
+RESUME_ERROR_PREFIX = "% Error generating resume"
 
-async def generate_career_analysis(resume_text: str, target_role: str, experience_level: str) -> dict:
-    # 1. Define the Persona and Instructions
-    # We use DOUBLE CURLY BRACES {{ }} for the JSON example so LangChain ignores them.
-    system_prompt = """You are an expert Senior Technical Career Coach and AI System Architect.
+# 1. Define the Persona and Instructions
+# We use DOUBLE CURLY BRACES {{ }} for the JSON example so LangChain ignores them.
+ANALYSIS_SYSTEM_PROMPT = """You are an expert Senior Technical Career Coach and AI System Architect.
     Your goal is to analyze a candidate's resume against a specific target role and generate a structured JSON analysis.
-    
+
     You must output STRICT JSON. Do not output markdown code blocks. Just the raw JSON object.
-    
+
     The JSON structure must be:
     {{
         "match_score": <integer 0-100>,
@@ -47,56 +51,66 @@ async def generate_career_analysis(resume_text: str, target_role: str, experienc
     }}
     """
 
-    # 2. Define the User Input
-    user_prompt = f"""
-    CANDIDATE PROFILE:
-    Target Role: {target_role}
-    Experience Level: {experience_level}
-    
-    RESUME TEXT:
-    {resume_text}
-    
-    Analyze this now and provide the JSON output.
-    """
+# Fan-out (ANALYSIS_FANOUT_ENABLED): the same analysis as two independent calls run concurrently,
+# so the latency is the longer of the two generations instead of their sum.
+ASSESSMENT_SYSTEM_PROMPT = """You are an expert Senior Technical Career Coach.
+    Your goal is to assess how well a candidate's resume fits a specific target role and output a structured JSON assessment.
 
-    # 3. Construct the Chain
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("user", user_prompt)
-    ])
-    
-    chain = prompt | llm | JsonOutputParser()
+    You must output STRICT JSON. Do not output markdown code blocks. Just the raw JSON object.
 
-    # 4. Execute
-    try:
-        result = await chain.ainvoke({})
-        return result
-    except Exception as e:
-        print(f"AI Generation Error: {e}")
-        return {
-            "match_score": 0, 
-            "executive_summary": f"AI Analysis failed: {str(e)}",
-            "missing_skills": [],
-            "roadmap": []
-        }
+    The JSON structure must be:
+    {{
+        "match_score": <integer 0-100>,
+        "executive_summary": "<string: 2 sentence summary of their fit>",
+        "skill_breakdown": [
+            {{ "category": "Technical Skills", "score": <integer 0-100> }},
+            {{ "category": "System Design", "score": <integer 0-100> }},
+            {{ "category": "Communication", "score": <integer 0-100> }},
+            {{ "category": "Leadership", "score": <integer 0-100> }}
+        ],
+        "missing_skills": ["<string>", "<string>", ...]
+    }}
+    """
 
+ROADMAP_SYSTEM_PROMPT = """You are an expert Senior Technical Career Coach.
+    Your goal is to identify the gaps between a candidate's resume and a specific target role, and output a structured JSON learning plan that closes them.
 
-# ... existing imports ...
+    You must output STRICT JSON. Do not output markdown code blocks. Just the raw JSON object.
 
-async def generate_optimized_resume(original_text: str, target_role: str, completed_tasks: list[str]) -> str:
+    The JSON structure must be:
+    {{
+        "roadmap": [
+            {{
+                "phase": "Phase 1: Foundations",
+                "week": "Week 1-2",
+                "topics": ["<topic1>", "<topic2>"],
+                "action_items": [
+                    {{ "task": "<specific task 1>", "completed": false }},
+                    {{ "task": "<specific task 2>", "completed": false }}
+                ]
+            }}
+        ]
+    }}
     """
-    Rewrites the resume to include completed roadmap tasks and optimizes for ATS.
+
+# 2. Define the User Input (filled in per call, so resume text is never parsed as a template)
+ANALYSIS_USER_PROMPT = """
+    CANDIDATE PROFILE:
+    Target Role: {target_role}
+    Experience Level: {experience_level}
+
+    RESUME TEXT:
+    {resume_text}
+
+    Analyze this now and provide the JSON output.
     """
-    
-    tasks_str = "\n- ".join(completed_tasks) if completed_tasks else "No specific roadmap tasks completed yet."
 
-    # NOTE: We use python f-string (f""") here.
-    # 1. We double curly braces {{ }} for LaTeX commands so Python produces literal { }.
-    # 2. We use single braces { } for Python variables we want to inject.
-    
-    system_content = f"""You are an expert LaTeX Resume Developer.
+# NOTE: These are prompt templates, not f-strings.
+# 1. We double curly braces {{ }} for LaTeX commands so LangChain produces literal { }.
+# 2. We use single braces { } for the variables injected per call.
+RESUME_SYSTEM_PROMPT = """You are an expert LaTeX Resume Developer.
     Your goal is to rewrite a candidate's resume into a high-quality, professional LaTeX document.
-    
+
     INSTRUCTIONS:
     1. Use a standard, clean article class (e.g., \\documentclass{{article}}).
     2. Use \\usepackage{{geometry}} to set 1-inch margins.
@@ -105,31 +119,253 @@ async def generate_optimized_resume(original_text: str, target_role: str, comple
     5. Output ONLY the raw LaTeX code starting with \\documentclass and ending with \\end{{document}}.
     6. Integrate these NEW SKILLS into the content:
     {tasks_str}
-    
+
     7. Optimize bullet points for the role: {target_role}.
     """
 
-    user_content = f"""
+RESUME_USER_PROMPT = """
     ORIGINAL CONTENT:
     {original_text}
-    
+
     GENERATE LATEX CODE NOW.
     """
 
-    # We pass message objects directly. This prevents LangChain from 
-    # trying to parse "{article}" as a variable and crashing.
-    messages = [
-        SystemMessage(content=system_content),
-        HumanMessage(content=user_content)
-    ]
-    
-    # Direct chain: Model -> Output Parser (No PromptTemplate)
-    chain = llm | StrOutputParser()
+
+# 3. Construct the Chains (compiled once per routed model, reused for every call)
+def _json_chain_factory(call_type: str, system_prompt: str):
+    def build(model):
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("user", ANALYSIS_USER_PROMPT)
+        ])
+        llm = model.bind(
+            temperature=0.2,
+            max_output_tokens=prompt_budget.OUTPUT_TOKEN_CAPS[call_type],
+        )
+        return prompt | llm
+    return build
+
+_build_analysis_chain = _json_chain_factory("career_analysis", ANALYSIS_SYSTEM_PROMPT)
+
+def _build_resume_chain(model):
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", RESUME_SYSTEM_PROMPT),
+        ("user", RESUME_USER_PROMPT)
+    ])
+    llm = model.bind(
+        temperature=0.2,
+        max_output_tokens=prompt_budget.OUTPUT_TOKEN_CAPS["optimized_resume"],
+    )
+    return prompt | llm
+
+_str_parser = StrOutputParser()
+
+
+class AnalysisFailed(Exception):
+    """The model call failed or its output could not be turned into a valid analysis."""
+
+
+@dataclass(frozen=True)
+class AnalysisPart:
+    call_type: str # LLM route, token cap and telemetry label
+    system_prompt: str
+    schema: type[BaseModel]
+
+    @property
+    def build_chain(self):
+        return _json_chain_factory(self.call_type, self.system_prompt)
+
+SINGLE_CALL = [AnalysisPart("career_analysis", ANALYSIS_SYSTEM_PROMPT, CareerAnalysis)]
+FAN_OUT = [
+    AnalysisPart("career_assessment", ASSESSMENT_SYSTEM_PROMPT, CareerAssessment),
+    AnalysisPart("career_roadmap", ROADMAP_SYSTEM_PROMPT, CareerRoadmap),
+]
+
+# Caps analysis calls in flight across all uploads, so fanning out does not double the
+# load on the provider during a burst
+_analysis_slots = asyncio.Semaphore(settings.ANALYSIS_MAX_CONCURRENT_CALLS)
+
+def _analysis_parts() -> list[AnalysisPart]:
+    return FAN_OUT if settings.ANALYSIS_FANOUT_ENABLED else SINGLE_CALL
+
+def _route_signature(parts: list[AnalysisPart]) -> str:
+    return "+".join(router.route_signature(part.call_type) for part in parts)
+
+
+def _analysis_request(resume_text: str, target_role: str, experience_level: str) -> tuple[str, dict]:
+    # 0a. Strip PDF noise and trim to the input-token budget
+    resume_text = prompt_budget.prepare_resume_text(resume_text)
+
+    cache_key = analysis_cache.make_cache_key(
+        resume_text, target_role, experience_level, ANALYSIS_PROMPT_VERSION,
+        _route_signature(_analysis_parts()),
+    )
+    variables = {
+        "target_role": target_role,
+        "experience_level": experience_level,
+        "resume_text": resume_text,
+    }
+    return cache_key, variables
+
+def _validated(part: AnalysisPart, text: str) -> tuple[dict, bool]:
+    """
+    Returns (result, repaired). The part's schema rejects degenerate results (no roadmap
+    phases, phases without action items), including ones a repair of truncated output produced.
+    """
+    try:
+        result, repaired = analysis_parser.parse_analysis(text, part.schema)
+    except analysis_parser.AnalysisParseError as e:
+        llm_telemetry.record_parse_failure(part.call_type, e)
+        raise AnalysisFailed(str(e)) from e
+    if repaired:
+        llm_telemetry.record_parse_repair(part.call_type)
+    return result.model_dump(mode="json"), repaired
+
+def _merge(results: list[tuple[dict, bool]]) -> tuple[dict, bool]:
+    merged = {}
+    for result, _ in results:
+        merged.update(result)
+    repaired = any(repaired for _, repaired in results)
+    return CareerAnalysis.model_validate(merged).model_dump(mode="json"), repaired
+
+async def _cache_analysis(cache_key: str, result: dict, repaired: bool):
+    # Only successful analyses are cached; failures should be retried next time.
+    # Repaired ones are served once but not cached: the next upload gets a fresh, complete answer.
+    if repaired:
+        return
+    await analysis_cache.store_analysis(
+        cache_key, result, _route_signature(_analysis_parts()), ANALYSIS_PROMPT_VERSION
+    )
+
+
+async def _generate_part(part: AnalysisPart, variables: dict) -> tuple[dict, bool]:
+    async with _analysis_slots:
+        try:
+            message = await router.ainvoke(part.call_type, part.build_chain, variables)
+        except Exception as e:
+            logger.warning("%s failed: %s", part.call_type, e)
+            raise AnalysisFailed(str(e)) from e
+    prompt_budget.log_token_usage(
+        part.call_type,
+        prompt_budget.estimate_tokens(part.system_prompt + ANALYSIS_USER_PROMPT + variables["resume_text"]),
+        message,
+    )
+    # Validate against the schema, repairing fenced / truncated JSON locally
+    return _validated(part, message.content)
+
+async def run_analysis(parts: list[AnalysisPart], variables: dict) -> tuple[dict, bool]:
+    """
+    Runs the parts concurrently (no cache) and merges them into one CareerAnalysis dict.
+    Returns (analysis, repaired), repaired if any part's output had to be repaired locally.
+    """
+    return _merge(await asyncio.gather(*(_generate_part(part, variables) for part in parts)))
+
+async def generate_career_analysis(resume_text: str, target_role: str, experience_level: str) -> dict:
+    """
+    Returns the validated analysis (see app.schemas.analysis.CareerAnalysis).
+    Raises AnalysisFailed instead of returning a placeholder, so callers never save one.
+    """
+    cache_key, variables = _analysis_request(resume_text, target_role, experience_level)
+
+    # 0b. Serve repeat uploads from the analysis cache (no Vertex call)
+    cached = await analysis_cache.get_cached_analysis(cache_key)
+    if cached is not None:
+        llm_telemetry.record_cache_hit("career_analysis", "analysis_cache")
+        return cached
+
+    # 4. Execute (one call, or the fan-out parts concurrently)
+    result, repaired = await run_analysis(_analysis_parts(), variables)
+    await _cache_analysis(cache_key, result, repaired)
+    return result
+
+
+def _cached_sections(analysis: dict) -> list[tuple[str, Any]]:
+    sections = [(name, analysis[name]) for name in ("match_score", "executive_summary", "skill_breakdown", "missing_skills") if name in analysis]
+    return sections + [("roadmap_phase", phase) for phase in analysis.get("roadmap", [])]
+
+_PART_DONE = object()
+
+async def _stream_part(part: AnalysisPart, variables: dict, sections: asyncio.Queue) -> tuple[dict, bool]:
+    parser = analysis_parser.IncrementalAnalysisParser()
+    try:
+        async with _analysis_slots:
+            try:
+                async for chunk in router.astream(part.call_type, part.build_chain, variables):
+                    for section in parser.feed(chunk.content):
+                        sections.put_nowait(section)
+            except Exception as e:
+                logger.warning("%s stream failed: %s", part.call_type, e)
+                raise AnalysisFailed(str(e)) from e
+        return _validated(part, parser.buffer)
+    finally:
+        sections.put_nowait(_PART_DONE)
+
+async def stream_career_analysis(resume_text: str, target_role: str, experience_level: str) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming variant of generate_career_analysis. Yields (section, value) as each part of the
+    JSON completes and validates: match_score, executive_summary, skill_breakdown,
+    missing_skills and one roadmap_phase per phase (interleaved when fanned out); finally
+    ("analysis", full validated dict). Raises AnalysisFailed like generate_career_analysis.
+    """
+    cache_key, variables = _analysis_request(resume_text, target_role, experience_level)
+
+    cached = await analysis_cache.get_cached_analysis(cache_key)
+    if cached is not None:
+        llm_telemetry.record_cache_hit("career_analysis", "analysis_cache")
+        for section in _cached_sections(cached):
+            yield section
+        yield "analysis", cached
+        return
+
+    parts = _analysis_parts()
+    sections = asyncio.Queue()
+    tasks = [asyncio.create_task(_stream_part(part, variables, sections)) for part in parts]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            section = await sections.get()
+            if section is _PART_DONE:
+                remaining -= 1
+                # A failed part fails the whole analysis; don't wait for the others
+                for task in tasks:
+                    if task.done() and task.exception():
+                        raise task.exception()
+                continue
+            yield section
+        result, repaired = _merge([task.result() for task in tasks])
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    await _cache_analysis(cache_key, result, repaired)
+    yield "analysis", result
+
+
+async def generate_optimized_resume(original_text: str, target_role: str, completed_tasks: list[str]) -> str:
+    """
+    Rewrites the resume to include completed roadmap tasks and optimizes for ATS.
+    """
+
+    original_text = prompt_budget.prepare_resume_text(original_text)
+    tasks_str = "\n- ".join(completed_tasks) if completed_tasks else "No specific roadmap tasks completed yet."
+
+    variables = {
+        "tasks_str": tasks_str,
+        "target_role": target_role,
+        "original_text": original_text,
+    }
 
     try:
-        result = await chain.ainvoke(messages)
+        message = await router.ainvoke("optimized_resume", _build_resume_chain, variables)
+        prompt_budget.log_token_usage(
+            "optimized_resume",
+            prompt_budget.estimate_tokens(RESUME_SYSTEM_PROMPT + RESUME_USER_PROMPT + tasks_str + original_text),
+            message,
+        )
+        result = await _str_parser.ainvoke(message)
         # Cleanup markdown fences if Gemini adds them
         clean_result = result.replace("```latex", "").replace("```", "").strip()
         return clean_result
     except Exception as e:
-        return f"% Error generating resume: {str(e)}"
\ No newline at end of file
+        logger.warning("resume optimization failed: %s", e)
+        return f"{RESUME_ERROR_PREFIX}: {str(e)}"
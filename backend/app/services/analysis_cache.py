@@ -0,0 +1,160 @@
+import copy
+import hashlib
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from prometheus_client import Counter
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.cache import TTLLRUCache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.analysis_cache import AnalysisCacheEntry
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = Counter(
+    "skillsync_analysis_cache_lookups_total",
+    "Career analysis cache lookups by outcome (memory_hit, db_hit, miss).",
+    ["result"],
+)
+
+_memory_cache = TTLLRUCache(
+    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ANALYSIS_CACHE_TTL_SECONDS,
+)
+
+# monotonic time of this process's last eviction pass (None until the first write)
+_last_eviction: float | None = None
+
+
+def normalize_resume_text(text: str) -> str:
+    """
+    Collapses whitespace so that re-extracting the same PDF always produces the same key.
+    """
+    lines = (re.sub(r"\s+", " ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def make_cache_key(
+    resume_text: str,
+    target_role: str,
+    experience_level: str,
+    prompt_version: str,
+    model_name: str,
+) -> str:
+    parts = [
+        normalize_resume_text(resume_text),
+        target_role.strip().lower(),
+        experience_level.strip().lower(),
+        prompt_version,
+        model_name,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+async def get_cached_analysis(cache_key: str) -> dict | None:
+    if not settings.ANALYSIS_CACHE_ENABLED:
+        return None
+
+    # 1. In-process LRU (no I/O at all)
+    cached = _memory_cache.get(cache_key)
+    if cached is not None:
+        CACHE_LOOKUPS.labels(result="memory_hit").inc()
+        return copy.deepcopy(cached)
+
+    # 2. Shared Postgres tier (survives restarts, shared between workers).
+    #    The hit marks the row as recently used in the same round trip.
+    now = datetime.now(timezone.utc)
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(AnalysisCacheEntry)
+                .filter(
+                    AnalysisCacheEntry.cache_key == cache_key,
+                    AnalysisCacheEntry.expires_at > now,
+                )
+                .values(last_used_at=func.now())
+                .returning(AnalysisCacheEntry.analysis_json, AnalysisCacheEntry.expires_at)
+            )
+            row = result.one_or_none()
+            await db.commit()
+    except Exception as e:
+        # The cache must never break an upload; fall through to the LLM.
+        logger.warning("Analysis cache lookup failed: %s", e)
+        row = None
+
+    if row is None:
+        CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    cached, expires_at = row
+    CACHE_LOOKUPS.labels(result="db_hit").inc()
+    # The memory copy lives only as long as the row has left, not a fresh full TTL
+    _memory_cache.set(cache_key, cached, ttl_seconds=(expires_at - now).total_seconds())
+    return copy.deepcopy(cached)
+
+
+def _eviction_due() -> bool:
+    global _last_eviction
+    now = time.monotonic()
+    if _last_eviction is not None and now - _last_eviction < settings.ANALYSIS_CACHE_EVICTION_INTERVAL_SECONDS:
+        return False
+    _last_eviction = now
+    return True
+
+
+async def _evict(db, now: datetime) -> None:
+    # Drop expired rows, then the least recently used rows beyond the size cap (if any)
+    await db.execute(delete(AnalysisCacheEntry).filter(AnalysisCacheEntry.expires_at <= now))
+    total = (await db.execute(select(func.count()).select_from(AnalysisCacheEntry))).scalar_one()
+    if total <= settings.ANALYSIS_CACHE_DB_MAX_ENTRIES:
+        return
+    overflow = (
+        select(AnalysisCacheEntry.cache_key)
+        .order_by(AnalysisCacheEntry.last_used_at.desc())
+        .offset(settings.ANALYSIS_CACHE_DB_MAX_ENTRIES)
+    )
+    await db.execute(delete(AnalysisCacheEntry).filter(AnalysisCacheEntry.cache_key.in_(overflow)))
+
+
+async def store_analysis(cache_key: str, analysis: dict, model_name: str, prompt_version: str) -> None:
+    if not settings.ANALYSIS_CACHE_ENABLED:
+        return
+
+    _memory_cache.set(cache_key, copy.deepcopy(analysis))
+
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=settings.ANALYSIS_CACHE_TTL_SECONDS)
+    stmt = insert(AnalysisCacheEntry).values(
+        cache_key=cache_key,
+        model_name=model_name,
+        prompt_version=prompt_version,
+        analysis_json=analysis,
+        expires_at=expires_at,
+        last_used_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AnalysisCacheEntry.cache_key],
+        set_={
+            "analysis_json": stmt.excluded.analysis_json,
+            "expires_at": stmt.excluded.expires_at,
+            "last_used_at": stmt.excluded.last_used_at,
+        },
+    )
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+            # Eviction runs at most once per interval per process, not on every write
+            if _eviction_due():
+                await _evict(db, now)
+                await db.commit()
+    except Exception as e:
+        logger.warning("Analysis cache write failed: %s", e)
+
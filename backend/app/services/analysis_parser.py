@@ -0,0 +1,239 @@
+import json
+import re
+from typing import Any, Iterator
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.schemas.analysis import CareerAnalysis, RoadmapPhase
+
+
+class AnalysisParseError(ValueError):
+    pass
+
+
+# Top-level keys are emitted as sections once complete; roadmap phases one by one
+_SECTION_ADAPTERS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in CareerAnalysis.model_fields.items()
+    if name != "roadmap"
+}
+_PHASE_ADAPTER = TypeAdapter(RoadmapPhase)
+
+_MAX_REPAIR_ATTEMPTS = 50
+
+_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+
+
+def _scan(text: str) -> tuple[list[str], bool, list[int]]:
+    """
+    Returns (open brackets, inside a string, cut points). A cut point is an offset where the
+    text can be truncated right after a complete member or element and still be valid JSON
+    once brackets are closed: before a comma, after a closing bracket, or right after an
+    opening bracket.
+    """
+    stack, cuts = [], []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cuts.append(i + 1)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cuts.append(i + 1)
+        elif ch == ",":
+            cuts.append(i)
+    return stack, in_string, cuts
+
+
+def _strip_trailing_commas(text: str) -> str:
+    # Drops commas right before a closing bracket, outside string literals only: ",]" inside
+    # a summary is content, not a syntax error
+    out = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == ",":
+            j = i + 1
+            while j < len(text) and text[j].isspace():
+                j += 1
+            if j < len(text) and text[j] in "}]":
+                continue
+        out.append(ch)
+    return "".join(out)
+
+
+def _close(text: str) -> str | None:
+    stack, in_string, _ = _scan(text)
+    if in_string:
+        # Never invent the end of a string: "Pha" is not a phase name
+        return None
+    return text.rstrip() + "".join(reversed(stack))
+
+
+def _repair_candidates(text: str) -> Iterator[Any]:
+    """
+    Best-effort local fixes for model output, most complete first: strips markdown fences and
+    prose around the object and trailing commas; for truncated output, cuts back to the last
+    complete member and closes the open brackets (the unfinished value is dropped, never
+    completed).
+    """
+    text = _FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start == -1:
+        return
+    text = _strip_trailing_commas(text[start:])
+
+    try:
+        yield json.JSONDecoder().raw_decode(text)[0]
+        return
+    except json.JSONDecodeError:
+        pass
+
+    # Truncated: back off through earlier cut points until something validates
+    _, _, cuts = _scan(text)
+    for end in cuts[::-1][:_MAX_REPAIR_ATTEMPTS]:
+        closed = _close(text[:end])
+        if closed is None:
+            continue
+        try:
+            yield json.loads(closed)
+        except json.JSONDecodeError:
+            continue
+
+
+def parse_analysis(text: str, schema: type[BaseModel] = CareerAnalysis) -> tuple[BaseModel, bool]:
+    """
+    Validates a complete model response against `schema`, repairing it locally if needed
+    (no re-call). Returns (analysis, repaired); raises AnalysisParseError when nothing valid
+    can be recovered.
+    """
+    try:
+        return schema.model_validate_json(text), False
+    except ValidationError as e:
+        error = e
+
+    for data in _repair_candidates(text):
+        try:
+            return schema.model_validate(data), True
+        except ValidationError:
+            # e.g. the truncation left an object without required fields: back off further
+            continue
+    raise AnalysisParseError(f"analysis could not be parsed or repaired: {error.error_count()} error(s)")
+
+
+class IncrementalAnalysisParser:
+    """
+    Fed the streamed model output chunk by chunk, returns each section as soon as its JSON is
+    complete and valid: ("match_score", 72), ("executive_summary", "..."), ("skill_breakdown", [...]),
+    ("missing_skills", [...]) and ("roadmap_phase", {...}) per roadmap entry, in output order.
+    Every character is scanned once; the complete buffer is then validated with parse_analysis().
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None # offset of the current top-level member
+        self._in_roadmap = False
+        self._phase_start = None # offset of the current roadmap phase object
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self.buffer += chunk
+        sections = []
+        text = self.buffer
+        while self._pos < len(text):
+            i, ch = self._pos, text[self._pos]
+            self._pos += 1
+
+            if not self._started:
+                # Skip fences / prose before the object
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = i + 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and ch == "[" and self._member_key(text[self._member_start:i]) == "roadmap":
+                    self._in_roadmap = True
+                elif self._depth == 3 and ch == "{" and self._in_roadmap:
+                    self._phase_start = i
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and ch == "}" and self._phase_start is not None:
+                    section = self._phase(text[self._phase_start:i + 1])
+                    if section:
+                        sections.append(section)
+                    self._phase_start = None
+                elif self._depth == 0:
+                    sections.extend(self._member(text[self._member_start:i]))
+                    self._member_start = None
+            elif ch == "," and self._depth == 1:
+                sections.extend(self._member(text[self._member_start:i]))
+                self._member_start = i + 1
+        return sections
+
+    @staticmethod
+    def _member_key(member: str) -> str | None:
+        match = re.match(r'\s*"([^"]*)"\s*:', member)
+        return match.group(1) if match else None
+
+    def _member(self, member: str) -> list[tuple[str, Any]]:
+        if self._in_roadmap:
+            # Phases were already emitted one by one
+            self._in_roadmap = False
+            return []
+        try:
+            data = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            return []
+        sections = []
+        for name, value in data.items():
+            adapter = _SECTION_ADAPTERS.get(name)
+            if adapter is None:
+                continue
+            try:
+                sections.append((name, adapter.dump_python(adapter.validate_python(value), mode="json")))
+            except ValidationError:
+                continue
+        return sections
+
+    def _phase(self, text: str) -> tuple[str, Any] | None:
+        try:
+            phase = _PHASE_ADAPTER.validate_json(text)
+        except ValidationError:
+            return None
+        return "roadmap_phase", phase.model_dump()
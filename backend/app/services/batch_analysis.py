@@ -0,0 +1,186 @@
+import asyncio
+import io
+import logging
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+from prometheus_client import Counter
+
+from app.core.config import settings
+from app.services import ai_service, resume_service, skill_matcher
+
+logger = logging.getLogger(__name__)
+
+BATCH_RESUMES = Counter(
+    "skillsync_batch_resumes_total",
+    "Resumes processed by bulk analysis, by outcome (succeeded, failed).",
+    ["result"],
+)
+
+
+class BatchTooLarge(ValueError):
+    pass
+
+
+# Process-wide, shared by all running batches, so batches never take every parse/analysis slot
+_batch_slots = asyncio.Semaphore(settings.BATCH_ANALYSIS_CONCURRENCY)
+
+
+@dataclass
+class BatchItem:
+    index: int
+    filename: str
+    content: bytes | None # None when the file was rejected before parsing
+    error: str | None = None
+
+
+def is_archive(filename: str | None, content_type: str | None) -> bool:
+    return content_type in ("application/zip", "application/x-zip-compressed") or (filename or "").lower().endswith(".zip")
+
+
+def _unpack_archive(data: bytes, filename: str) -> list[tuple[str, bytes | None, str | None]]:
+    # Runs in a thread (decompression is CPU-bound). Sizes are checked from the zip directory
+    # before anything is decompressed, so a zip bomb is refused up front.
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        return [(filename, None, "Not a valid zip archive")]
+
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith("__MACOSX/") and not info.filename.rsplit("/", 1)[-1].startswith(".")
+    ]
+    if len(members) > settings.BATCH_MAX_FILES:
+        raise BatchTooLarge(f"{filename}: a batch can contain at most {settings.BATCH_MAX_FILES} files ({len(members)} in the archive)")
+    if sum(info.file_size for info in members if info.filename.lower().endswith(".pdf")) > settings.BATCH_MAX_TOTAL_BYTES:
+        raise BatchTooLarge(f"{filename}: archive unpacks to more than {settings.BATCH_MAX_TOTAL_BYTES} bytes of PDFs")
+
+    entries = []
+    for info in members:
+        if not info.filename.lower().endswith(".pdf"):
+            entries.append((info.filename, None, "Only PDF files are supported"))
+            continue
+        try:
+            entries.append((info.filename, archive.read(info), None))
+        except (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError) as e:
+            # Corrupt, encrypted or unsupported member: only this file fails
+            logger.info("Could not extract %s from %s: %s", info.filename, filename, e)
+            entries.append((info.filename, None, "Could not extract from the archive"))
+    return entries
+
+
+async def read_uploads(files: list[UploadFile]) -> list[tuple[str, str | None, bytes]]:
+    """
+    Reads the uploaded files in chunks, raising BatchTooLarge as soon as they add up to more
+    than BATCH_MAX_TOTAL_BYTES (an oversized part is never read whole into memory).
+    """
+    budget = settings.BATCH_MAX_TOTAL_BYTES
+    uploads = []
+    for file in files:
+        filename = file.filename or "resume.pdf"
+        if file.size is not None and file.size > budget:
+            raise BatchTooLarge(f"A batch can contain at most {settings.BATCH_MAX_TOTAL_BYTES} bytes ({filename} does not fit)")
+        chunks = []
+        while chunk := await file.read(settings.BATCH_READ_CHUNK_BYTES):
+            budget -= len(chunk)
+            if budget < 0:
+                raise BatchTooLarge(f"A batch can contain at most {settings.BATCH_MAX_TOTAL_BYTES} bytes ({filename} does not fit)")
+            chunks.append(chunk)
+        uploads.append((filename, file.content_type, b"".join(chunks)))
+    return uploads
+
+
+async def collect_items(files: list[tuple[str, str | None, bytes]]) -> list[BatchItem]:
+    """
+    Turns uploaded (filename, content type, bytes) into batch items, unpacking zip archives.
+    Unsupported files become items with an error instead of failing the batch.
+    Raises BatchTooLarge when the batch exceeds BATCH_MAX_FILES / BATCH_MAX_TOTAL_BYTES.
+    """
+    entries = []
+    for filename, content_type, data in files:
+        if is_archive(filename, content_type):
+            entries.extend(await asyncio.to_thread(_unpack_archive, data, filename))
+        elif content_type == "application/pdf" or filename.lower().endswith(".pdf"):
+            entries.append((filename, data, None))
+        else:
+            entries.append((filename, None, "Only PDF files are supported"))
+
+    if len(entries) > settings.BATCH_MAX_FILES:
+        raise BatchTooLarge(f"A batch can contain at most {settings.BATCH_MAX_FILES} files ({len(entries)} given)")
+    if sum(len(content) for _, content, _ in entries if content) > settings.BATCH_MAX_TOTAL_BYTES:
+        raise BatchTooLarge(f"A batch can contain at most {settings.BATCH_MAX_TOTAL_BYTES} bytes of PDFs")
+
+    return [BatchItem(index, filename, content, error) for index, (filename, content, error) in enumerate(entries)]
+
+
+async def _analyze_item(item: BatchItem, target_role: str, experience_level: str) -> dict:
+    result = {"type": "result", "index": item.index, "filename": item.filename}
+    if item.error:
+        return {**result, "status": "failed", "error": item.error}
+
+    started = time.perf_counter()
+    try:
+        # Parsing goes through the shared process pool and the analysis through the analysis
+        # cache and its concurrency cap, like single uploads
+        text_content = await resume_service.parse_pdf_bytes(item.content)
+        if len(text_content) < 50:
+            raise ValueError("Resume content is too short or unreadable.")
+        result["preliminary"] = skill_matcher.preliminary_score(text_content, target_role)
+        analysis = await ai_service.generate_career_analysis(
+            resume_text=text_content,
+            target_role=target_role,
+            experience_level=experience_level,
+        )
+    except (ai_service.AnalysisFailed, ValueError) as e: # ValueError includes PDFParseError
+        return {**result, "status": "failed", "error": str(e)}
+    except Exception as e:
+        logger.exception("batch item %s (%s) crashed", item.index, item.filename)
+        return {**result, "status": "failed", "error": f"Unexpected error: {type(e).__name__}"}
+    finally:
+        item.content = None # Release the PDF bytes as soon as the item is done
+
+    return {
+        **result,
+        "status": "succeeded",
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "analysis": analysis,
+    }
+
+
+async def analyze_batch(items: list[BatchItem], target_role: str, experience_level: str) -> AsyncIterator[dict]:
+    """
+    Analyzes every item against one role (local skill-match `preliminary` score + LLM analysis)
+    and yields each result as soon as it finishes (completion order, tagged with the item index).
+    At most BATCH_ANALYSIS_CONCURRENCY items run at once across all batches.
+    A failed item yields a `failed` result; the batch always runs to the end and finishes
+    with a `summary`. Closing the generator early cancels the remaining work.
+    """
+    started = time.perf_counter()
+
+    async def run(item: BatchItem) -> dict:
+        async with _batch_slots:
+            return await _analyze_item(item, target_role, experience_level)
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            BATCH_RESUMES.labels(result=result["status"]).inc()
+            succeeded += result["status"] == "succeeded"
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield {
+        "type": "summary",
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+    }
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from prometheus_client import Counter
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.instrumentation import spawn_background
+from app.db.session import AsyncSessionLocal
+from app.models.chat_cache import ChatCacheEntry
+from app.services.embeddings import get_embedder
+
+logger = logging.getLogger(__name__)
+
+CHAT_CACHE_LOOKUPS = Counter(
+    "skillsync_chat_cache_lookups_total",
+    "Semantic chat cache lookups by outcome (hit, miss, error).",
+    ["result"],
+)
+
+# Background writes, kept referenced until they finish
+_pending_writes: set[asyncio.Task] = set()
+# monotonic time of this process's last expired-row sweep (None until the first write)
+_last_sweep: float | None = None
+
+
+@dataclass
+class CacheProbe:
+    scope_key: str
+    embedding: list[float] | None
+    response: str | None = None
+    similarity: float | None = None
+
+
+def normalize_message(message: str) -> str:
+    # Case, whitespace and trailing punctuation never change the question
+    return re.sub(r"\s+", " ", message).strip().rstrip("?!. ").lower()
+
+
+def message_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _normalized_set(values) -> str:
+    return "|".join(sorted({str(value).strip().lower() for value in values or []}))
+
+
+def make_scope_key(profile_context: dict, prompt_version: str, embedder_name: str) -> str:
+    """
+    Cached answers are shared only between chats whose prompt context is the same: target
+    role, experience level, missing skills and phase 1 topics (sets compared order/case-
+    insensitively), for the same prompt and embedding model.
+    """
+    analysis = profile_context.get("ai_analysis_json") or {}
+    roadmap = analysis.get("roadmap") or [{}]
+    parts = [
+        str(profile_context.get("target_role") or "").strip().lower(),
+        str(profile_context.get("experience_level") or "").strip().lower(),
+        _normalized_set(analysis.get("missing_skills")),
+        _normalized_set(roadmap[0].get("topics")),
+        prompt_version,
+        embedder_name,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def similarity_threshold(embedder_name: str) -> float | None:
+    """Configured threshold for the embedder's provider; None means exact matches only."""
+    provider = embedder_name.partition(":")[0]
+    return settings.CHAT_CACHE_SIMILARITY_THRESHOLDS.get(provider)
+
+
+async def lookup(profile_context: dict, message: str, prompt_version: str) -> CacheProbe:
+    """
+    Embeds the message and returns the closest cached answer in scope if its cosine
+    similarity reaches the embedder's threshold (CHAT_CACHE_SIMILARITY_THRESHOLDS), or, for
+    embedders without one, the answer to the same normalized message. The probe is passed
+    back to store() on a miss, so the message is embedded only once.
+    """
+    embedder = get_embedder()
+    threshold = similarity_threshold(embedder.name)
+    probe = CacheProbe(scope_key=make_scope_key(profile_context, prompt_version, embedder.name), embedding=None)
+    if not settings.CHAT_CACHE_ENABLED:
+        return probe
+
+    normalized = normalize_message(message)
+    try:
+        [probe.embedding] = await embedder.aembed([normalized])
+        distance = ChatCacheEntry.embedding.cosine_distance(probe.embedding)
+        query = (
+            select(ChatCacheEntry.response, distance.label("distance"))
+            .filter(
+                ChatCacheEntry.scope_key == probe.scope_key,
+                ChatCacheEntry.expires_at > datetime.now(timezone.utc),
+            )
+            .limit(1)
+        )
+        async with AsyncSessionLocal() as db:
+            if threshold is None:
+                # (scope, message) is unique, so at most one row matches
+                result = await db.execute(query.filter(ChatCacheEntry.message_hash == message_hash(normalized)))
+            else:
+                # HNSW filters after the index scan; widen the candidate list so scoped lookups
+                # still find their neighbours when many scopes share the index
+                await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(settings.CHAT_CACHE_EF_SEARCH)}"))
+                result = await db.execute(query.order_by(distance, ChatCacheEntry.created_at.desc()))
+            row = result.first()
+    except Exception as e:
+        # The cache must never break chat; fall through to the LLM.
+        logger.warning("Chat cache lookup failed: %s", e)
+        CHAT_CACHE_LOOKUPS.labels(result="error").inc()
+        return probe
+
+    if row is not None:
+        probe.similarity = 1 - row.distance
+        if threshold is None or probe.similarity >= threshold:
+            probe.response = row.response
+
+    CHAT_CACHE_LOOKUPS.labels(result="hit" if probe.response is not None else "miss").inc()
+    return probe
+
+
+def _sweep_due() -> bool:
+    global _last_sweep
+    now = time.monotonic()
+    if _last_sweep is not None and now - _last_sweep < settings.CHAT_CACHE_SWEEP_INTERVAL_SECONDS:
+        return False
+    _last_sweep = now
+    return True
+
+
+async def _write(probe: CacheProbe, message: str, response: str) -> None:
+    now = datetime.now(timezone.utc)
+    normalized = normalize_message(message)
+    stmt = insert(ChatCacheEntry).values(
+        id=str(uuid.uuid4()),
+        scope_key=probe.scope_key,
+        message=normalized,
+        message_hash=message_hash(normalized),
+        embedding=probe.embedding,
+        response=response,
+        created_at=now,
+        expires_at=now + timedelta(seconds=settings.CHAT_CACHE_TTL_SECONDS),
+    )
+    # Concurrent misses for the same question: the last answer wins, no duplicate rows
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ChatCacheEntry.scope_key, ChatCacheEntry.message_hash],
+        set_={
+            "embedding": stmt.excluded.embedding,
+            "response": stmt.excluded.response,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    )
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+            # Expired rows are swept at most once per interval per process, not on every write
+            if _sweep_due():
+                await db.execute(delete(ChatCacheEntry).filter(ChatCacheEntry.expires_at <= now))
+                await db.commit()
+    except Exception as e:
+        logger.warning("Chat cache write failed: %s", e)
+
+
+def store(probe: CacheProbe, message: str, response: str) -> None:
+    """
+    Saves a freshly generated answer in the background (the reply is not held up by the write).
+    """
+    if not settings.CHAT_CACHE_ENABLED or probe.embedding is None or not response.strip():
+        return
+    task = spawn_background(_write(probe, message, response))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+from prometheus_client import Counter
+from sqlalchemy import inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.instrumentation import spawn_background
+from app.db.session import AsyncSessionLocal
+from app.models.chat import ChatMessage, ChatSession
+from app.services import prompt_budget
+from app.services.llm_router import router
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_BEHIND = Counter(
+    "skillsync_chat_summary_behind_total",
+    "Chat prompts that dropped unsummarized messages because the rolling summary fell behind.",
+)
+
+# Session ids with a summary refresh in flight, and the tasks doing it (kept referenced)
+_refreshing: set[str] = set()
+_pending_refreshes: set[asyncio.Task] = set()
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a career-mentoring conversation.
+    Merge the new messages into the existing summary. Keep facts about the user (goals, constraints,
+    progress, preferences) and any advice or resources already given. Drop small talk.
+    Write at most 8 short bullet points. Output only the summary.
+    """
+
+SUMMARY_USER_PROMPT = """
+    EXISTING SUMMARY:
+    {summary}
+
+    NEW MESSAGES:
+    {transcript}
+    """
+
+
+@dataclass
+class Conversation:
+    """What the prompt gets from a session: the rolling summary plus the last turns verbatim."""
+    session_id: str
+    summary: str | None = None
+    messages: list[BaseMessage] = field(default_factory=list)
+    # Set for a session started by this message: it is only inserted together with its first turn
+    new_session: ChatSession | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.summary and not self.messages
+
+
+def _window_size() -> int:
+    return settings.CHAT_HISTORY_TURNS * 2 # a turn is one user + one assistant message
+
+
+def _clip(text: str) -> str:
+    # Keeps a single pasted wall of text from blowing up every following prompt
+    max_chars = settings.CHAT_HISTORY_MESSAGE_MAX_TOKENS * prompt_budget.CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars] + " …"
+
+
+async def get_session(db: AsyncSession, user_id: str, session_id: str) -> ChatSession | None:
+    # None if it does not exist or belongs to someone else
+    session = await db.get(ChatSession, session_id)
+    return session if session and session.user_id == user_id else None
+
+
+async def get_or_create_session(
+    db: AsyncSession, user_id: str, session_id: str | None, first_message: str
+) -> ChatSession | None:
+    """
+    Returns the user's session (None if not found), or starts a new one when no session_id is given.
+    A new session is not saved yet (see append_turn), so a failed first reply leaves nothing behind.
+    """
+    if session_id:
+        return await get_session(db, user_id, session_id)
+
+    return ChatSession(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        title=" ".join(first_message.split())[:80],
+        message_count=0,
+        summary_seq=0,
+    )
+
+
+async def load_conversation(db: AsyncSession, session: ChatSession) -> Conversation:
+    if session.message_count == 0:
+        return Conversation(session_id=session.id, new_session=session if inspect(session).transient else None)
+
+    # Everything the summary does not cover yet, and at least the last turns: messages that
+    # left the window while a summary refresh is pending (or failing) are still sent verbatim,
+    # up to a hard cap so a summary that keeps failing cannot grow the prompt without bound
+    since = min(session.summary_seq, session.message_count - _window_size())
+    floor = session.message_count - settings.CHAT_HISTORY_MAX_MESSAGES
+    if since < floor:
+        SUMMARY_BEHIND.inc()
+        logger.warning(
+            "Chat session %s summary is %d messages behind; sending only the last %d",
+            session.id, floor - since, settings.CHAT_HISTORY_MAX_MESSAGES,
+        )
+        since = floor
+    result = await db.execute(
+        select(ChatMessage.role, ChatMessage.content)
+        .filter(ChatMessage.session_id == session.id, ChatMessage.seq > since)
+        .order_by(ChatMessage.seq)
+    )
+    messages = [
+        HumanMessage(content=_clip(content)) if role == "user" else AIMessage(content=_clip(content))
+        for role, content in result.all()
+    ]
+    return Conversation(session_id=session.id, summary=session.summary, messages=messages)
+
+
+async def append_turn(db: AsyncSession, conversation: Conversation, user_message: str, assistant_message: str) -> None:
+    session_id = conversation.session_id
+    if conversation.new_session is not None:
+        db.add(conversation.new_session)
+        await db.flush()
+        conversation.new_session = None
+
+    # Reserve two sequence numbers atomically, so concurrent turns never collide
+    result = await db.execute(
+        update(ChatSession)
+        .filter(ChatSession.id == session_id)
+        .values(message_count=ChatSession.message_count + 2)
+        .returning(ChatSession.message_count, ChatSession.summary_seq)
+    )
+    message_count, summary_seq = result.one()
+    db.add_all([
+        ChatMessage(session_id=session_id, seq=message_count - 1, role="user", content=user_message),
+        ChatMessage(session_id=session_id, seq=message_count, role="assistant", content=assistant_message),
+    ])
+    await db.commit()
+
+    _maybe_refresh_summary(session_id, message_count, summary_seq)
+
+
+def _maybe_refresh_summary(session_id: str, message_count: int, summary_seq: int) -> None:
+    # Messages that have left the verbatim window but are not in the summary yet
+    unsummarized = message_count - _window_size() - summary_seq
+    if unsummarized < settings.CHAT_SUMMARY_MIN_NEW_MESSAGES or session_id in _refreshing:
+        return
+    _refreshing.add(session_id)
+    task = spawn_background(_refresh_summary(session_id))
+    _pending_refreshes.add(task)
+    task.add_done_callback(_pending_refreshes.discard)
+
+
+def _build_summary_chain(model):
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SUMMARY_SYSTEM_PROMPT),
+        ("user", SUMMARY_USER_PROMPT)
+    ])
+    llm = model.bind(
+        temperature=0.2,
+        max_output_tokens=prompt_budget.OUTPUT_TOKEN_CAPS["chat_summary"],
+    )
+    return prompt | llm
+
+
+async def _refresh_summary(session_id: str) -> None:
+    """
+    Folds the messages that dropped out of the verbatim window into the session summary.
+    Runs after the reply has been sent, so a slow summary never delays the chat.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            session = await db.get(ChatSession, session_id)
+            upto = session.message_count - _window_size()
+            if upto <= session.summary_seq:
+                return
+
+            result = await db.execute(
+                select(ChatMessage.role, ChatMessage.content)
+                .filter(
+                    ChatMessage.session_id == session_id,
+                    ChatMessage.seq > session.summary_seq,
+                    ChatMessage.seq <= upto,
+                )
+                .order_by(ChatMessage.seq)
+            )
+            transcript = "\n".join(f"{role.upper()}: {_clip(content)}" for role, content in result.all())
+
+            message = await router.ainvoke("chat_summary", _build_summary_chain, {
+                "summary": session.summary or "(none yet)",
+                "transcript": transcript,
+            })
+
+            # Only move forward from the summary we started from (another worker may have won)
+            await db.execute(
+                update(ChatSession)
+                .filter(ChatSession.id == session_id, ChatSession.summary_seq == session.summary_seq)
+                .values(summary=str(message.content).strip(), summary_seq=upto)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning("chat summary refresh failed for session %s: %s", session_id, e)
+    finally:
+        _refreshing.discard(session_id)
+
+
+async def list_sessions(db: AsyncSession, user_id: str) -> list[ChatSession]:
+    result = await db.execute(
+        select(ChatSession).filter(ChatSession.user_id == user_id).order_by(ChatSession.updated_at.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def list_messages(db: AsyncSession, session_id: str) -> list[ChatMessage]:
+    result = await db.execute(
+        select(ChatMessage).filter(ChatMessage.session_id == session_id).order_by(ChatMessage.seq)
+    )
+    return list(result.scalars().all())
@@ -1,50 +1,137 @@
-from langchain_google_vertexai import ChatVertexAI
-from langchain_core.prompts import ChatPromptTemplate
+import logging
+from typing import AsyncIterator
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
+from app.core.cache import TTLLRUCache
 from app.core.config import settings
+from app.services import chat_cache, llm_telemetry, prompt_budget
+from app.services.chat_history import Conversation
+from app.services.llm_router import router
 
-# Same model as before
-llm = ChatVertexAI(
-    model_name="gemini-2.5-flash",
-    temperature=0.7, # Higher temperature for more natural conversation
-    max_output_tokens=1024,
-    location="us-central1"
-)
+logger = logging.getLogger(__name__)
 
-async def generate_chat_response(user_message: str, profile_context: dict) -> str:
-    """
-    Generates a response where the AI knows the user's resume and roadmap.
-    """
-    
-    # 1. Prepare Context String
-    context_str = f"""
-    USER PROFILE CONTEXT:
-    - Target Role: {profile_context.get('target_role')}
-    - Experience Level: {profile_context.get('experience_level')}
-    - Missing Skills: {", ".join(profile_context.get('ai_analysis_json', {}).get('missing_skills', []))}
-    - Current Roadmap Phase 1: {profile_context.get('ai_analysis_json', {}).get('roadmap', [{}])[0].get('topics', [])}
-    """
+# Bump whenever SYSTEM_PROMPT or the context changes meaning, so cached answers are not reused
+CHAT_PROMPT_VERSION = "v3"
 
-    # 2. System Prompt (The Persona)
-    system_prompt = f"""You are SkillSync, an expert Career Mentor.
+# 2. System Prompt (The Persona)
+# Ordered from most to least stable: fixed instructions, then the per-profile context, then the
+# per-conversation summary. Identical leading tokens across calls let the provider's prefix
+# (context) caching skip re-processing them.
+SYSTEM_PROMPT = """You are SkillSync, an expert Career Mentor.
     You have access to the user's career profile and learning roadmap.
     
-    {context_str}
-    
     Your goal is to answer their questions specifically based on this context. 
     - If they ask about learning resources, recommend specific ones for their missing skills.
     - Be encouraging but realistic.
     - Keep answers concise (under 3 paragraphs).
+    {context_str}
+    {summary_str}
     """
 
-    # 3. Construct Chain
+# Rendered profile context per user, tagged with the profile version it was built from.
+# Uploads and roadmap toggles bump the version, so stale entries are simply never matched.
+_profile_contexts = TTLLRUCache(
+    max_entries=settings.CHAT_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CHAT_CONTEXT_CACHE_TTL_SECONDS,
+)
+
+def _build_chain(model):
+    # 3. Construct Chain (compiled once per routed model, reused for every message)
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        ("system", SYSTEM_PROMPT),
+        MessagesPlaceholder("history", optional=True), # last turns of the session, verbatim
         ("user", "{message}")
     ])
-    
-    chain = prompt | llm | StrOutputParser()
+    llm = model.bind(
+        temperature=0.7, # Higher temperature for more natural conversation
+        max_output_tokens=prompt_budget.OUTPUT_TOKEN_CAPS["chat"],
+    )
+    return prompt | llm | StrOutputParser()
+
+def _build_context(profile_context: dict) -> str:
+    # 1. Prepare Context String
+    return f"""
+    USER PROFILE CONTEXT:
+    - Target Role: {profile_context.get('target_role')}
+    - Experience Level: {profile_context.get('experience_level')}
+    - Missing Skills: {", ".join(profile_context.get('ai_analysis_json', {}).get('missing_skills', []))}
+    - Current Roadmap Phase 1: {profile_context.get('ai_analysis_json', {}).get('roadmap', [{}])[0].get('topics', [])}
+    """
+
+def get_compiled_context(user_id: str, version: int) -> dict | None:
+    cached = _profile_contexts.get(user_id)
+    return cached if cached is not None and cached["version"] == version else None
+
+def compile_context(user_id: str, profile_context: dict) -> dict:
+    """
+    Renders context_str once per profile version; later messages reuse it as is.
+    profile_context must carry the `version` it was loaded at.
+    """
+    compiled = {**profile_context, "context_str": _build_context(profile_context)}
+    _profile_contexts.set(user_id, compiled)
+    return compiled
+
+def _build_variables(user_message: str, profile_context: dict, conversation: Conversation | None) -> dict:
+    summary_str = ""
+    if conversation and conversation.summary:
+        summary_str = f"""
+    EARLIER IN THIS CONVERSATION (summary):
+    {conversation.summary}
+    """
+    return {
+        "context_str": profile_context.get("context_str") or _build_context(profile_context),
+        "summary_str": summary_str,
+        "history": conversation.messages if conversation else [],
+        "message": user_message,
+    }
+
+def _uses_cache(conversation: Conversation | None) -> bool:
+    # Cached answers carry no conversation state, so they only fit a conversation's first message
+    return conversation is None or conversation.is_empty
+
+async def generate_chat_response(user_message: str, profile_context: dict, conversation: Conversation | None = None) -> str:
+    """
+    Generates a response where the AI knows the user's resume and roadmap,
+    plus the session's summary and last turns when a conversation is given.
+    """
+    # 0. Near-duplicate question from someone with the same role and skill gaps?
+    probe = None
+    if _uses_cache(conversation):
+        probe = await chat_cache.lookup(profile_context, user_message, CHAT_PROMPT_VERSION)
+        if probe.response is not None:
+            llm_telemetry.record_cache_hit("chat", "semantic_cache")
+            return probe.response
+
+    variables = _build_variables(user_message, profile_context, conversation)
 
     # 4. Execute
-    response = await chain.ainvoke({"message": user_message})
-    return response
\ No newline at end of file
+    response = await router.ainvoke("chat", _build_chain, variables)
+    if probe:
+        chat_cache.store(probe, user_message, response)
+    return response
+
+async def stream_chat_response(user_message: str, profile_context: dict, conversation: Conversation | None = None) -> AsyncIterator[str]:
+    """
+    Same as generate_chat_response, but yields text chunks as the model produces them.
+    Closing the generator early (client disconnect) stops the underlying LLM stream.
+    """
+    probe = None
+    if _uses_cache(conversation):
+        probe = await chat_cache.lookup(profile_context, user_message, CHAT_PROMPT_VERSION)
+        if probe.response is not None:
+            llm_telemetry.record_cache_hit("chat", "semantic_cache")
+            yield probe.response
+            return
+
+    variables = _build_variables(user_message, profile_context, conversation)
+
+    # Wall time, time-to-first-token and tokens are recorded by the router's LLM telemetry
+    chunks = []
+    async for chunk in router.astream("chat", _build_chain, variables):
+        if chunk:
+            chunks.append(chunk)
+            yield chunk
+
+    # Only complete answers are cached (not streams the client abandoned halfway)
+    if probe:
+        chat_cache.store(probe, user_message, "".join(chunks))
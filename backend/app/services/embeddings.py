@@ -0,0 +1,97 @@
+import hashlib
+import math
+import re
+import threading
+from typing import Protocol
+
+from app.core.config import settings
+from app.services.llm_providers import parse_model_spec
+
+# Embedder specs follow the LLM model specs: "hashing:v1" (local, offline) or
+# "vertex:text-embedding-004@us-central1". All vectors have settings.EMBEDDING_DIMENSIONS
+# dimensions and unit length, so cosine distance is meaningful across calls.
+
+
+class Embedder(Protocol):
+    name: str
+    dimensions: int
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+class HashingEmbedder:
+    """
+    Feature-hashing bag of words (unigrams + bigrams, signed buckets). No model, no network:
+    good at spotting near-verbatim repeats ("what should I learn first for SRE?"), which is
+    what the chat cache needs, and deterministic for tests.
+    """
+
+    def __init__(self, dimensions: int, name: str = "hashing:v1"):
+        self.name = name
+        self.dimensions = dimensions
+
+    def _bucket(self, feature: str) -> tuple[int, float]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimensions, 1.0 if value >> 63 else -1.0
+
+    def embed_one(self, text: str) -> list[float]:
+        tokens = _TOKEN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = [0.0] * self.dimensions
+        for feature in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+        return _normalize(vector)
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        # Microseconds per message, not worth a thread hop
+        return [self.embed_one(text) for text in texts]
+
+
+class VertexEmbedder:
+    """
+    Vertex AI text embeddings. text-embedding-004 is trained so that leading dimensions carry
+    most of the signal, so vectors are cut to EMBEDDING_DIMENSIONS and re-normalized.
+    """
+
+    def __init__(self, model: str, location: str | None, dimensions: int):
+        # Imported lazily, like the chat models
+        from langchain_google_vertexai import VertexAIEmbeddings
+
+        self.name = f"vertex:{model}"
+        self.dimensions = dimensions
+        self._client = VertexAIEmbeddings(model_name=model, location=location)
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        vectors = await self._client.aembed_documents(texts)
+        return [_normalize(list(vector[: self.dimensions])) for vector in vectors]
+
+
+def create_embedder(spec: str, dimensions: int) -> Embedder:
+    provider, model, options = parse_model_spec(spec)
+    if provider == "hashing":
+        return HashingEmbedder(dimensions, name=spec)
+    if provider == "vertex":
+        return VertexEmbedder(model, options.get("location"), dimensions)
+    raise ValueError(f"Unknown embedding provider {provider!r} in {spec!r}")
+
+
+_embedder: Embedder | None = None
+_lock = threading.Lock()
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    with _lock:
+        if _embedder is None:
+            _embedder = create_embedder(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSIONS)
+        return _embedder
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.profile import Profile
+from app.models.resume_job import ResumeJob
+from app.services import ai_service, profile_service, rate_limiter, resume_service, skill_matcher
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["parse", "analyze", "save"]
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+class JobQueueFull(Exception):
+    pass
+
+_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+
+
+# --- Worker pool lifecycle (driven by the app lifespan) ---
+
+async def start_workers():
+    global _queue
+    _queue = asyncio.Queue(maxsize=settings.RESUME_JOB_QUEUE_MAX_SIZE)
+    for i in range(settings.RESUME_JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(i)))
+    # Pick up jobs that were queued or mid-flight when a process last stopped, now and periodically
+    _workers.append(asyncio.create_task(_sweep_jobs()))
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+def _lease_deadline():
+    return func.now() + timedelta(seconds=settings.RESUME_JOB_LEASE_SECONDS)
+
+def _claimable():
+    # Queued, or running under a lease nobody renewed (its worker/process died)
+    return or_(
+        ResumeJob.status == "queued",
+        and_(
+            ResumeJob.status == "running",
+            or_(ResumeJob.lease_expires_at.is_(None), ResumeJob.lease_expires_at < func.now()),
+        ),
+    )
+
+async def _requeue_unfinished_jobs(include_queued: bool):
+    # On startup queued jobs from a stopped process are picked up too; afterwards only
+    # abandoned ones (queued jobs of live processes are already in their queue)
+    condition = _claimable() if include_queued else and_(_claimable(), ResumeJob.status == "running")
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ResumeJob.id).filter(condition).order_by(ResumeJob.created_at)
+            )
+            job_ids = result.scalars().all()
+    except Exception as e:
+        logger.warning("Could not load unfinished resume jobs: %s", e)
+        return
+
+    if job_ids:
+        logger.info("Resuming %d unfinished resume job(s)", len(job_ids))
+    for job_id in job_ids:
+        # Enqueuing twice is harmless: only one run_job() can claim the job
+        await _queue.put(job_id)
+
+async def _delete_old_jobs():
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.RESUME_JOB_RETENTION_DAYS)
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(ResumeJob).filter(
+                    ResumeJob.status.in_(TERMINAL_STATUSES),
+                    ResumeJob.updated_at < cutoff,
+                )
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning("Could not delete old resume jobs: %s", e)
+        return
+    if result.rowcount:
+        logger.info("Deleted %d finished resume job(s) older than %d days", result.rowcount, settings.RESUME_JOB_RETENTION_DAYS)
+
+async def _sweep_jobs():
+    include_queued = True
+    while True:
+        await _requeue_unfinished_jobs(include_queued)
+        await _delete_old_jobs()
+        include_queued = False
+        await asyncio.sleep(settings.RESUME_JOB_LEASE_SECONDS)
+
+async def _worker(worker_id: int):
+    while True:
+        job_id = await _queue.get()
+        try:
+            await run_job(job_id)
+        except Exception:
+            logger.exception("Resume job %s crashed in worker %d", job_id, worker_id)
+        finally:
+            _queue.task_done()
+
+
+# --- Job creation / execution ---
+
+async def create_job(
+    db: AsyncSession,
+    user_id: str,
+    target_role: str,
+    experience_level: str,
+    file_content: bytes | None = None,
+    resume_text: str | None = None,
+    partial_analysis: dict | None = None,
+) -> ResumeJob:
+    """
+    Queues a job from the raw PDF, or from text the caller already parsed (the parse stage is
+    then skipped), optionally with the partial analysis it already has.
+    """
+    if _queue is None or _queue.full():
+        raise JobQueueFull()
+
+    job = ResumeJob(
+        user_id=user_id,
+        target_role=target_role,
+        experience_level=experience_level,
+        file_content=file_content,
+        resume_text_content=resume_text,
+        stage="parse" if resume_text is None else "analyze",
+        partial_analysis=partial_analysis,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    _queue.put_nowait(job.id)
+    return job
+
+async def run_job(job_id: str):
+    """
+    Runs parse -> analyze -> save, committing after each stage.
+    Stages whose output is already persisted are skipped, so a job resumed after a restart
+    continues where it stopped instead of re-running the LLM call.
+    """
+    async with AsyncSessionLocal() as db:
+        # Claim the job atomically: if another worker (here or in another process) holds it,
+        # or it already finished, there is nothing to do
+        claimed = await db.execute(
+            update(ResumeJob)
+            .filter(ResumeJob.id == job_id, _claimable())
+            .values(status="running", lease_expires_at=_lease_deadline())
+            .returning(ResumeJob.id)
+        )
+        if claimed.scalar_one_or_none() is None:
+            await db.rollback()
+            return
+        await db.commit()
+        job = await db.get(ResumeJob, job_id)
+
+        heartbeat = asyncio.create_task(_renew_lease(job_id))
+        try:
+            # 1. Parse PDF
+            if job.resume_text_content is None:
+                job.stage = "parse"
+                await db.commit()
+
+                text_content = await resume_service.parse_pdf_bytes(job.file_content)
+                if len(text_content) < 50:
+                    raise ValueError("Resume content is too short or unreadable.")
+
+                job.resume_text_content = text_content
+                job.file_content = None
+                await db.commit()
+
+            # 2. Call Gemini AI
+            if job.ai_analysis_json is None:
+                job.stage = "analyze"
+                await db.commit()
+
+                # The local skill-match score is ready in milliseconds: publish it before the LLM
+                # runs (the upload request usually did already)
+                partial = dict(job.partial_analysis or {})
+                if "preliminary" not in partial:
+                    partial["preliminary"] = skill_matcher.preliminary_score(job.resume_text_content, job.target_role)
+                    job.partial_analysis = dict(partial)
+                    await db.commit()
+
+                # Stream the analysis so the score and summary show up (partial_analysis)
+                # long before the roadmap is done. A failed analysis fails the job.
+                async for name, value in ai_service.stream_career_analysis(
+                    resume_text=job.resume_text_content,
+                    target_role=job.target_role,
+                    experience_level=job.experience_level
+                ):
+                    if name == "analysis":
+                        ai_result = value
+                        continue
+                    if name == "roadmap_phase":
+                        partial["roadmap"] = partial.get("roadmap", []) + [value]
+                    else:
+                        partial[name] = value
+                    job.partial_analysis = dict(partial)
+                    await db.commit()
+
+                job.ai_analysis_json = ai_result
+                await db.commit()
+
+            # 3. Save/Update Profile
+            job.stage = "save"
+            await db.commit()
+
+            profile = await profile_service.save_analysis(
+                db,
+                user_id=job.user_id,
+                target_role=job.target_role,
+                experience_level=job.experience_level,
+                resume_text=job.resume_text_content,
+                ai_result=job.ai_analysis_json,
+                preliminary=(job.partial_analysis or {}).get("preliminary"),
+            )
+
+            job.profile_id = profile.id
+            job.stage = "done"
+            job.status = "succeeded"
+            job.lease_expires_at = None
+            await db.commit()
+
+        except Exception as e:
+            # Read before rollback(): it expires the instance, and reloading attributes
+            # implicitly is not possible under asyncio
+            stage, user_id, created_at = job.stage, job.user_id, job.created_at
+            await db.rollback()
+            logger.warning("Resume job %s failed at stage %s: %s", job_id, stage, e)
+            await db.execute(
+                update(ResumeJob)
+                .filter(ResumeJob.id == job_id)
+                .values(status="failed", stage=stage, error=str(e), file_content=None, lease_expires_at=None)
+            )
+            await db.commit()
+            # The upload that created the job was charged; a failed analysis gives it back
+            await rate_limiter.refund(db, user_id, "upload", charged_at=created_at)
+        finally:
+            heartbeat.cancel()
+
+async def _renew_lease(job_id: str):
+    # Keeps the claim alive through long stages (the LLM call) so the sweep leaves the job alone
+    while True:
+        await asyncio.sleep(settings.RESUME_JOB_LEASE_SECONDS / 3)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(ResumeJob)
+                    .filter(ResumeJob.id == job_id, ResumeJob.status == "running")
+                    .values(lease_expires_at=_lease_deadline())
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("Could not renew the lease of resume job %s: %s", job_id, e)
+
+
+# --- Status reporting ---
+
+def _stage_progress(job: ResumeJob) -> list[dict]:
+    if job.stage == "done":
+        return [{"name": name, "status": "done"} for name in STAGES]
+
+    current = STAGES.index(job.stage)
+    current_status = {"queued": "pending", "running": "running", "failed": "failed"}.get(job.status, "pending")
+
+    progress = []
+    for i, name in enumerate(STAGES):
+        if i < current:
+            status = "done"
+        elif i == current:
+            status = current_status
+        else:
+            status = "pending"
+        progress.append({"name": name, "status": status})
+    return progress
+
+async def describe_job(db: AsyncSession, job: ResumeJob) -> dict:
+    profile = None
+    if job.status == "succeeded" and job.profile_id:
+        profile = await db.get(Profile, job.profile_id)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "stages": _stage_progress(job),
+        "error": job.error,
+        "partial_analysis": job.partial_analysis,
+        "profile": profile,
+    }
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import parse_qsl
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Model specs look like "vertex:gemini-2.5-flash@us-central1" or "fake:fast?latency_ms=200".
+
+FAKE_ANALYSIS = {
+    "match_score": 72,
+    "executive_summary": "Solid backend foundation with production Python experience. Needs more depth in cloud infrastructure and observability for this role.",
+    "skill_breakdown": [
+        {"category": "Technical Skills", "score": 78},
+        {"category": "System Design", "score": 61},
+        {"category": "Communication", "score": 70},
+        {"category": "Leadership", "score": 55},
+    ],
+    "missing_skills": ["Kubernetes", "Terraform", "Prometheus"],
+    "roadmap": [
+        {
+            "phase": "Phase 1: Foundations",
+            "week": "Week 1-2",
+            "topics": ["Containers", "Kubernetes basics"],
+            "action_items": [
+                {"task": "Containerize an existing Python service", "completed": False},
+                {"task": "Deploy it to a local Kubernetes cluster", "completed": False},
+            ],
+        },
+        {
+            "phase": "Phase 2: Infrastructure as Code",
+            "week": "Week 3-4",
+            "topics": ["Terraform", "CI/CD"],
+            "action_items": [
+                {"task": "Provision a staging environment with Terraform", "completed": False},
+                {"task": "Add a deployment pipeline", "completed": False},
+            ],
+        },
+    ],
+}
+
+FAKE_LATEX = "\\documentclass{article}\n\\usepackage{geometry}\n\\begin{document}\nFake Resume\n\\end{document}"
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic offline chat model for local runs, tests and benchmarks.
+
+    Replies are picked from the prompt (JSON analysis, LaTeX resume or a mentor answer) and
+    latency is injected as latency_ms (+ seeded jitter_ms) before the first token plus
+    ms_per_token while streaming. fail_rate makes a seeded fraction of calls raise.
+    """
+
+    name: str = "fake"
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    ms_per_token: float = 0.0
+    fail_rate: float = 0.0
+    seed: int = 0
+
+    _rng: random.Random | None = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "skillsync-fake"
+
+    def _next_random(self) -> float:
+        if self._rng is None:
+            self._rng = random.Random(f"{self.name}:{self.seed}")
+        return self._rng.random()
+
+    def _reply(self, messages: list[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if "LaTeX" in prompt:
+            return FAKE_LATEX
+        if "JSON" in prompt:
+            # Only the keys the prompt asks for, so fan-out sub-prompts get their share
+            keys = [key for key in FAKE_ANALYSIS if f'"{key}"' in prompt]
+            return json.dumps({key: FAKE_ANALYSIS[key] for key in keys} or FAKE_ANALYSIS)
+        question = str(messages[-1].content).strip()
+        return f"Great question. For \"{question[:80]}\", start with the first item on your roadmap and build one small project around it."
+
+    def _plan(self, messages: list[BaseMessage]) -> tuple[float, str, bool]:
+        delay = (self.latency_ms + self.jitter_ms * self._next_random()) / 1000
+        fail = self.fail_rate > 0 and self._next_random() < self.fail_rate
+        return delay, self._reply(messages), fail
+
+    def _result(self, messages: list[BaseMessage], text: str) -> ChatResult:
+        usage = {
+            "input_tokens": sum(len(str(m.content)) for m in messages) // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (sum(len(str(m.content)) for m in messages) + len(text)) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        delay, text, fail = self._plan(messages)
+        time.sleep(delay + self.ms_per_token * len(text) / 4 / 1000)
+        if fail:
+            raise RuntimeError(f"{self.name}: injected failure")
+        return self._result(messages, text)
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        delay, text, fail = self._plan(messages)
+        await asyncio.sleep(delay + self.ms_per_token * len(text) / 4 / 1000)
+        if fail:
+            raise RuntimeError(f"{self.name}: injected failure")
+        return self._result(messages, text)
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        result = self._generate(messages, stop=stop, **kwargs)
+        for token in re.split(r"(\s)", result.generations[0].message.content):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        delay, text, fail = self._plan(messages)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{self.name}: injected failure")
+        for token in re.split(r"(\s)", text):
+            if self.ms_per_token and token.strip():
+                await asyncio.sleep(self.ms_per_token / 1000)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def parse_model_spec(spec: str) -> tuple[str, str, dict]:
+    """
+    "vertex:gemini-2.5-flash@us-central1" -> ("vertex", "gemini-2.5-flash", {"location": "us-central1"})
+    "fake:slow?latency_ms=900"            -> ("fake", "slow", {"latency_ms": "900"})
+    """
+    provider, _, rest = spec.partition(":")
+    if not rest:
+        raise ValueError(f"Invalid model spec {spec!r}, expected 'provider:model'")
+    rest, _, query = rest.partition("?")
+    model, _, location = rest.partition("@")
+    options = dict(parse_qsl(query))
+    if location:
+        options["location"] = location
+    return provider, model, options
+
+
+def create_chat_model(spec: str) -> BaseChatModel:
+    provider, model, options = parse_model_spec(spec)
+
+    if provider == "vertex":
+        # Imported lazily: the Vertex SDK is heavy and only needed once an LLM is called
+        from langchain_google_vertexai import ChatVertexAI
+
+        return ChatVertexAI(model_name=model, location=options.get("location"))
+
+    if provider == "fake":
+        return FakeChatModel(
+            name=model,
+            latency_ms=float(options.get("latency_ms", 0)),
+            jitter_ms=float(options.get("jitter_ms", 0)),
+            ms_per_token=float(options.get("ms_per_token", 0)),
+            fail_rate=float(options.get("fail_rate", 0)),
+            seed=int(options.get("seed", 0)),
+        )
+
+    raise ValueError(f"Unknown LLM provider {provider!r} in {spec!r}")
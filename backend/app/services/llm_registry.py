@@ -0,0 +1,52 @@
+import threading
+from typing import Callable
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+from app.services.llm_providers import create_chat_model
+
+
+class LLMRegistry:
+    """
+    Process-wide home for LLM clients and compiled prompt chains.
+
+    Clients are created on first use (so importing the app or serving /auth never touches
+    Google credentials) and are shared by every service: one client per model spec owns the
+    credentials and gRPC channel, and per-call settings such as temperature or
+    max_output_tokens are applied with .bind() instead of building another client.
+    Chains (prompt | model | parser) are compiled once and reused for every request.
+    """
+
+    def __init__(self):
+        self._models: dict[str, BaseChatModel] = {}
+        self._chains: dict[str, Runnable] = {}
+        self._lock = threading.RLock() # get_chain factories call get_model
+
+    def get_model(self, spec: str) -> BaseChatModel:
+        model = self._models.get(spec)
+        if model is None:
+            with self._lock:
+                model = self._models.get(spec)
+                if model is None:
+                    model = create_chat_model(spec)
+                    self._models[spec] = model
+        return model
+
+    def get_chain(self, name: str, factory: Callable[[], Runnable]) -> Runnable:
+        chain = self._chains.get(name)
+        if chain is None:
+            with self._lock:
+                chain = self._chains.get(name)
+                if chain is None:
+                    chain = factory()
+                    self._chains[name] = chain
+        return chain
+
+    def close(self):
+        with self._lock:
+            self._chains.clear()
+            self._models.clear()
+
+
+registry = LLMRegistry()
@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Callable
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from prometheus_client import Counter
+
+from app.core.config import settings
+from app.services.llm_registry import registry
+from app.services.llm_telemetry import LLMCallTelemetry, note_model, record_retry
+
+logger = logging.getLogger(__name__)
+
+HEDGED_REQUESTS = Counter(
+    "skillsync_llm_hedged_requests_total",
+    "Hedged LLM requests by which request finished first (primary, hedge).",
+    ["call_type", "winner"],
+)
+
+ChainFactory = Callable[[BaseChatModel], Runnable]
+
+
+class LatencyTracker:
+    """
+    Keeps the last LLM_LATENCY_WINDOW latencies per (call type, model) so routing
+    decisions follow the current tail, not all-time averages. Failed calls count as
+    LLM_ERROR_PENALTY_SECONDS and hedge losers as their time so far, so only keeping the
+    successes (and winners) does not make a flaky model look fast.
+    """
+
+    def __init__(self, window: int, min_samples: int):
+        self.min_samples = min_samples
+        self._samples: dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, call_type: str, spec: str, seconds: float):
+        self._samples[(call_type, spec)].append(seconds)
+
+    def p95(self, call_type: str, spec: str) -> float | None:
+        samples = self._samples.get((call_type, spec))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class LLMRouter:
+    """
+    Picks a model per call type from settings.LLM_ROUTES and runs chains against it.
+
+    ainvoke() hedges: if the primary has not answered within its recent p95, the same chain is
+    started on the next-best candidate and whichever finishes first wins (the other is cancelled).
+    A primary that fails is always retried once on the next-best candidate, before there are
+    enough samples to hedge or with hedging disabled.
+
+    astream() fails over the same way as long as nothing has been yielded: a model that errors
+    or sends no chunk within LLM_STREAM_FIRST_CHUNK_TIMEOUT_SECONDS is replaced by the next-best
+    candidate. Once the first chunk is out, the stream stays on that model.
+    """
+
+    def __init__(self, routes: dict[str, list[str]], tracker: LatencyTracker):
+        self.routes = routes
+        self.tracker = tracker
+
+    def candidates(self, call_type: str) -> list[str]:
+        specs = self.routes[call_type]
+        p95s = [self.tracker.p95(call_type, spec) for spec in specs]
+        unmeasured = [spec for spec, p in zip(specs, p95s) if p is None]
+        if unmeasured:
+            # Send a small share of traffic to candidates without enough samples so they get
+            # measured; otherwise keep the configured preference order.
+            if random.random() < settings.LLM_ROUTE_EXPLORE_RATE:
+                first = random.choice(unmeasured)
+                return [first] + [spec for spec in specs if spec != first]
+            return list(specs)
+        return [spec for _, spec in sorted(zip(p95s, specs), key=lambda pair: pair[0])]
+
+    def route_signature(self, call_type: str) -> str:
+        # Stable identifier of the models that may answer a call type (used in cache keys)
+        return ",".join(self.routes[call_type])
+
+    def _chain(self, call_type: str, spec: str, factory: ChainFactory) -> Runnable:
+        return registry.get_chain(f"{call_type}|{spec}", lambda: factory(registry.get_model(spec)))
+
+    async def _timed_invoke(
+        self, call_type: str, spec: str, factory: ChainFactory, variables: dict, attempt: str = "primary"
+    ) -> tuple[str, Any]:
+        telemetry = LLMCallTelemetry(call_type, spec, attempt)
+        try:
+            result = await self._chain(call_type, spec, factory).ainvoke(variables, config={"callbacks": [telemetry]})
+        except asyncio.CancelledError:
+            telemetry.finish("cancelled")
+            raise
+        except Exception:
+            telemetry.finish("error")
+            self.tracker.record(call_type, spec, settings.LLM_ERROR_PENALTY_SECONDS)
+            raise
+        self.tracker.record(call_type, spec, telemetry.finish("ok"))
+        return spec, result
+
+    def _hedge_delay(self, call_type: str, spec: str) -> float | None:
+        if not settings.LLM_HEDGING_ENABLED:
+            return None
+        p95 = self.tracker.p95(call_type, spec)
+        if p95 is None:
+            return None
+        return max(p95, settings.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    async def ainvoke(self, call_type: str, factory: ChainFactory, variables: dict) -> Any:
+        spec, result = await self._hedged_invoke(call_type, factory, variables)
+        # Remember which model answered, for telemetry recorded by the caller (parse failures)
+        note_model(spec)
+        return result
+
+    async def _hedged_invoke(self, call_type: str, factory: ChainFactory, variables: dict) -> tuple[str, Any]:
+        ranked = self.candidates(call_type)
+        primary_spec = ranked[0]
+        backup_spec = ranked[1] if len(ranked) > 1 else ranked[0]
+
+        started = time.perf_counter()
+        primary = asyncio.create_task(self._timed_invoke(call_type, primary_spec, factory, variables))
+        tasks = {primary}
+        try:
+            delay = self._hedge_delay(call_type, primary_spec)
+            if delay is None:
+                try:
+                    return await primary
+                except Exception as e:
+                    if backup_spec == primary_spec:
+                        raise
+                    # Not enough samples to hedge (or hedging off): still fail over on errors
+                    logger.info("failing over %s: %s -> %s after error: %s", call_type, primary_spec, backup_spec, e)
+                    record_retry(call_type, backup_spec, "error")
+                    return await self._timed_invoke(call_type, backup_spec, factory, variables, attempt="failover")
+
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done and primary.exception() is None:
+                return primary.result()
+
+            # Primary is slow (or already failed): race it against a hedge on the backup model
+            logger.info("hedging %s: %s -> %s after %.2fs", call_type, primary_spec, backup_spec, delay)
+            record_retry(call_type, backup_spec, "error" if done else "slow")
+            hedge = asyncio.create_task(self._timed_invoke(call_type, backup_spec, factory, variables, attempt="hedge"))
+            tasks.add(hedge)
+            pending = {t for t in tasks if not t.done()}
+            first_error = primary.exception() if primary.done() else None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        HEDGED_REQUESTS.labels(
+                            call_type=call_type, winner="primary" if task is primary else "hedge"
+                        ).inc()
+                        if task is not primary and not primary.done():
+                            # The primary would have taken at least this long
+                            self.tracker.record(call_type, primary_spec, time.perf_counter() - started)
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_from(
+        self, call_type: str, spec: str, factory: ChainFactory, variables: dict, attempt: str
+    ) -> AsyncIterator[Any]:
+        telemetry = LLMCallTelemetry(call_type, spec, attempt=attempt)
+        outcome = "cancelled" # Generator closed early (client went away, or failed over)
+        try:
+            async for chunk in self._chain(call_type, spec, factory).astream(variables, config={"callbacks": [telemetry]}):
+                if chunk:
+                    telemetry.first_token()
+                yield chunk
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            self.tracker.record(call_type, spec, settings.LLM_ERROR_PENALTY_SECONDS)
+            raise
+        finally:
+            wall = telemetry.finish(outcome)
+        self.tracker.record(call_type, spec, wall)
+
+    async def astream(self, call_type: str, factory: ChainFactory, variables: dict) -> AsyncIterator[Any]:
+        # Streams are not hedged (tokens flow to the client as they arrive), but they fail
+        # over until the first chunk: nothing has been sent yet, so a restart is invisible
+        ranked = self.candidates(call_type)
+        attempts = [(ranked[0], "stream")] + [(spec, "failover") for spec in ranked[1:2] if spec != ranked[0]]
+
+        for n, (spec, attempt) in enumerate(attempts):
+            is_last = n == len(attempts) - 1
+            stream = self._stream_from(call_type, spec, factory, variables, attempt)
+            try:
+                # The last candidate gets no first-chunk deadline (nothing left to fail over to)
+                async with asyncio.timeout(None if is_last else settings.LLM_STREAM_FIRST_CHUNK_TIMEOUT_SECONDS):
+                    first = await anext(stream)
+            except StopAsyncIteration:
+                note_model(spec)
+                return
+            except Exception as e:
+                await stream.aclose()
+                if is_last:
+                    raise
+                slow = isinstance(e, TimeoutError)
+                if slow:
+                    # It would have taken at least this long
+                    self.tracker.record(call_type, spec, settings.LLM_STREAM_FIRST_CHUNK_TIMEOUT_SECONDS)
+                next_spec = attempts[n + 1][0]
+                logger.info(
+                    "failing over %s stream: %s -> %s after %s", call_type, spec, next_spec,
+                    "no chunk in %.0fs" % settings.LLM_STREAM_FIRST_CHUNK_TIMEOUT_SECONDS if slow else f"error: {e}",
+                )
+                record_retry(call_type, next_spec, "slow" if slow else "error")
+                continue
+
+            note_model(spec)
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                await stream.aclose()
+            return
+
+
+router = LLMRouter(
+    routes=settings.LLM_ROUTES,
+    tracker=LatencyTracker(window=settings.LLM_LATENCY_WINDOW, min_samples=settings.LLM_HEDGE_MIN_SAMPLES),
+)
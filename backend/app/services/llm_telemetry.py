@@ -0,0 +1,147 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Every LLM call goes through llm_router, which attaches an LLMCallTelemetry handler per attempt.
+# Labels: call_type is the product endpoint (career_analysis, optimized_resume, chat) and model
+# is the routed model spec.
+
+LLM_CALL_SECONDS = Histogram(
+    "skillsync_llm_call_seconds",
+    "LLM call wall time per call type, model spec and outcome (ok, error, cancelled).",
+    ["call_type", "model", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "skillsync_llm_time_to_first_token_seconds",
+    "Time until the first streamed token.",
+    ["call_type", "model"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16),
+)
+LLM_TOKENS = Counter(
+    "skillsync_llm_tokens_total",
+    "Provider-reported tokens by direction (input, output).",
+    ["call_type", "model", "direction"],
+)
+LLM_RETRIES = Counter(
+    "skillsync_llm_retries_total",
+    "Extra attempts started on another model (hedges and failovers), by reason.",
+    ["call_type", "model", "reason"],
+)
+LLM_PARSE_FAILURES = Counter(
+    "skillsync_llm_parse_failures_total",
+    "LLM responses that could not be parsed into the expected output.",
+    ["call_type", "model"],
+)
+LLM_PARSE_REPAIRS = Counter(
+    "skillsync_llm_parse_repairs_total",
+    "Malformed LLM responses (fenced, truncated) that were repaired locally instead of re-called.",
+    ["call_type", "model"],
+)
+LLM_CACHE_HITS = Counter(
+    "skillsync_llm_cache_hits_total",
+    "LLM calls answered from a cache instead of a model.",
+    ["call_type", "source"],
+)
+
+# Model spec that produced the last result in this context (set by the router), so parse
+# failures further down the call stack can be attributed to a model.
+_last_model: ContextVar[str | None] = ContextVar("llm_last_model", default=None)
+
+
+def _log(event: str, **fields: Any) -> None:
+    # key=value message for plain log output, plus the same fields as `extra` for JSON formatters
+    message = " ".join(f"{key}={value}" for key, value in fields.items())
+    logger.info("%s %s", event, message, extra={"llm": {"event": event, **fields}})
+
+
+class LLMCallTelemetry(AsyncCallbackHandler):
+    """
+    Callback handler for a single LLM attempt: collects token usage from the model's result
+    (independent of any output parser after it) and the streamed first-token time.
+    Call first_token() / finish() from the caller, which owns the wall clock.
+    """
+
+    def __init__(self, call_type: str, model: str, attempt: str = "primary"):
+        self.call_type = call_type
+        self.model = model
+        self.attempt = attempt
+        self.started = time.perf_counter()
+        self.first_token_at: float | None = None
+        self.input_tokens: int | None = None
+        self.output_tokens: int | None = None
+
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+        if not usage and response.llm_output:
+            usage = response.llm_output.get("usage_metadata") or response.llm_output.get("token_usage") or {}
+        self.input_tokens = usage.get("input_tokens", usage.get("prompt_tokens"))
+        self.output_tokens = usage.get("output_tokens", usage.get("completion_tokens"))
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            LLM_TIME_TO_FIRST_TOKEN.labels(call_type=self.call_type, model=self.model).observe(
+                self.first_token_at - self.started
+            )
+
+    @property
+    def wall_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def finish(self, outcome: str) -> float:
+        wall = self.wall_seconds
+        LLM_CALL_SECONDS.labels(call_type=self.call_type, model=self.model, outcome=outcome).observe(wall)
+        if self.input_tokens is not None:
+            LLM_TOKENS.labels(call_type=self.call_type, model=self.model, direction="input").inc(self.input_tokens)
+        if self.output_tokens is not None:
+            LLM_TOKENS.labels(call_type=self.call_type, model=self.model, direction="output").inc(self.output_tokens)
+
+        _log(
+            "llm_call",
+            call_type=self.call_type,
+            model=self.model,
+            attempt=self.attempt,
+            outcome=outcome,
+            wall_ms=round(wall * 1000),
+            ttft_ms=round((self.first_token_at - self.started) * 1000) if self.first_token_at else None,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+        )
+        return wall
+
+
+def note_model(model: str) -> None:
+    _last_model.set(model)
+
+
+def record_retry(call_type: str, model: str, reason: str) -> None:
+    LLM_RETRIES.labels(call_type=call_type, model=model, reason=reason).inc()
+    _log("llm_retry", call_type=call_type, model=model, reason=reason)
+
+
+def record_parse_failure(call_type: str, error: Exception) -> None:
+    model = _last_model.get() or "unknown"
+    LLM_PARSE_FAILURES.labels(call_type=call_type, model=model).inc()
+    _log("llm_parse_failure", call_type=call_type, model=model, error=type(error).__name__)
+
+
+def record_parse_repair(call_type: str) -> None:
+    model = _last_model.get() or "unknown"
+    LLM_PARSE_REPAIRS.labels(call_type=call_type, model=model).inc()
+    _log("llm_parse_repair", call_type=call_type, model=model)
+
+
+def record_cache_hit(call_type: str, source: str) -> None:
+    LLM_CACHE_HITS.labels(call_type=call_type, source=source).inc()
+    _log("llm_cache_hit", call_type=call_type, source=source)
@@ -0,0 +1,37 @@
+from prometheus_client import Counter
+from sqlalchemy import event
+
+from app.core.cache import TTLLRUCache
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import Principal
+
+PRINCIPAL_LOOKUPS = Counter(
+    "skillsync_principal_cache_lookups_total",
+    "Authenticated-principal resolutions by source (cache_hit, cache_miss, token_claims).",
+    ["result"],
+)
+
+# Keyed by token subject (user id). Entries are dropped explicitly when the user row changes;
+# the TTL bounds staleness for changes made by other processes.
+_cache = TTLLRUCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+def get(user_id: str) -> Principal | None:
+    principal = _cache.get(user_id)
+    PRINCIPAL_LOOKUPS.labels(result="cache_hit" if principal else "cache_miss").inc()
+    return principal
+
+def put(principal: Principal):
+    _cache.set(principal.id, principal)
+
+def invalidate(user_id: str):
+    _cache.pop(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    # Any flushed change to a user row (deactivation, password/profile edits) drops its cached principal
+    invalidate(target.id)
@@ -0,0 +1,307 @@
+import asyncio
+import hashlib
+import logging
+import time
+
+from prometheus_client import Histogram
+from sqlalchemy import and_, cast, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import JSONPATH, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.instrumentation import spawn_background
+from app.db.session import AsyncSessionLocal
+from app.models.profile import Profile
+from app.models.profile_embedding import ProfileEmbedding, RoleEmbedding
+from app.services.embeddings import get_embedder
+from app.services.prompt_budget import clean_resume_text
+from app.services.skill_taxonomy import ROLES, SKILLS
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_QUERY_SECONDS = Histogram(
+    "skillsync_similarity_query_seconds",
+    "Similarity search latency by query (similar_roles, similar_profiles).",
+    ["query"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+# Background embedding writes / startup indexing, kept referenced until they finish
+_pending: set[asyncio.Task] = set()
+_roles_ready = False
+
+
+def _content_hash(text_content: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\x1f{text_content}".encode("utf-8")).hexdigest()
+
+
+def profile_text(target_role: str, resume_text: str) -> str:
+    return f"{target_role}\n{clean_resume_text(resume_text)[: settings.PROFILE_EMBEDDING_MAX_CHARS]}"
+
+
+def role_text(role_id: str) -> str:
+    # Name, aliases and skill vocabulary, core skills repeated by weight so they dominate
+    name, aliases, weights = ROLES[role_id]
+    parts = [name, *aliases]
+    for skill_id, weight in weights.items():
+        display, synonyms = SKILLS[skill_id]
+        parts.extend([display, *synonyms] * weight)
+    return "\n".join(parts)
+
+
+def roadmap_completed(analysis: dict | None) -> bool:
+    items = [item for phase in (analysis or {}).get("roadmap", []) for item in phase.get("action_items", [])]
+    return bool(items) and all(item.get("completed") is True for item in items)
+
+
+# Same as roadmap_completed(), evaluated in Postgres on the stored document
+_has_items = func.jsonb_path_exists(
+    Profile.ai_analysis_json, cast(literal("$.roadmap[*].action_items[*]"), JSONPATH)
+)
+_has_open_items = func.jsonb_path_exists(
+    Profile.ai_analysis_json, cast(literal("$.roadmap[*].action_items[*] ? (!(@.completed == true))"), JSONPATH)
+)
+
+
+# --- Writes ---
+
+async def upsert_profile_embedding(
+    profile_id: str, target_role: str, experience_level: str, resume_text: str, analysis: dict | None
+) -> None:
+    """Embeds the profile's resume, unless the same text was already embedded with the same model."""
+    embedder = get_embedder()
+    content = profile_text(target_role, resume_text)
+    content_hash = _content_hash(content, embedder.name)
+    values = {
+        "target_role": target_role,
+        "experience_level": experience_level,
+        "roadmap_completed": roadmap_completed(analysis),
+    }
+
+    async with AsyncSessionLocal() as db:
+        current = await db.execute(
+            select(ProfileEmbedding.content_hash).filter(ProfileEmbedding.profile_id == profile_id)
+        )
+        if current.scalar_one_or_none() == content_hash:
+            await db.execute(update(ProfileEmbedding).filter(ProfileEmbedding.profile_id == profile_id).values(**values))
+            await db.commit()
+            return
+
+        [embedding] = await embedder.aembed([content])
+        stmt = insert(ProfileEmbedding).values(
+            profile_id=profile_id, embedding=embedding, model=embedder.name, content_hash=content_hash, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProfileEmbedding.profile_id],
+            set_={
+                "embedding": stmt.excluded.embedding,
+                "model": stmt.excluded.model,
+                "content_hash": stmt.excluded.content_hash,
+                "updated_at": func.now(),
+                **{key: getattr(stmt.excluded, key) for key in values},
+            },
+        )
+        await db.execute(stmt)
+        await db.commit()
+
+
+async def _run_logged(coro, what: str):
+    try:
+        await coro
+    except Exception as e:
+        # The index is derived data: a failed write is retried by the next upload or backfill
+        logger.warning("Profile index %s failed: %s", what, e)
+
+
+def _spawn(coro, what: str):
+    task = spawn_background(_run_logged(coro, what))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+def schedule_profile_embedding(profile: Profile) -> None:
+    """Indexes a freshly saved profile in the background (the upload response is not held up)."""
+    if not settings.PROFILE_INDEX_ENABLED:
+        return
+    _spawn(
+        upsert_profile_embedding(
+            profile.id, profile.target_role, profile.experience_level,
+            profile.resume_text_content, profile.ai_analysis_json,
+        ),
+        f"update for profile {profile.id}",
+    )
+
+
+async def refresh_roadmap_completed(db: AsyncSession, profile_id: str) -> None:
+    """Re-derives roadmap_completed after a roadmap toggle. Runs in the caller's transaction."""
+    await db.execute(
+        update(ProfileEmbedding)
+        .filter(ProfileEmbedding.profile_id == profile_id)
+        .values(
+            roadmap_completed=select(and_(_has_items, ~_has_open_items))
+            .filter(Profile.id == profile_id)
+            .scalar_subquery()
+        )
+    )
+
+
+async def ensure_role_embeddings() -> None:
+    """Embeds taxonomy roles that are new or changed since they were last embedded."""
+    global _roles_ready
+    embedder = get_embedder()
+    wanted = {role_id: role_text(role_id) for role_id in ROLES}
+    hashes = {role_id: _content_hash(content, embedder.name) for role_id, content in wanted.items()}
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(RoleEmbedding.role_id, RoleEmbedding.content_hash))
+        stored = dict(result.all())
+        stale = [role_id for role_id in wanted if stored.get(role_id) != hashes[role_id]]
+
+        if stale:
+            vectors = await embedder.aembed([wanted[role_id] for role_id in stale])
+            for role_id, embedding in zip(stale, vectors):
+                stmt = insert(RoleEmbedding).values(
+                    role_id=role_id, name=ROLES[role_id][0], embedding=embedding,
+                    model=embedder.name, content_hash=hashes[role_id],
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[RoleEmbedding.role_id],
+                    set_={
+                        "name": stmt.excluded.name,
+                        "embedding": stmt.excluded.embedding,
+                        "model": stmt.excluded.model,
+                        "content_hash": stmt.excluded.content_hash,
+                        "updated_at": func.now(),
+                    },
+                )
+                await db.execute(stmt)
+        removed = set(stored) - set(wanted)
+        if removed:
+            await db.execute(RoleEmbedding.__table__.delete().where(RoleEmbedding.role_id.in_(removed)))
+        await db.commit()
+    _roles_ready = True
+
+
+async def backfill_profiles() -> int:
+    """
+    Embeds profiles that have no embedding yet, or one from another embedder (after
+    EMBEDDING_MODEL changes), in batches. Returns how many were indexed.
+    """
+    embedder = get_embedder()
+    indexed = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Profile.id, Profile.target_role, Profile.experience_level, Profile.resume_text_content, Profile.ai_analysis_json)
+                .outerjoin(ProfileEmbedding, ProfileEmbedding.profile_id == Profile.id)
+                .filter((ProfileEmbedding.profile_id.is_(None)) | (ProfileEmbedding.model != embedder.name))
+                .limit(settings.PROFILE_INDEX_BACKFILL_BATCH_SIZE)
+            )
+            batch = result.all()
+        if not batch:
+            return indexed
+        for row in batch:
+            await upsert_profile_embedding(*row)
+        indexed += len(batch)
+
+
+async def _index_on_startup():
+    await ensure_role_embeddings()
+    indexed = await backfill_profiles()
+    if indexed:
+        logger.info("Indexed %d profile(s) for similarity search", indexed)
+
+
+def start_background_indexing() -> None:
+    if settings.PROFILE_INDEX_ENABLED:
+        _spawn(_index_on_startup(), "startup indexing")
+
+
+async def stop_background_indexing() -> None:
+    for task in list(_pending):
+        task.cancel()
+    await asyncio.gather(*_pending, return_exceptions=True)
+
+
+# --- Queries ---
+
+async def _own_embedding(db: AsyncSession, user_id: str) -> tuple[str, list[float]] | None:
+    result = await db.execute(
+        select(ProfileEmbedding.profile_id, ProfileEmbedding.embedding)
+        .join(Profile, Profile.id == ProfileEmbedding.profile_id)
+        .filter(Profile.user_id == user_id, ProfileEmbedding.model == get_embedder().name)
+    )
+    row = result.first()
+    return (row.profile_id, row.embedding) if row else None
+
+
+async def _set_ef_search(db: AsyncSession):
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(settings.PROFILE_SIMILARITY_EF_SEARCH)}"))
+
+
+async def similar_roles(db: AsyncSession, user_id: str, limit: int) -> list[dict] | None:
+    """Taxonomy roles closest to the user's resume. None when the profile is not indexed (yet)."""
+    if not _roles_ready:
+        await ensure_role_embeddings()
+    own = await _own_embedding(db, user_id)
+    if own is None:
+        return None
+
+    started = time.perf_counter()
+    distance = RoleEmbedding.embedding.cosine_distance(own[1])
+    await _set_ef_search(db)
+    result = await db.execute(
+        select(RoleEmbedding.role_id, RoleEmbedding.name, distance.label("distance"))
+        .filter(RoleEmbedding.model == get_embedder().name)
+        .order_by(distance)
+        .limit(limit)
+    )
+    rows = result.all()
+    await db.commit() # ends the transaction the SET LOCAL applied to
+    SIMILARITY_QUERY_SECONDS.labels(query="similar_roles").observe(time.perf_counter() - started)
+    return [{"role_id": row.role_id, "role": row.name, "similarity": round(1 - row.distance, 4)} for row in rows]
+
+
+async def similar_profiles(db: AsyncSession, user_id: str, limit: int, completed_roadmap: bool = False) -> list[dict] | None:
+    """
+    Other profiles closest to the user's resume (anonymous: role, level, roadmap status).
+    completed_roadmap=True searches only profiles that finished their roadmap, through the
+    partial HNSW index. None when the profile is not indexed (yet).
+    """
+    own = await _own_embedding(db, user_id)
+    if own is None:
+        return None
+    profile_id, embedding = own
+
+    started = time.perf_counter()
+    distance = ProfileEmbedding.embedding.cosine_distance(embedding)
+    query = (
+        select(
+            ProfileEmbedding.target_role,
+            ProfileEmbedding.experience_level,
+            ProfileEmbedding.roadmap_completed,
+            distance.label("distance"),
+        )
+        .filter(ProfileEmbedding.profile_id != profile_id, ProfileEmbedding.model == get_embedder().name)
+        .order_by(distance)
+        .limit(limit)
+    )
+    if completed_roadmap:
+        # Must be the bare column, exactly the partial index predicate: "IS true" is not matched
+        # to it, and filtering the full graph's candidates instead returns few or no rows
+        query = query.filter(ProfileEmbedding.roadmap_completed)
+
+    await _set_ef_search(db)
+    result = await db.execute(query)
+    rows = result.all()
+    await db.commit()
+    SIMILARITY_QUERY_SECONDS.labels(query="similar_profiles").observe(time.perf_counter() - started)
+    return [
+        {
+            "target_role": row.target_role,
+            "experience_level": row.experience_level,
+            "roadmap_completed": row.roadmap_completed,
+            "similarity": round(1 - row.distance, 4),
+        }
+        for row in rows
+    ]
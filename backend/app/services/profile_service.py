@@ -0,0 +1,178 @@
+from sqlalchemy import Boolean, Text, and_, bindparam, cast, func, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
+from app.models.profile import Profile
+from app.schemas.profile import RoadmapItemUpdate
+from app.services import profile_index, skill_matcher
+
+async def get_profile_by_user_id(db: AsyncSession, user_id: str):
+    result = await db.execute(select(Profile).filter(Profile.user_id == user_id))
+    return result.scalars().first()
+
+async def get_resume_text(db: AsyncSession, user_id: str) -> str | None:
+    result = await db.execute(select(Profile.resume_text_content).filter(Profile.user_id == user_id))
+    return result.scalar_one_or_none()
+
+async def get_profile_version(db: AsyncSession, user_id: str) -> int | None:
+    # Index-only probe (user_id is unique): no heavy columns are read
+    result = await db.execute(select(Profile.version).filter(Profile.user_id == user_id))
+    return result.scalar_one_or_none()
+
+# --- Column projections ---
+# resume_text_content and ai_analysis_json are several KB each, so hot paths only select
+# what they actually use instead of the whole row.
+
+PROFILE_FIELDS = ("id", "user_id", "target_role", "experience_level", "resume_text_content", "ai_analysis_json", "updated_at", "version")
+
+FIELD_PRESETS = {
+    "summary": [
+        "id", "target_role", "experience_level", "updated_at", "version",
+        "ai_analysis_json.match_score", "ai_analysis_json.executive_summary",
+    ],
+}
+
+def _field_column(name: str):
+    if name in PROFILE_FIELDS:
+        return getattr(Profile, name)
+    column, _, key = name.partition(".")
+    if column == "ai_analysis_json" and key:
+        # Top-level analysis key, extracted in Postgres (jsonb ->) without shipping the document
+        return Profile.ai_analysis_json[key]
+    raise ValueError(f"Unknown profile field {name!r}")
+
+async def get_profile_fields(db: AsyncSession, user_id: str, fields: list[str]) -> dict | None:
+    """
+    Loads only the requested fields. "ai_analysis_json.<key>" picks a single analysis key and
+    is returned nested ({"ai_analysis_json": {"<key>": ...}}) to keep the full payload's shape.
+    Raises ValueError for unknown fields.
+    """
+    columns = [_field_column(name).label(name) for name in fields]
+    result = await db.execute(select(*columns).filter(Profile.user_id == user_id))
+    row = result.mappings().first()
+    if row is None:
+        return None
+
+    data: dict = {}
+    for name in fields:
+        column, _, key = name.partition(".")
+        if key:
+            data.setdefault(column, {})[key] = row[name]
+        else:
+            data[name] = row[name]
+    return data
+
+# Completed roadmap task names, computed in Postgres so the analysis document stays in the DB
+_completed_tasks = func.jsonb_path_query_array(
+    Profile.ai_analysis_json,
+    cast(literal("$.roadmap[*].action_items[*] ? (@.completed == true).task"), JSONPATH),
+    type_=JSONB,
+)
+
+async def get_profile_for_optimize(db: AsyncSession, user_id: str) -> tuple[Profile, list[str]] | tuple[None, None]:
+    result = await db.execute(
+        select(Profile, _completed_tasks)
+        .options(load_only(Profile.target_role, Profile.resume_text_content))
+        .filter(Profile.user_id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None, None
+    profile, completed_tasks = row
+    return profile, completed_tasks or []
+
+# Only the parts of the analysis the mentor prompt uses (missing skills, phase 1 topics)
+_chat_analysis = func.jsonb_strip_nulls(func.jsonb_build_object(
+    "missing_skills", Profile.ai_analysis_json["missing_skills"],
+    "roadmap", func.jsonb_build_array(func.jsonb_build_object(
+        "topics", Profile.ai_analysis_json[("roadmap", 0, "topics")],
+    )),
+), type_=JSONB)
+
+async def get_chat_context(db: AsyncSession, user_id: str) -> dict | None:
+    result = await db.execute(
+        select(Profile.version, Profile.target_role, Profile.experience_level, _chat_analysis.label("ai_analysis_json"))
+        .filter(Profile.user_id == user_id)
+    )
+    row = result.mappings().first()
+    return dict(row) if row else None
+
+def bump_version(profile: Profile):
+    # SQL-side increment, so concurrent writers never hand out the same version twice
+    profile.version = Profile.version + 1
+
+async def save_analysis(
+    db: AsyncSession,
+    user_id: str,
+    target_role: str,
+    experience_level: str,
+    resume_text: str,
+    ai_result: dict,
+    preliminary: dict | None = None,
+) -> Profile:
+    """
+    Creates or updates the user's profile with a freshly parsed resume and its AI analysis.
+    Shared by the synchronous upload endpoint and the background upload jobs.
+    The local skill-match score is stored next to the analysis as ai_analysis_json.preliminary
+    (computed here unless the caller already has it), and the resume is (re-)embedded for similarity search in the background.
+    """
+    if preliminary is None:
+        preliminary = skill_matcher.preliminary_score(resume_text, target_role)
+    ai_result = {**ai_result, "preliminary": preliminary}
+    profile = await get_profile_by_user_id(db, user_id)
+
+    if profile:
+        profile.target_role = target_role
+        profile.experience_level = experience_level
+        profile.resume_text_content = resume_text
+        profile.ai_analysis_json = ai_result
+        bump_version(profile)
+    else:
+        # First time upload
+        profile = Profile(
+            user_id=user_id,
+            target_role=target_role,
+            experience_level=experience_level,
+            resume_text_content=resume_text,
+            ai_analysis_json=ai_result,
+        )
+
+    db.add(profile)
+    await db.commit()
+    # Name every column: the row may already be in the session loaded with load_only()
+    await db.refresh(profile, attribute_names=[attr.key for attr in Profile.__mapper__.column_attrs])
+    profile_index.schedule_profile_embedding(profile)
+    return profile
+
+def _item_path(item: RoadmapItemUpdate) -> list[str]:
+    return ["roadmap", str(item.phase_index), "action_items", str(item.item_index)]
+
+async def set_roadmap_items_completed(db: AsyncSession, user_id: str, updates: list[RoadmapItemUpdate]) -> bool:
+    """
+    Flips the `completed` flag of one or more roadmap items with a single UPDATE of nested
+    jsonb_set() calls, so Postgres applies the change atomically on the stored document
+    (no read-modify-write, no lost updates between concurrent toggles).
+    Returns False if the profile does not exist or any index does not point at an item.
+    """
+    document = Profile.ai_analysis_json
+    paths_exist = []
+    for item in updates:
+        path = bindparam(None, _item_path(item), type_=ARRAY(Text))
+        completed_path = bindparam(None, _item_path(item) + ["completed"], type_=ARRAY(Text))
+        value = func.to_jsonb(bindparam(None, item.completed, type_=Boolean))
+        document = func.jsonb_set(document, completed_path, value)
+        paths_exist.append(func.jsonb_typeof(Profile.ai_analysis_json.op("#>")(path)) == "object")
+
+    result = await db.execute(
+        update(Profile)
+        .where(Profile.user_id == user_id, and_(*paths_exist))
+        .values(ai_analysis_json=document, version=Profile.version + 1)
+        .returning(Profile.id)
+    )
+    profile_id = result.scalar_one_or_none()
+    if profile_id is not None:
+        # Same transaction, so "completed their roadmap" searches never see a stale flag
+        await profile_index.refresh_roadmap_completed(db, profile_id)
+    await db.commit()
+    return profile_id is not None
@@ -0,0 +1,191 @@
+import logging
+import re
+import unicodedata
+from collections import Counter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prose on Gemini tokenizers. Only used for budgeting;
+# the actual counts are logged from the response usage metadata.
+CHARS_PER_TOKEN = 4
+
+# Output-token cap per call type (instead of a blanket 8192 for everything)
+OUTPUT_TOKEN_CAPS = {
+    "career_analysis": settings.LLM_MAX_OUTPUT_TOKENS_ANALYSIS,
+    "career_assessment": settings.LLM_MAX_OUTPUT_TOKENS_ASSESSMENT,
+    "career_roadmap": settings.LLM_MAX_OUTPUT_TOKENS_ANALYSIS,
+    "optimized_resume": settings.LLM_MAX_OUTPUT_TOKENS_RESUME,
+    "chat": settings.LLM_MAX_OUTPUT_TOKENS_CHAT,
+    "chat_summary": settings.LLM_MAX_OUTPUT_TOKENS_SUMMARY,
+}
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "objective", "about me", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "work history", "internships", "internship"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack", "tools"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "publications": ["publications", "research"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "extracurricular activities", "activities"],
+    "references": ["references"],
+}
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# When over budget, sections are dropped in this order before anything else is truncated
+DROP_ORDER = ["references", "interests", "languages", "publications", "achievements"]
+
+# "Page 2", "Page 2 of 3", "2 of 3", "2/3" (a bare number could be a year or a grade)
+_PAGE_MARKER = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d{1,3}\s*(of|/)\s*\d{1,3})$", re.IGNORECASE)
+
+# Lines at most this far from the top/bottom of a page can be running headers/footers
+_EDGE_LINES = 2
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clean_resume_text(text: str) -> str:
+    """
+    Removes PyPDF2 extraction noise: odd unicode, broken hyphenation, whitespace runs,
+    page numbers and headers/footers repeated on every page. Pages are separated by form
+    feeds (see resume_service); text without them is treated as a single page.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    pages = []
+    for page in text.split("\f"):
+        page = "".join(ch for ch in page if ch in "\n\t" or unicodedata.category(ch)[0] != "C")
+        page = re.sub(r"(\w)-\n(\w)", r"\1\2", page) # "develop-\nment" -> "development"
+        lines = [re.sub(r"\s+", " ", line).strip() for line in page.splitlines()]
+        lines = [line for line in lines if line and not _PAGE_MARKER.match(line)]
+        if lines:
+            pages.append(lines)
+
+    # Short lines at the top (or bottom) of several pages are running headers (footers): keep
+    # only their first occurrence. Repeated lines in the body (e.g. identical bullets) stay.
+    def edges(lines):
+        return {
+            **{i: "bottom" for i in range(max(0, len(lines) - _EDGE_LINES), len(lines))},
+            **{i: "top" for i in range(min(_EDGE_LINES, len(lines)))},
+        }
+
+    counts = Counter(
+        key for lines in pages
+        for key in {(zone, lines[i]) for i, zone in edges(lines).items()} if len(key[1]) <= 80
+    )
+    seen = set()
+    cleaned = []
+    for lines in pages:
+        edge = edges(lines)
+        for i, line in enumerate(lines):
+            key = (edge.get(i), line)
+            if key[0] and counts.get(key, 0) > 1:
+                if key in seen:
+                    continue
+                seen.add(key)
+            if cleaned and cleaned[-1] == line:
+                continue
+            cleaned.append(line)
+
+    return "\n".join(cleaned)
+
+
+def _heading_name(line: str) -> str | None:
+    candidate = line.strip(" :-|•").lower()
+    if len(candidate) > 40:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def detect_sections(text: str) -> list[tuple[str, str]]:
+    """
+    Splits cleaned resume text into (section_name, body) pairs in document order.
+    Text before the first recognised heading (name, contact line) is returned as "header".
+    """
+    sections: list[tuple[str, list[str]]] = [("header", [])]
+    for line in text.splitlines():
+        name = _heading_name(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines)) for name, lines in sections if lines]
+
+
+def _truncate_lines(body: str, max_chars: int) -> str:
+    # Whole lines while they fit, then as much of the next one as fits (cut at a word), so a
+    # section whose first line is long is shortened rather than dropped
+    kept, used = [], 0
+    for line in body.splitlines():
+        if used + len(line) + 1 > max_chars:
+            room = max_chars - used - 2
+            cut = line[:room].rsplit(" ", 1)[0] if room > 0 else ""
+            if cut:
+                kept.append(cut + " …")
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join(kept)
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Trims cleaned resume text to roughly max_tokens: low-value sections are dropped first
+    (DROP_ORDER), then the longest remaining sections are cut back at line boundaries.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sections = detect_sections(text)
+    for name in DROP_ORDER:
+        if estimate_tokens("\n".join(body for _, body in sections)) <= max_tokens:
+            break
+        sections = [(n, body) for n, body in sections if n != name]
+
+    joined = "\n".join(body for _, body in sections)
+    if estimate_tokens(joined) <= max_tokens:
+        return joined
+
+    # Water-fill the character budget: short sections (header, skills) stay whole and
+    # whatever is left is shared evenly among the long ones.
+    remaining = max_tokens * CHARS_PER_TOKEN
+    by_size = sorted(range(len(sections)), key=lambda i: len(sections[i][1]))
+    allowance = {}
+    for n, i in enumerate(by_size):
+        allowance[i] = min(len(sections[i][1]) + 1, remaining // (len(by_size) - n))
+        remaining -= allowance[i]
+
+    return "\n".join(
+        _truncate_lines(body, allowance[i]) for i, (_, body) in enumerate(sections)
+    ).strip()
+
+
+def prepare_resume_text(text: str, max_tokens: int | None = None) -> str:
+    max_tokens = max_tokens or settings.LLM_RESUME_INPUT_TOKEN_BUDGET
+    cleaned = clean_resume_text(text)
+    compacted = fit_to_budget(cleaned, max_tokens)
+    logger.info(
+        "resume text compacted chars=%d->%d est_tokens=%d->%d budget=%d",
+        len(text), len(compacted), estimate_tokens(text), estimate_tokens(compacted), max_tokens,
+    )
+    return compacted
+
+
+def log_token_usage(call_type: str, estimated_input_tokens: int, message) -> None:
+    """
+    Logs our input estimate next to the provider-reported usage for one LLM response.
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    logger.info(
+        "llm tokens call_type=%s est_input=%d actual_input=%s actual_output=%s output_cap=%d",
+        call_type,
+        estimated_input_tokens,
+        usage.get("input_tokens"),
+        usage.get("output_tokens"),
+        OUTPUT_TOKEN_CAPS[call_type],
+    )
@@ -0,0 +1,150 @@
+import datetime
+import time
+from dataclasses import dataclass
+
+from prometheus_client import Counter
+from sqlalchemy import DateTime, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLLRUCache
+from app.core.config import settings
+from app.models.rate_limit import RateLimitCounter
+
+RATE_LIMIT_DECISIONS = Counter(
+    "skillsync_rate_limit_decisions_total",
+    "Rate limit checks by action and result (allowed, blocked, blocked_cached, refunded).",
+    ["action", "result"],
+)
+
+DAY = 24 * 60 * 60
+
+@dataclass(frozen=True)
+class Limit:
+    max_hits: int
+    period_seconds: int
+    message: str
+
+LIMITS = {
+    "upload": Limit(
+        settings.RATE_LIMIT_UPLOADS_PER_DAY, DAY,
+        f"Daily upload limit reached ({settings.RATE_LIMIT_UPLOADS_PER_DAY}/day). Please try again later.",
+    ),
+    "optimize": Limit(
+        settings.RATE_LIMIT_OPTIMIZES_PER_DAY, DAY,
+        f"Daily optimization limit reached ({settings.RATE_LIMIT_OPTIMIZES_PER_DAY}/day). Please try again later.",
+    ),
+    "chat": Limit(
+        settings.RATE_LIMIT_CHAT_MESSAGES_PER_HOUR, 60 * 60,
+        f"Chat limit reached ({settings.RATE_LIMIT_CHAT_MESSAGES_PER_HOUR}/hour). Please try again later.",
+    ),
+    "batch": Limit(
+        settings.RATE_LIMIT_BATCHES_PER_DAY, DAY,
+        f"Daily batch analysis limit reached ({settings.RATE_LIMIT_BATCHES_PER_DAY}/day). Please try again later.",
+    ),
+    # Charged per resume (hit(..., amount=n)), on top of the per-batch limit
+    "batch_resumes": Limit(
+        settings.RATE_LIMIT_BATCH_RESUMES_PER_DAY, DAY,
+        f"Not enough batch analysis quota left for this batch ({settings.RATE_LIMIT_BATCH_RESUMES_PER_DAY} resumes/day). Please try a smaller batch or again later.",
+    ),
+}
+
+class RateLimitExceeded(Exception):
+    def __init__(self, action: str, retry_after: int):
+        self.action = action
+        self.retry_after = retry_after
+        super().__init__(LIMITS[action].message)
+
+# Fast path: (subject, action) -> epoch second the next hit fits again. Only exhausted keys are
+# kept, so repeated requests from a blocked user are refused without a DB round trip.
+_blocked = TTLLRUCache(max_entries=settings.RATE_LIMIT_BLOCKED_CACHE_MAX_ENTRIES, ttl_seconds=DAY)
+
+def _emission_interval(limit: Limit) -> float:
+    return limit.period_seconds / limit.max_hits
+
+async def hit(db: AsyncSession, subject: str, action: str, amount: int = 1) -> datetime.datetime:
+    """
+    Counts `amount` hits for `subject` against the `action` limit, all or nothing, and returns
+    the time they were charged at (for refund()). Raises RateLimitExceeded with the seconds
+    until the hits would fit.
+
+    GCRA (a sliding-window equivalent of a token bucket): each hit costs period/max_hits of
+    "theoretical arrival time", and up to max_hits can be used at once. Unlike fixed windows
+    there is no boundary to burst across, so no more than max_hits are ever allowed within
+    any period.
+    """
+    limit = LIMITS[action]
+    now = time.time()
+
+    blocked_until = _blocked.get((subject, action))
+    if blocked_until is not None and blocked_until > now:
+        RATE_LIMIT_DECISIONS.labels(action=action, result="blocked_cached").inc()
+        raise RateLimitExceeded(action, max(1, int(blocked_until - now)))
+
+    if amount > limit.max_hits:
+        RATE_LIMIT_DECISIONS.labels(action=action, result="blocked").inc()
+        raise RateLimitExceeded(action, limit.period_seconds)
+
+    charged_at = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+    cost = datetime.timedelta(seconds=amount * _emission_interval(limit))
+    period = datetime.timedelta(seconds=limit.period_seconds)
+
+    # Single atomic statement: push the arrival time forward if the hits still fit within one
+    # period of now. No row comes back when they don't.
+    stmt = pg_insert(RateLimitCounter).values(subject=subject, action=action, tat=charged_at + cost)
+    new_tat = func.greatest(RateLimitCounter.tat, charged_at) + cost
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RateLimitCounter.subject, RateLimitCounter.action],
+        set_={"tat": new_tat},
+        where=new_tat <= literal(charged_at + period, DateTime(timezone=True)),
+    ).returning(RateLimitCounter.tat)
+
+    result = await db.execute(stmt)
+    allowed = result.scalar_one_or_none() is not None
+    if not allowed:
+        tat = (await db.execute(
+            select(RateLimitCounter.tat).filter(
+                RateLimitCounter.subject == subject, RateLimitCounter.action == action
+            )
+        )).scalar_one()
+    await db.commit()
+
+    if not allowed:
+        # The hits fit again once the arrival time is back within one period of now
+        fits_at = (max(tat, charged_at) + cost - period).timestamp()
+        if amount == 1:
+            # Exhausted. (A refused multi-hit may still leave room for smaller requests.)
+            _blocked.set((subject, action), fits_at, ttl_seconds=max(1, fits_at - now))
+        RATE_LIMIT_DECISIONS.labels(action=action, result="blocked").inc()
+        raise RateLimitExceeded(action, max(1, int(fits_at - now)))
+
+    RATE_LIMIT_DECISIONS.labels(action=action, result="allowed").inc()
+    return charged_at
+
+async def refund(
+    db: AsyncSession, subject: str, action: str, amount: int = 1, charged_at: datetime.datetime | None = None
+) -> None:
+    """
+    Gives back hits for work that failed without producing anything (unreadable PDF, LLM
+    error), so failures don't use up the quota. Never credits more than the current allowance
+    (the arrival time is not moved before now), and hits charged more than a period ago are
+    not refunded: their cost has already run out.
+    """
+    limit = LIMITS[action]
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if charged_at is not None and (now - charged_at).total_seconds() >= limit.period_seconds:
+        return
+
+    cost = datetime.timedelta(seconds=amount * _emission_interval(limit))
+    await db.execute(
+        update(RateLimitCounter)
+        .filter(
+            RateLimitCounter.subject == subject,
+            RateLimitCounter.action == action,
+            RateLimitCounter.tat > now,
+        )
+        .values(tat=func.greatest(RateLimitCounter.tat - cost, now))
+    )
+    await db.commit()
+    _blocked.pop((subject, action))
+    RATE_LIMIT_DECISIONS.labels(action=action, result="refunded").inc()
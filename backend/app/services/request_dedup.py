@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.idempotency import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+DEDUP_OUTCOMES = Counter(
+    "skillsync_request_dedup_total",
+    "Expensive requests by how they were served (executed, coalesced, replayed, conflict).",
+    ["operation", "result"],
+)
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+class IdempotencyConflict(Exception):
+    """The key is still being processed elsewhere (another worker) and did not finish in time."""
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was first used with a different request."""
+
+
+# (user_id, operation, fingerprint) -> task computing the response. Identical concurrent
+# requests from the same user await the same task instead of redoing the work.
+_inflight: dict[tuple[str, str, str], asyncio.Task] = {}
+
+
+def fingerprint(*parts: str | bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _claim(user_id: str, key: str, operation: str, request_hash: str) -> IdempotencyRecord | None:
+    """
+    Claims the key for this request. Returns None when we own it (new key, or an abandoned
+    claim past its lock expiry), otherwise the existing record.
+    """
+    now = _now()
+    stmt = insert(IdempotencyRecord).values(
+        user_id=user_id,
+        key=key,
+        operation=operation,
+        request_hash=request_hash,
+        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyRecord.user_id, IdempotencyRecord.key],
+        set_={
+            "operation": stmt.excluded.operation,
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "response_json": None,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=IdempotencyRecord.expires_at <= now,
+    ).returning(IdempotencyRecord.key)
+
+    async with AsyncSessionLocal() as db:
+        claimed = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
+        if claimed is not None:
+            return None
+        return await db.get(IdempotencyRecord, (user_id, key))
+
+
+async def _wait_for_completion(user_id: str, key: str) -> IdempotencyRecord | None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while loop.time() < deadline:
+        await asyncio.sleep(0.25)
+        async with AsyncSessionLocal() as db:
+            record = await db.get(IdempotencyRecord, (user_id, key))
+        if record is None or record.status_code is not None:
+            return record
+    return None
+
+
+async def _finish(user_id: str, key: str, response: StoredResponse | None) -> None:
+    async with AsyncSessionLocal() as db:
+        if response is not None and 200 <= response.status_code < 300:
+            # Successful responses are kept for replay
+            await db.execute(
+                update(IdempotencyRecord)
+                .filter(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+                .values(
+                    status_code=response.status_code,
+                    response_json=response.body,
+                    expires_at=_now() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+                )
+            )
+        else:
+            # Failures are not replayed: release the key so a retry recomputes
+            await db.execute(
+                delete(IdempotencyRecord).filter(IdempotencyRecord.user_id == user_id, IdempotencyRecord.key == key)
+            )
+        await db.execute(delete(IdempotencyRecord).filter(IdempotencyRecord.expires_at <= _now()))
+        await db.commit()
+
+
+async def _single_flight(
+    flight_key: tuple[str, str, str], work: Callable[[], Awaitable[StoredResponse]]
+) -> tuple[StoredResponse, bool]:
+    task = _inflight.get(flight_key)
+    leader = task is None
+    if leader:
+        task = asyncio.create_task(work())
+        _inflight[flight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(flight_key, None))
+    # shield(): a caller that disconnects does not cancel the work the others are waiting on
+    return await asyncio.shield(task), leader
+
+
+async def run(
+    user_id: str,
+    operation: str,
+    request_hash: str,
+    idempotency_key: str | None,
+    work: Callable[[], Awaitable[StoredResponse]],
+) -> tuple[StoredResponse, bool]:
+    """
+    Runs `work` once for identical concurrent requests of a user, and (with an
+    Idempotency-Key) once per key within IDEMPOTENCY_TTL_SECONDS.
+    `work` is shared between callers and may outlive the request that started it, so it must
+    open its own DB session. Returns (response, reused): reused is True when this caller got
+    someone else's result.
+    """
+    flight_key = (user_id, operation, request_hash)
+    owns_key = False
+
+    if idempotency_key:
+        record = await _claim(user_id, idempotency_key, operation, request_hash)
+        owns_key = record is None
+        if record is not None:
+            if record.operation != operation or record.request_hash != request_hash:
+                DEDUP_OUTCOMES.labels(operation=operation, result="conflict").inc()
+                raise IdempotencyKeyReused()
+            if record.status_code is None and flight_key not in _inflight:
+                # Running in another worker: wait for its result
+                record = await _wait_for_completion(user_id, idempotency_key)
+                if record is None or record.status_code is None:
+                    DEDUP_OUTCOMES.labels(operation=operation, result="conflict").inc()
+                    raise IdempotencyConflict()
+            if record.status_code is not None:
+                DEDUP_OUTCOMES.labels(operation=operation, result="replayed").inc()
+                return StoredResponse(record.status_code, record.response_json), True
+            # Otherwise the first request is running in this process: join it below
+
+    try:
+        response, leader = await _single_flight(flight_key, work)
+    except Exception:
+        if owns_key:
+            await _finish(user_id, idempotency_key, None)
+        raise
+
+    DEDUP_OUTCOMES.labels(operation=operation, result="executed" if leader else "coalesced").inc()
+    if owns_key:
+        await _finish(user_id, idempotency_key, response)
+    return response, not leader
@@ -0,0 +1,101 @@
+import hashlib
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.resume_artifact import ResumeArtifact
+from app.services.analysis_cache import normalize_resume_text
+
+logger = logging.getLogger(__name__)
+
+
+def make_artifact_key(resume_text: str, target_role: str, completed_tasks: list[str], prompt_version: str) -> str:
+    # Task order follows the roadmap JSON, which does not change the generated document
+    parts = [
+        normalize_resume_text(resume_text),
+        target_role.strip().lower(),
+        "\x1e".join(sorted(task.strip() for task in completed_tasks)),
+        prompt_version,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+async def get_by_hash(db: AsyncSession, user_id: str, content_hash: str) -> ResumeArtifact | None:
+    result = await db.execute(
+        select(ResumeArtifact).filter(ResumeArtifact.user_id == user_id, ResumeArtifact.content_hash == content_hash)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_artifact(db: AsyncSession, user_id: str, artifact_id: str) -> ResumeArtifact | None:
+    result = await db.execute(
+        select(ResumeArtifact).filter(ResumeArtifact.user_id == user_id, ResumeArtifact.id == artifact_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def list_artifacts(db: AsyncSession, user_id: str) -> list[ResumeArtifact]:
+    # Newest first; the listing schema leaves out latex_content, so don't load it
+    result = await db.execute(
+        select(
+            ResumeArtifact.id,
+            ResumeArtifact.version,
+            ResumeArtifact.target_role,
+            ResumeArtifact.completed_tasks,
+            ResumeArtifact.prompt_version,
+            ResumeArtifact.created_at,
+        )
+        .filter(ResumeArtifact.user_id == user_id)
+        .order_by(ResumeArtifact.version.desc())
+    )
+    return list(result.mappings().all())
+
+
+async def store(
+    db: AsyncSession,
+    user_id: str,
+    content_hash: str,
+    prompt_version: str,
+    target_role: str,
+    completed_tasks: list[str],
+    latex_content: str,
+) -> ResumeArtifact:
+    """
+    Saves a generated resume as the user's next version. If the same inputs were stored in
+    the meantime (another worker), that artifact is returned instead.
+    """
+    next_version = (
+        select(func.coalesce(func.max(ResumeArtifact.version), 0) + 1)
+        .filter(ResumeArtifact.user_id == user_id)
+        .scalar_subquery()
+    )
+    stmt = (
+        insert(ResumeArtifact)
+        .values(
+            user_id=user_id,
+            version=next_version,
+            content_hash=content_hash,
+            prompt_version=prompt_version,
+            target_role=target_role,
+            completed_tasks=completed_tasks,
+            latex_content=latex_content,
+        )
+        .on_conflict_do_nothing(index_elements=[ResumeArtifact.user_id, ResumeArtifact.content_hash])
+        .returning(ResumeArtifact)
+    )
+    try:
+        artifact = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
+    except IntegrityError:
+        # Two different generations for the same user raced for the same version number
+        await db.rollback()
+        logger.warning("resume artifact version conflict for user %s, retrying", user_id)
+        artifact = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
+
+    if artifact is None:
+        artifact = await get_by_hash(db, user_id, content_hash)
+    return artifact
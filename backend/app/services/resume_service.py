@@ -1,26 +1,109 @@
+import asyncio
 import io
-from fastapi import UploadFile
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PyPDF2 import PdfReader
+from app.core.config import settings
 
-async def parse_pdf(file: UploadFile) -> str:
+logger = logging.getLogger(__name__)
+
+class PDFParseError(ValueError):
+    pass
+
+_executor: ProcessPoolExecutor | None = None
+
+# Caps how many uploads can be parsing at once; the rest wait here instead of flooding the pool
+_parse_slots = asyncio.Semaphore(settings.PDF_PARSE_MAX_CONCURRENT_JOBS)
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # "spawn" keeps the workers free of the parent's event loop and gRPC threads
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def _kill_executor(executor: ProcessPoolExecutor):
     """
-    Reads a PDF file from memory and extracts text.
+    Replaces a pool whose worker is stuck on a PDF: cancelling the await does not stop the
+    worker process, so it is killed and the next parse gets a fresh pool.
     """
-    # Read the file bytes
-    content = await file.read()
-    
-    # Create a PDF Object
-    pdf = PdfReader(io.BytesIO(content))
-    
+    global _executor
+    if _executor is executor:
+        _executor = None
+    # No public API to terminate workers before Python 3.14
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.kill()
+
+# --- Worker-side functions (run inside the process pool, must stay module-level) ---
+
+def _pages_text(pdf: PdfReader, start: int, end: int) -> str:
+    # Each page ends with a form feed, so cleaning can tell page headers/footers from body text
     text_content = ""
-    
-    # Loop through pages and extract text
-    for page in pdf.pages:
+    for page in pdf.pages[start:end]:
         text = page.extract_text()
         if text:
-            text_content += text + "\n"
-            
-    # Reset cursor position in case we need to read it again later
-    await file.seek(0)
-    
-    return text_content.strip()
\ No newline at end of file
+            text_content += text + "\n\f"
+    return text_content
+
+def _extract_pages(content: bytes, start: int, end: int) -> str:
+    return _pages_text(PdfReader(io.BytesIO(content)), start, end)
+
+def _extract_first_chunk(content: bytes, chunk_size: int) -> tuple[int, str]:
+    # Returns the page count too, so short resumes need a single round trip to the pool
+    pdf = PdfReader(io.BytesIO(content))
+    return len(pdf.pages), _pages_text(pdf, 0, chunk_size)
+
+# -------------------------------------------------------------------------------
+
+async def _extract(executor: ProcessPoolExecutor, content: bytes) -> str:
+    chunk_size = settings.PDF_PARSE_PAGES_PER_CHUNK
+    loop = asyncio.get_running_loop()
+    page_count, first_chunk = await loop.run_in_executor(
+        executor, _extract_first_chunk, content, chunk_size
+    )
+    remaining = await asyncio.gather(*(
+        loop.run_in_executor(executor, _extract_pages, content, start, start + chunk_size)
+        for start in range(chunk_size, page_count, chunk_size)
+    ))
+    return first_chunk + "".join(remaining)
+
+async def parse_pdf_bytes(content: bytes) -> str:
+    """
+    Extracts text from raw PDF bytes without blocking the event loop.
+    Extraction runs in a process pool; documents longer than one chunk are split into
+    page ranges that are extracted in parallel and stitched back together in order.
+    A PDF that exceeds PDF_PARSE_TIMEOUT_SECONDS gets the pool's workers killed.
+    """
+    async with _parse_slots:
+        executor = _get_executor()
+        try:
+            async with asyncio.timeout(settings.PDF_PARSE_TIMEOUT_SECONDS):
+                try:
+                    text_content = await _extract(executor, content)
+                except BrokenProcessPool:
+                    if _executor is executor:
+                        raise
+                    # Another upload's timeout killed the pool under us: not this PDF's fault
+                    executor = _get_executor()
+                    text_content = await _extract(executor, content)
+        except TimeoutError:
+            logger.warning("PDF parse timed out after %ss, restarting the parse pool", settings.PDF_PARSE_TIMEOUT_SECONDS)
+            _kill_executor(executor)
+            raise PDFParseError("Timed out while reading the PDF. Please upload a smaller or simpler file.")
+        except Exception as e:
+            raise PDFParseError(f"Could not read the PDF: {e}")
+
+    return text_content.strip()
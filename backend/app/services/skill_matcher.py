@@ -0,0 +1,137 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from app.services.skill_taxonomy import IMPLIES, ROLE_NOISE_WORDS, ROLES, SKILLS, TAXONOMY_VERSION
+
+ENGINE_VERSION = f"local:{TAXONOMY_VERSION}"
+
+# Words keep the symbols that matter in skill names: c++, c#, node.js, ci/cd, t-sql
+_TOKEN = re.compile(r"[a-z0-9#+][a-z0-9#+./-]*")
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.rstrip(".-/") for token in _TOKEN.findall(text.lower())]
+
+
+@dataclass
+class SkillMatch:
+    role_id: str
+    role: str
+    match_score: int # 0-100, share of the role's skill weight found in the resume
+    matched_skills: list[str]
+    missing_skills: list[str] # Most important first
+
+    def as_dict(self) -> dict:
+        return {
+            "role": self.role,
+            "match_score": self.match_score,
+            "matched_skills": self.matched_skills,
+            "missing_skills": self.missing_skills,
+            "engine": ENGINE_VERSION,
+        }
+
+
+class SkillIndex:
+    """
+    Built once from the taxonomy:
+    - phrase index: tokenized synonym -> skill id, scanned as 1..n-grams over the resume
+    - inverted index: skill id -> [(role id, weight)], so scoring against every role only
+      touches the roles that share a skill with the resume
+    """
+
+    def __init__(self, skills: dict, roles: dict, implies: dict[str, list[str]], noise_words: set[str]):
+        self.skills = skills
+        self.roles = roles
+        self.implies = implies
+        self.noise_words = noise_words
+
+        self.phrases: dict[tuple[str, ...], str] = {}
+        for skill_id, (_, synonyms) in skills.items():
+            for synonym in synonyms:
+                self.phrases[tuple(tokenize(synonym))] = skill_id
+        self.max_phrase_len = max(len(phrase) for phrase in self.phrases)
+
+        self.role_skills: dict[str, dict[str, int]] = {}
+        self.role_weight: dict[str, int] = {}
+        self.by_skill: dict[str, list[tuple[str, int]]] = defaultdict(list)
+        for role_id, (_, _, weights) in roles.items():
+            self.role_skills[role_id] = weights
+            self.role_weight[role_id] = sum(weights.values())
+            for skill_id, weight in weights.items():
+                self.by_skill[skill_id].append((role_id, weight))
+
+        self.role_aliases: dict[str, str] = {}
+        for role_id, (name, aliases, _) in roles.items():
+            for alias in [name, *aliases]:
+                self.role_aliases[self._role_key(alias)] = role_id
+
+    def _role_key(self, title: str) -> str:
+        return " ".join(token for token in tokenize(title) if token not in self.noise_words)
+
+    def extract_skills(self, text: str) -> set[str]:
+        tokens = tokenize(text)
+        found = set()
+        for start in range(len(tokens)):
+            for length in range(1, min(self.max_phrase_len, len(tokens) - start) + 1):
+                skill_id = self.phrases.get(tuple(tokens[start:start + length]))
+                if skill_id:
+                    found.add(skill_id)
+        for skill_id in list(found):
+            found.update(self.implies.get(skill_id, ()))
+        return found
+
+    def resolve_role(self, target_role: str) -> str | None:
+        """Maps a free-text target role to a taxonomy role (exact alias, else best word overlap)."""
+        key = self._role_key(target_role)
+        if key in self.role_aliases:
+            return self.role_aliases[key]
+
+        words = set(key.split())
+        best, best_overlap = None, 0.0
+        for alias, role_id in self.role_aliases.items():
+            alias_words = set(alias.split())
+            overlap = len(words & alias_words) / len(words | alias_words) if words else 0.0
+            if overlap > best_overlap:
+                best, best_overlap = role_id, overlap
+        return best if best_overlap >= 0.5 else None
+
+    def _match(self, role_id: str, skills: set[str]) -> SkillMatch:
+        weights = self.role_skills[role_id]
+        matched = [skill for skill in weights if skill in skills]
+        missing = sorted((skill for skill in weights if skill not in skills), key=lambda skill: -weights[skill])
+        score = round(100 * sum(weights[skill] for skill in matched) / self.role_weight[role_id])
+        return SkillMatch(
+            role_id=role_id,
+            role=self.roles[role_id][0],
+            match_score=score,
+            matched_skills=[self.skills[skill][0] for skill in matched],
+            missing_skills=[self.skills[skill][0] for skill in missing],
+        )
+
+    def score(self, resume_text: str, target_role: str) -> SkillMatch | None:
+        role_id = self.resolve_role(target_role)
+        if role_id is None:
+            return None
+        return self._match(role_id, self.extract_skills(resume_text))
+
+    def rank_roles(self, resume_text: str, limit: int = 5) -> list[SkillMatch]:
+        skills = self.extract_skills(resume_text)
+        totals: dict[str, int] = defaultdict(int)
+        for skill in skills:
+            for role_id, weight in self.by_skill.get(skill, ()):
+                totals[role_id] += weight
+        ranked = sorted(totals, key=lambda role_id: -totals[role_id] / self.role_weight[role_id])
+        return [self._match(role_id, skills) for role_id in ranked[:limit]]
+
+
+index = SkillIndex(SKILLS, ROLES, IMPLIES, ROLE_NOISE_WORDS)
+
+
+def preliminary_score(resume_text: str, target_role: str) -> dict | None:
+    """
+    Deterministic match score and skill gaps in about a millisecond, no LLM involved.
+    None when the target role is not in the taxonomy.
+    """
+    match = index.score(resume_text, target_role)
+    return match.as_dict() if match else None
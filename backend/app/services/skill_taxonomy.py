@@ -0,0 +1,153 @@
+# Skill taxonomy for the local matcher (app/services/skill_matcher.py).
+# Keep entries lowercase; synonyms are matched as whole words / phrases after tokenization.
+# Bump TAXONOMY_VERSION whenever skills, synonyms or role weights change.
+
+TAXONOMY_VERSION = "v1"
+
+# canonical id -> (display name, synonyms)
+SKILLS: dict[str, tuple[str, list[str]]] = {
+    # Languages
+    "python": ("Python", ["python", "python3"]),
+    "java": ("Java", ["java", "jvm", "java8", "java 11", "java 17"]),
+    "javascript": ("JavaScript", ["javascript", "js", "ecmascript", "es6"]),
+    "typescript": ("TypeScript", ["typescript"]),
+    "go": ("Go", ["golang", "go lang"]),
+    "rust": ("Rust", ["rust", "rustlang"]),
+    "cpp": ("C++", ["c++", "cpp"]),
+    "csharp": ("C#", ["c#", "csharp", ".net", "dotnet", "asp.net"]),
+    "sql": ("SQL", ["sql", "t-sql", "pl/sql", "plsql"]),
+    "bash": ("Shell scripting", ["bash", "shell scripting", "shell", "zsh", "powershell"]),
+    "kotlin": ("Kotlin", ["kotlin"]),
+    "swift": ("Swift", ["swift", "swiftui"]),
+    "html_css": ("HTML/CSS", ["html", "html5", "css", "css3", "sass", "scss", "tailwind", "tailwindcss"]),
+    # Frameworks
+    "react": ("React", ["react", "react.js", "reactjs", "next.js", "nextjs"]),
+    "angular": ("Angular", ["angular", "angularjs"]),
+    "vue": ("Vue", ["vue", "vue.js", "vuejs", "nuxt"]),
+    "nodejs": ("Node.js", ["node", "node.js", "nodejs", "express.js", "expressjs", "nestjs"]),
+    "django": ("Django", ["django", "django rest framework", "drf"]),
+    "fastapi": ("FastAPI", ["fastapi"]),
+    "flask": ("Flask", ["flask"]),
+    "spring": ("Spring", ["spring boot", "springboot", "spring framework", "spring mvc"]),
+    "rest_api": ("REST APIs", ["rest api", "rest apis", "restful", "openapi", "api design"]),
+    "graphql": ("GraphQL", ["graphql", "apollo"]),
+    "grpc": ("gRPC", ["grpc", "protobuf", "protocol buffers"]),
+    # Data stores
+    "postgresql": ("PostgreSQL", ["postgresql", "postgres", "psql"]),
+    "mysql": ("MySQL", ["mysql", "mariadb"]),
+    "mongodb": ("MongoDB", ["mongodb", "mongo"]),
+    "redis": ("Redis", ["redis", "memcached"]),
+    "elasticsearch": ("Elasticsearch", ["elasticsearch", "opensearch", "elk"]),
+    "kafka": ("Kafka", ["kafka", "apache kafka", "kinesis", "pulsar"]),
+    "rabbitmq": ("Message queues", ["rabbitmq", "sqs", "pub/sub", "pubsub", "celery", "message queue", "message queues"]),
+    "data_warehouse": ("Data warehousing", ["bigquery", "snowflake", "redshift", "data warehouse", "data warehousing", "dbt"]),
+    "spark": ("Spark", ["spark", "pyspark", "apache spark", "databricks", "hadoop"]),
+    "airflow": ("Workflow orchestration", ["airflow", "apache airflow", "dagster", "prefect", "luigi"]),
+    "etl": ("ETL pipelines", ["etl", "elt", "data pipeline", "data pipelines"]),
+    # Cloud / infra
+    "aws": ("AWS", ["aws", "amazon web services", "ec2", "s3", "lambda", "ecs", "eks"]),
+    "gcp": ("Google Cloud", ["gcp", "google cloud", "google cloud platform", "cloud run", "gke", "vertex ai"]),
+    "azure": ("Azure", ["azure", "microsoft azure", "aks"]),
+    "docker": ("Docker", ["docker", "containers", "containerization", "dockerfile", "podman"]),
+    "kubernetes": ("Kubernetes", ["kubernetes", "k8s", "helm", "openshift"]),
+    "terraform": ("Terraform", ["terraform", "infrastructure as code", "iac", "pulumi", "cloudformation"]),
+    "ansible": ("Configuration management", ["ansible", "chef", "puppet", "saltstack"]),
+    "ci_cd": ("CI/CD", ["ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment", "jenkins", "github actions", "gitlab ci", "circleci", "argocd", "argo cd"]),
+    "linux": ("Linux", ["linux", "unix", "ubuntu", "debian", "centos", "rhel"]),
+    "networking": ("Networking", ["networking", "tcp/ip", "dns", "load balancing", "load balancer", "nginx", "http"]),
+    "observability": ("Observability", ["observability", "monitoring", "prometheus", "grafana", "datadog", "opentelemetry", "new relic", "logging", "tracing"]),
+    "sre": ("Reliability engineering", ["sre", "site reliability", "slo", "slos", "sli", "incident response", "on-call", "on call", "postmortems"]),
+    "security": ("Security", ["security", "oauth", "oauth2", "jwt", "iam", "owasp", "encryption", "penetration testing", "pentesting"]),
+    "git": ("Git", ["git", "github", "gitlab", "bitbucket", "version control"]),
+    # Engineering practice
+    "testing": ("Automated testing", ["unit testing", "unit tests", "pytest", "junit", "jest", "tdd", "integration testing", "test automation", "selenium", "cypress", "playwright"]),
+    "system_design": ("System design", ["system design", "distributed systems", "scalability", "microservices", "microservice", "architecture", "high availability"]),
+    "data_structures": ("Data structures & algorithms", ["data structures", "algorithms", "dsa", "leetcode"]),
+    "agile": ("Agile", ["agile", "scrum", "kanban", "jira"]),
+    # Data / ML
+    "pandas": ("Pandas/NumPy", ["pandas", "numpy", "scipy"]),
+    "statistics": ("Statistics", ["statistics", "statistical analysis", "a/b testing", "hypothesis testing", "regression"]),
+    "machine_learning": ("Machine learning", ["machine learning", "ml", "scikit-learn", "sklearn", "xgboost", "lightgbm", "feature engineering"]),
+    "deep_learning": ("Deep learning", ["deep learning", "pytorch", "tensorflow", "keras", "neural networks", "cnn", "transformers"]),
+    "nlp": ("NLP", ["nlp", "natural language processing", "spacy", "hugging face", "huggingface"]),
+    "llm": ("LLM applications", ["llm", "llms", "large language models", "langchain", "rag", "prompt engineering", "openai", "gemini"]),
+    "mlops": ("MLOps", ["mlops", "mlflow", "kubeflow", "model deployment", "model serving", "sagemaker"]),
+    "data_viz": ("Data visualization", ["tableau", "power bi", "powerbi", "looker", "matplotlib", "seaborn", "data visualization", "dashboards"]),
+    "excel": ("Excel", ["excel", "spreadsheets", "google sheets"]),
+    # Mobile / frontend practice
+    "android": ("Android", ["android", "jetpack compose"]),
+    "ios": ("iOS", ["ios", "xcode", "uikit"]),
+    "react_native": ("Cross-platform mobile", ["react native", "flutter", "dart"]),
+    "ui_ux": ("UI/UX", ["ui/ux", "ux", "figma", "accessibility", "responsive design", "wcag"]),
+    # Product / soft skills
+    "communication": ("Communication", ["communication", "presentations", "stakeholder management", "technical writing", "documentation"]),
+    "leadership": ("Leadership", ["leadership", "mentoring", "mentored", "team lead", "led a team", "managed a team", "people management"]),
+    "product": ("Product management", ["product management", "roadmapping", "product strategy", "user research", "prd", "okrs"]),
+}
+
+# Knowing the key implies the listed skills (Postgres experience counts as SQL)
+IMPLIES: dict[str, list[str]] = {
+    "postgresql": ["sql"], "mysql": ["sql"], "data_warehouse": ["sql"],
+    "fastapi": ["python", "rest_api"], "django": ["python"], "flask": ["python"], "pandas": ["python"], "airflow": ["python"],
+    "spring": ["java"], "kotlin": ["java"],
+    "react": ["javascript"], "angular": ["typescript"], "vue": ["javascript"], "nodejs": ["javascript"], "typescript": ["javascript"],
+    "kubernetes": ["docker"], "deep_learning": ["machine_learning"], "mlops": ["machine_learning"],
+}
+
+# canonical id -> (display name, aliases, {skill id: weight})
+# Weights: 3 = core, 2 = expected, 1 = nice to have
+ROLES: dict[str, tuple[str, list[str], dict[str, int]]] = {
+    "backend_engineer": ("Backend Engineer", ["backend engineer", "backend developer", "back end engineer", "back-end developer", "python developer", "java developer", "api developer", "software engineer backend"], {
+        "python": 2, "java": 1, "go": 1, "sql": 3, "postgresql": 2, "rest_api": 3, "fastapi": 1, "django": 1, "spring": 1,
+        "redis": 2, "docker": 2, "kubernetes": 1, "aws": 2, "ci_cd": 2, "git": 2, "testing": 2, "system_design": 3,
+        "rabbitmq": 1, "kafka": 1, "observability": 1, "linux": 1, "data_structures": 2,
+    }),
+    "frontend_engineer": ("Frontend Engineer", ["frontend engineer", "frontend developer", "front end developer", "front-end engineer", "ui developer", "react developer", "web developer"], {
+        "javascript": 3, "typescript": 3, "html_css": 3, "react": 3, "angular": 1, "vue": 1, "rest_api": 2, "graphql": 1,
+        "testing": 2, "git": 2, "ui_ux": 2, "ci_cd": 1, "nodejs": 1, "communication": 1,
+    }),
+    "fullstack_engineer": ("Full Stack Engineer", ["full stack engineer", "full stack developer", "fullstack developer", "fullstack engineer", "software engineer", "software developer", "sde", "swe"], {
+        "javascript": 3, "typescript": 2, "react": 2, "nodejs": 2, "python": 2, "html_css": 2, "sql": 2, "postgresql": 1, "mongodb": 1,
+        "rest_api": 3, "docker": 2, "aws": 1, "git": 2, "testing": 2, "system_design": 2, "ci_cd": 1, "data_structures": 2,
+    }),
+    "devops_engineer": ("DevOps Engineer", ["devops engineer", "devops", "platform engineer", "cloud engineer", "infrastructure engineer", "build engineer"], {
+        "linux": 3, "bash": 2, "python": 2, "docker": 3, "kubernetes": 3, "terraform": 3, "ansible": 1, "ci_cd": 3, "aws": 3,
+        "gcp": 1, "azure": 1, "observability": 2, "networking": 2, "git": 2, "security": 1, "go": 1,
+    }),
+    "sre": ("Site Reliability Engineer", ["site reliability engineer", "sre", "reliability engineer", "production engineer"], {
+        "linux": 3, "python": 2, "go": 2, "bash": 2, "kubernetes": 3, "docker": 2, "terraform": 2, "observability": 3, "sre": 3,
+        "networking": 2, "aws": 2, "gcp": 1, "ci_cd": 2, "system_design": 2, "postgresql": 1, "kafka": 1,
+    }),
+    "data_engineer": ("Data Engineer", ["data engineer", "big data engineer", "etl developer", "analytics engineer"], {
+        "python": 3, "sql": 3, "spark": 3, "airflow": 2, "etl": 3, "data_warehouse": 3, "kafka": 2, "postgresql": 1,
+        "aws": 2, "gcp": 1, "docker": 1, "git": 1, "pandas": 1,
+    }),
+    "data_scientist": ("Data Scientist", ["data scientist", "applied scientist", "research scientist"], {
+        "python": 3, "sql": 2, "pandas": 3, "statistics": 3, "machine_learning": 3, "deep_learning": 1, "data_viz": 2,
+        "nlp": 1, "spark": 1, "communication": 2, "excel": 1,
+    }),
+    "ml_engineer": ("Machine Learning Engineer", ["machine learning engineer", "ml engineer", "ai engineer", "mlops engineer", "deep learning engineer", "genai engineer", "llm engineer"], {
+        "python": 3, "machine_learning": 3, "deep_learning": 3, "mlops": 2, "llm": 2, "nlp": 1, "pandas": 2, "sql": 1,
+        "docker": 2, "kubernetes": 1, "aws": 1, "gcp": 1, "rest_api": 1, "fastapi": 1, "system_design": 1, "git": 1,
+    }),
+    "data_analyst": ("Data Analyst", ["data analyst", "business analyst", "bi analyst", "business intelligence analyst", "product analyst"], {
+        "sql": 3, "excel": 3, "data_viz": 3, "statistics": 2, "python": 2, "pandas": 1, "data_warehouse": 1, "communication": 2,
+    }),
+    "mobile_engineer": ("Mobile Engineer", ["mobile engineer", "mobile developer", "android developer", "ios developer", "app developer", "android engineer", "ios engineer"], {
+        "kotlin": 2, "swift": 2, "android": 2, "ios": 2, "react_native": 2, "rest_api": 2, "git": 2, "testing": 2, "ui_ux": 2,
+        "ci_cd": 1, "javascript": 1,
+    }),
+    "security_engineer": ("Security Engineer", ["security engineer", "application security engineer", "cybersecurity analyst", "security analyst", "devsecops engineer"], {
+        "security": 3, "networking": 3, "linux": 3, "python": 2, "bash": 2, "aws": 2, "docker": 1,
+        "kubernetes": 1, "observability": 1, "ci_cd": 1,
+    }),
+    "product_manager": ("Product Manager", ["product manager", "technical product manager", "associate product manager", "apm", "product owner"], {
+        "product": 3, "communication": 3, "agile": 2, "statistics": 1, "sql": 1, "data_viz": 1, "ui_ux": 2, "leadership": 2,
+    }),
+}
+
+# Stripped from target roles before matching ("Senior Backend Engineer" -> "backend engineer")
+ROLE_NOISE_WORDS = {
+    "senior", "sr", "junior", "jr", "lead", "staff", "principal", "intern", "internship", "trainee", "associate",
+    "entry", "level", "mid", "i", "ii", "iii", "iv", "fresher", "graduate", "head", "chief", "remote",
+}
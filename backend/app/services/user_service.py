@@ -2,7 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 
 async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(User).filter(User.email == email))
@@ -14,7 +14,7 @@ async def get_user_by_id(db: AsyncSession, user_id: str):
     return result.scalars().first()
 
 async def create_user(db: AsyncSession, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -23,4 +23,10 @@ async def create_user(db: AsyncSession, user: UserCreate):
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    return db_user
+
+async def update_password_hash(db: AsyncSession, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.add(user)
+    await db.commit()
+    return user
@@ -0,0 +1,69 @@
+"""
+Career analysis latency: one call generating the whole JSON vs. the fan-out into concurrent
+assessment + roadmap sub-generations (ai_service.FAN_OUT).
+
+Runs against the offline fake provider, which models a provider as time-to-first-token
+(--latency-ms) plus a fixed cost per output token (--ms-per-token), so the difference comes
+from output length per call. Reports end-to-end p50/p95 for --uploads analyses, --concurrency
+at a time.
+
+Usage (from backend/):
+    python -m benchmarks.analysis_fanout --uploads 40 --concurrency 8 --ms-per-token 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import percentile
+
+RESUME = "Backend engineer, 3 years of Python, FastAPI and Postgres. Built internal APIs and CI pipelines."
+
+def _configure_fake_provider(latency_ms: float, ms_per_token: float, max_concurrency: int):
+    # Must run before app modules are imported: settings are read once at import time
+    spec = f"fake:bench?latency_ms={latency_ms}&ms_per_token={ms_per_token}"
+    routes = {call_type: [spec] for call_type in ["career_analysis", "career_assessment", "career_roadmap", "optimized_resume", "chat", "chat_summary"]}
+    os.environ["LLM_ROUTES"] = json.dumps(routes)
+    os.environ["LLM_HEDGING_ENABLED"] = "false"
+    os.environ["ANALYSIS_MAX_CONCURRENT_CALLS"] = str(max_concurrency)
+
+async def _measure(label: str, parts, uploads: int, concurrency: int):
+    from app.services import ai_service
+
+    _, variables = ai_service._analysis_request(RESUME, "Site Reliability Engineer", "Junior")
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one_upload():
+        async with gate:
+            started = time.perf_counter()
+            result, _ = await ai_service.run_analysis(parts, variables)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert result["roadmap"] and result["match_score"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_upload() for _ in range(uploads)))
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{label:<8} {len(parts)} call(s)/analysis  latency p50={percentile(latencies, 50):6.0f}ms "
+        f"p95={percentile(latencies, 95):6.0f}ms  wall={elapsed:5.1f}s"
+    )
+
+async def main(uploads: int, concurrency: int):
+    from app.services import ai_service
+
+    await _measure("single", ai_service.SINGLE_CALL, uploads, concurrency)
+    await _measure("fan-out", ai_service.FAN_OUT, uploads, concurrency)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--ms-per-token", type=float, default=5)
+    parser.add_argument("--max-concurrent-calls", type=int, default=16, help="ANALYSIS_MAX_CONCURRENT_CALLS")
+    args = parser.parse_args()
+    _configure_fake_provider(args.latency_ms, args.ms_per_token, args.max_concurrent_calls)
+    asyncio.run(main(args.uploads, args.concurrency))
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+TICK_SECONDS = 0.005
+
+class LoopLagMonitor:
+    """
+    Sleeps TICK_SECONDS in a loop and records how late each wake-up is (ms).
+    A blocked event loop shows up as large lag values.
+    """
+
+    def __init__(self):
+        self.lags: list[float] = []
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._stop.set()
+        await self._task
+
+    async def _run(self):
+        while not self._stop.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            self.lags.append((time.perf_counter() - before - TICK_SECONDS) * 1000)
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(len(ordered) * pct / 100)) - 1))
+    return ordered[index]
@@ -0,0 +1,79 @@
+"""
+Event-loop latency during a burst of PDF uploads.
+
+Runs a ticker that sleeps 5ms in a loop and records how late each wake-up is, while
+a burst of resumes is parsed (1) inline on the event loop, the way parse_pdf used to work,
+and (2) through resume_service.parse_pdf_bytes (process pool).
+
+Usage (from backend/):
+    python -m benchmarks.parse_event_loop --uploads 20 --pages 12
+"""
+import argparse
+import asyncio
+import io
+import time
+
+from app.services import resume_service
+from benchmarks.common import LoopLagMonitor, percentile
+
+def build_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Builds a plain-text PDF with `pages` pages using only the PDF syntax PyPDF2 needs."""
+    line = "Senior engineer building Python FastAPI services on Kubernetes, Postgres and GCP."
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        ops = ["BT /F1 9 Tf 40 760 Td 11 TL"] + [f"({line} p{p} l{i}) '" for i in range(lines_per_page)] + ["ET"]
+        stream = "\n".join(ops).encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        contents_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % contents_ref
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer << /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+async def _inline_parse(content: bytes) -> str:
+    # The old behaviour: CPU-bound extraction directly inside the coroutine
+    return resume_service._extract_pages(content, 0, None).strip()
+
+async def _measure(label: str, parse, pdf: bytes, uploads: int):
+    async with LoopLagMonitor() as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(parse(pdf) for _ in range(uploads)))
+        elapsed = time.perf_counter() - started
+
+    lags = monitor.lags
+    print(
+        f"{label:<14} burst={elapsed * 1000:7.0f}ms  ticks={len(lags):4d}  loop lag p50={percentile(lags, 50):6.1f}ms "
+        f"p99={percentile(lags, 99):7.1f}ms  max={max(lags):7.1f}ms"
+    )
+
+async def main(uploads: int, pages: int):
+    pdf = build_pdf(pages)
+    # Warm the pool so worker start-up is not counted against the burst
+    await resume_service.parse_pdf_bytes(pdf)
+
+    await _measure("inline", _inline_parse, pdf, uploads)
+    await _measure("process pool", resume_service.parse_pdf_bytes, pdf, uploads)
+    resume_service.shutdown_executor()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=12)
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, args.pages))
@@ -0,0 +1,91 @@
+"""
+Similarity search latency on the profile embedding index (profile_index.similar_profiles).
+
+Seeds --profiles random unit vectors into a TEMPORARY copy of profile_embeddings (the real
+table is never touched), builds the same HNSW indexes, then runs --queries top-k searches
+with and without the completed-roadmap filter. Reports p50/p99 of the query round trip.
+Needs a database with the pgvector extension (DATABASE_URL / POSTGRES_*).
+
+Usage (from backend/):
+    python -m benchmarks.profile_similarity --profiles 1000000 --completed-share 0.1
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+
+from benchmarks.common import percentile
+
+SEARCH = """
+    SELECT target_role, experience_level, roadmap_completed, embedding <=> CAST(:query AS vector) AS distance
+    FROM bench_profile_embeddings
+    {where}
+    ORDER BY embedding <=> CAST(:query AS vector)
+    LIMIT :limit
+"""
+
+def _random_vector(dimensions: int) -> str:
+    return "[" + ",".join(f"{random.random() - 0.5:.6f}" for _ in range(dimensions)) + "]"
+
+async def _seed(conn, profiles: int, completed_share: float, dimensions: int):
+    started = time.perf_counter()
+    await conn.execute(text("CREATE TEMPORARY TABLE bench_profile_embeddings (LIKE profile_embeddings INCLUDING DEFAULTS)"))
+    # One random vector per row, generated in Postgres (the outer reference forces re-evaluation).
+    # Not normalized: cosine distance ignores length.
+    await conn.execute(text(f"""
+        INSERT INTO bench_profile_embeddings
+            (profile_id, embedding, model, content_hash, target_role, experience_level, roadmap_completed)
+        SELECT g::text, ARRAY(SELECT random() - 0.5 FROM generate_series(1, {dimensions}) WHERE g > 0)::vector,
+               'bench', '', 'Role ' || (g % 50), 'Mid', random() < :share
+        FROM generate_series(1, :profiles) AS g
+    """), {"profiles": profiles, "share": completed_share})
+    print(f"seeded {profiles} profiles in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    await conn.execute(text("SET maintenance_work_mem = '1GB'"))
+    for name, where in (("all", ""), ("completed", "WHERE roadmap_completed")):
+        await conn.execute(text(
+            f"CREATE INDEX bench_{name}_hnsw ON bench_profile_embeddings "
+            f"USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64) {where}"
+        ))
+    await conn.execute(text("ANALYZE bench_profile_embeddings"))
+    print(f"built HNSW indexes in {time.perf_counter() - started:.1f}s")
+
+async def _measure(conn, label: str, where: str, queries: int, limit: int, dimensions: int):
+    statement = text(SEARCH.format(where=where))
+    plan = await conn.execute(text("EXPLAIN " + SEARCH.format(where=where)), {"query": _random_vector(dimensions), "limit": limit})
+    index = next((line for line in plan.scalars() if "Index Scan" in line), "no index scan!").strip()
+
+    latencies: list[float] = []
+    for _ in range(queries):
+        params = {"query": _random_vector(dimensions), "limit": limit}
+        started = time.perf_counter()
+        rows = (await conn.execute(statement, params)).all()
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert rows
+    print(f"{label:<10} p50={percentile(latencies, 50):6.2f}ms p99={percentile(latencies, 99):6.2f}ms  ({index})")
+
+async def main(profiles: int, completed_share: float, queries: int, limit: int, ef_search: int):
+    from app.core.config import settings
+    from app.db.session import engine
+
+    dimensions = settings.EMBEDDING_DIMENSIONS
+    async with engine.connect() as conn:
+        await _seed(conn, profiles, completed_share, dimensions)
+        await conn.execute(text(f"SET hnsw.ef_search = {int(ef_search)}"))
+        await _measure(conn, "all", "", queries, limit, dimensions)
+        await _measure(conn, "completed", "WHERE roadmap_completed", queries, limit, dimensions)
+        await conn.rollback()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--completed-share", type=float, default=0.1, help="Share of profiles with a completed roadmap")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, default=40, help="PROFILE_SIMILARITY_EF_SEARCH")
+    args = parser.parse_args()
+    asyncio.run(main(args.profiles, args.completed_share, args.queries, args.limit, args.ef_search))